@@ -1,31 +1,41 @@
 import os
 import sys
 import ctypes
-import tkinter as tk
-from tkinter import ttk, messagebox, filedialog
-import ttkbootstrap as tb
-from ttkbootstrap.constants import *
-import winreg
+try:
+    import winreg
+except ImportError:  # Not on Windows; the in-memory registry provider is used
+    winreg = None
 import subprocess
 import threading
-import shutil
 import queue
 import time
 import re
 import json
-from pathlib import Path
-from concurrent.futures import ThreadPoolExecutor
-from typing import List, Tuple, Optional, Callable, Dict, Set, Any
-from dataclasses import dataclass, field
+import heapq
+import bisect
+import fnmatch
+from array import array
+import sqlite3
+from pathlib import Path, PureWindowsPath
+from collections import deque, Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import List, Tuple, Optional, Callable, Dict, Set, Any, Iterable, Iterator, Union
+from dataclasses import dataclass, field, replace, asdict
 from enum import Enum
-import xml.etree.ElementTree as ET
+from abc import ABC, abstractmethod
 import tempfile
-import uuid
-import schedule
-from datetime import datetime, timedelta
-import psutil
-import asyncio
-import logging
+from datetime import datetime, timedelta, date
+# psutil, schedule and xml.etree are imported where first used to keep cold start short
+
+# tkinter and ttkbootstrap are imported on first GUI use so the headless CLI never loads them
+tk = ttk = messagebox = filedialog = tb = None
+
+def load_gui_modules():
+    """Import the GUI toolkit into this module's namespace"""
+    global tk, ttk, messagebox, filedialog, tb
+    import tkinter as tk
+    from tkinter import ttk, messagebox, filedialog
+    import ttkbootstrap as tb
 
 # === Data Classes ===
 @dataclass
@@ -37,6 +47,18 @@ class ProgramInfo:
     version: str = ""
     size: str = ""
     install_date: str = ""
+    registry_key: str = ""  # Full path of the Uninstall subkey, e.g. HKEY_LOCAL_MACHINE\...\Uninstall\App
+    size_kb: int = 0  # EstimatedSize; size holds its display form
+    
+    @property
+    def install_day(self) -> Optional[date]:
+        """install_date as a date; installers write several formats, unknown ones give None"""
+        for fmt in ("%Y-%m-%d", "%Y%m%d", "%m/%d/%Y", "%d.%m.%Y"):
+            try:
+                return datetime.strptime(self.install_date.strip(), fmt).date()
+            except ValueError:
+                continue
+        return None
 
 @dataclass
 class StartupItem:
@@ -45,13 +67,14 @@ class StartupItem:
     hive: int
     registry_path: str
 
-@dataclass
+@dataclass(slots=True)
 class LeftoverItem:
     path: Path
     item_type: str  # 'file', 'folder', 'registry'
     size: int = 0
     category: str = ""  # 'program_files', 'appdata', 'registry', 'temp', 'shortcuts'
     confidence: str = "Low"  # High, Medium, Low
+    matched_terms: Tuple[str, ...] = ()  # Search terms found in the item name
 
 @dataclass
 class DeepScanResult:
@@ -60,6 +83,35 @@ class DeepScanResult:
     total_size: int
     scan_time: float
 
+@dataclass
+class JunkRule:
+    """A junk location from junk_rules.json; path may contain %ENV% variables"""
+    category: str
+    path: str
+    patterns: List[str] = field(default_factory=lambda: ["*"])
+    min_age_days: float = 0.0  # Only files not modified for this many days
+    min_size_kb: int = 0  # Only files at least this large
+    enabled: bool = True
+    
+    def accepts(self, size: int, mtime: float, now: float) -> bool:
+        return size >= self.min_size_kb * 1024 and now - mtime >= self.min_age_days * 86400
+
+@dataclass(slots=True)
+class JunkRecord:
+    path: Path
+    size: int
+    mtime: float
+    category: str
+    is_dir: bool = False  # A whole junk subtree; size and mtime are aggregated
+
+@dataclass
+class ScanStage:
+    """A file-system stage of the deep scan, fed by the shared directory walker"""
+    name: str
+    roots: List[Path]
+    matcher: Callable  # (DirEntry, lowercase name, SearchTermMatcher) -> Optional[LeftoverItem]
+    recursive: bool = False  # Also match entries in subdirectories of the roots
+
 @dataclass
 class ProgressUpdate:
     current: int
@@ -87,6 +139,516 @@ class LogMessage:
     level: LogLevel
     timestamp: str
 
+# === Cancellation ===
+class CancellationToken:
+    """Cooperative cancellation flag checked by the scan and cleanup loops"""
+    
+    def __init__(self):
+        self._event = threading.Event()
+    
+    def cancel(self):
+        self._event.set()
+    
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+FILE_ATTRIBUTE_REPARSE_POINT = 0x400
+
+def is_link_entry(entry: os.DirEntry) -> bool:
+    """True for symlinks, junctions and other reparse points, judged without following them"""
+    if entry.is_symlink() or getattr(entry, "is_junction", lambda: False)():
+        return True
+    # Windows fills DirEntry.stat from the directory listing, so this costs no extra call there
+    return os.name == "nt" and bool(entry.stat(follow_symlinks=False).st_file_attributes 
+                                    & FILE_ATTRIBUTE_REPARSE_POINT)
+
+def remove_link(path: str):
+    """Remove a link itself, never its target"""
+    try:
+        os.unlink(path)
+    except (PermissionError, OSError):
+        os.rmdir(path)  # Directory symlinks and junctions on Windows
+
+def remove_tree(path: Path, cancel_token: Optional[CancellationToken] = None,
+                keep: Optional[Callable[[os.DirEntry], bool]] = None) -> bool:
+    """Delete a directory bottom-up, stopping between entries once cancelled.
+    
+    Links and junctions inside the tree (or the tree itself, if it is one) are
+    removed as links and never walked, so nothing outside the tree is touched.
+    Files for which keep(entry) is true are left in place, and so are the
+    directories holding them. Returns False if cancellation left part of the
+    tree in place.
+    """
+    path = os.fspath(path)
+    try:
+        root_stat = os.lstat(path)
+    except OSError:
+        return True  # Already gone
+    if os.path.islink(path) or getattr(root_stat, "st_file_attributes", 0) & FILE_ATTRIBUTE_REPARSE_POINT:
+        try:
+            remove_link(path)
+        except (PermissionError, OSError):
+            pass
+        return True
+    
+    pending = [path]
+    listed = []  # Directories in discovery order; removed in reverse, children first
+    while pending:
+        dir_path = pending.pop()
+        listed.append(dir_path)
+        try:
+            with os.scandir(dir_path) as it:
+                entries = list(it)
+        except (PermissionError, OSError):
+            continue
+        for entry in entries:
+            if cancel_token and cancel_token.cancelled:
+                return False
+            try:
+                if is_link_entry(entry):
+                    remove_link(entry.path)
+                elif entry.is_dir(follow_symlinks=False):
+                    pending.append(entry.path)
+                elif not (keep and keep(entry)):
+                    os.unlink(entry.path)
+            except (PermissionError, OSError):
+                continue
+    
+    for dir_path in reversed(listed):
+        try:
+            os.rmdir(dir_path)
+        except (PermissionError, OSError):
+            continue
+    return True
+
+# === Registry Providers ===
+# Root keys and value types share winreg's numeric values so handles and
+# StartupItem.hive work the same with every provider
+HKEY_CLASSES_ROOT = 0x80000000
+HKEY_CURRENT_USER = 0x80000001
+HKEY_LOCAL_MACHINE = 0x80000002
+HKEY_USERS = 0x80000003
+
+REG_NONE = 0
+REG_SZ = 1
+REG_EXPAND_SZ = 2
+REG_BINARY = 3
+REG_DWORD = 4
+REG_MULTI_SZ = 7
+REG_QWORD = 11
+
+KEY_READ = 0x20019
+KEY_SET_VALUE = 0x0002
+
+HIVE_NAMES = {
+    HKEY_CLASSES_ROOT: "HKEY_CLASSES_ROOT",
+    HKEY_CURRENT_USER: "HKEY_CURRENT_USER",
+    HKEY_LOCAL_MACHINE: "HKEY_LOCAL_MACHINE",
+    HKEY_USERS: "HKEY_USERS",
+}
+HIVES_BY_NAME = {name: hive for hive, name in HIVE_NAMES.items()}
+HIVES_BY_NAME.update({"HKCR": HKEY_CLASSES_ROOT, "HKCU": HKEY_CURRENT_USER,
+                      "HKLM": HKEY_LOCAL_MACHINE, "HKU": HKEY_USERS})
+
+class RegistryProvider(ABC):
+    """Registry operations used by PyUninstallX, mirroring the winreg API.
+    
+    Errors follow winreg: FileNotFoundError for missing keys or values and
+    OSError once an enumeration index runs past the last item.
+    """
+    
+    @abstractmethod
+    def open_key(self, key, sub_key: str, access: int = KEY_READ):
+        ...
+    
+    @abstractmethod
+    def create_key(self, key, sub_key: str):
+        ...
+    
+    @abstractmethod
+    def close_key(self, handle):
+        ...
+    
+    @abstractmethod
+    def enum_key(self, handle, index: int) -> str:
+        ...
+    
+    @abstractmethod
+    def enum_value(self, handle, index: int) -> Tuple[str, Any, int]:
+        ...
+    
+    @abstractmethod
+    def query_value(self, handle, name: str) -> Tuple[Any, int]:
+        ...
+    
+    @abstractmethod
+    def query_info_key(self, handle) -> Tuple[int, int, int]:
+        """Return (subkey count, value count, last write time in 100 ns units since 1601)"""
+    
+    @abstractmethod
+    def set_value(self, handle, name: str, value_type: int, value: Any):
+        ...
+    
+    @abstractmethod
+    def delete_value(self, handle, name: str):
+        ...
+    
+    @abstractmethod
+    def delete_key(self, handle, sub_key: str):
+        ...
+
+class WinRegProvider(RegistryProvider):
+    """Registry provider backed by the real Windows registry"""
+    
+    def open_key(self, key, sub_key: str, access: int = KEY_READ):
+        return winreg.OpenKey(key, sub_key, 0, access)
+    
+    def create_key(self, key, sub_key: str):
+        return winreg.CreateKey(key, sub_key)
+    
+    def close_key(self, handle):
+        winreg.CloseKey(handle)
+    
+    def enum_key(self, handle, index: int) -> str:
+        return winreg.EnumKey(handle, index)
+    
+    def enum_value(self, handle, index: int) -> Tuple[str, Any, int]:
+        return winreg.EnumValue(handle, index)
+    
+    def query_value(self, handle, name: str) -> Tuple[Any, int]:
+        return winreg.QueryValueEx(handle, name)
+    
+    def query_info_key(self, handle) -> Tuple[int, int, int]:
+        return winreg.QueryInfoKey(handle)
+    
+    def set_value(self, handle, name: str, value_type: int, value: Any):
+        winreg.SetValueEx(handle, name, 0, value_type, value)
+    
+    def delete_value(self, handle, name: str):
+        winreg.DeleteValue(handle, name)
+    
+    def delete_key(self, handle, sub_key: str):
+        winreg.DeleteKey(handle, sub_key)
+
+class _MemoryKey:
+    """A key node of the in-memory registry; also serves as its open handle"""
+    __slots__ = ("name", "subkeys", "values", "last_write", "_sorted_names", "_value_list")
+    
+    def __init__(self, name: str):
+        self.name = name
+        self.subkeys: Dict[str, "_MemoryKey"] = {}  # lower-case name -> key
+        self.values: Dict[str, Tuple[str, Any, int]] = {}  # lower-case name -> (name, data, type)
+        self.last_write = InMemoryRegistryProvider._filetime_now()
+        self._sorted_names: Optional[List[str]] = None
+        self._value_list: Optional[List[Tuple[str, Any, int]]] = None  # values in enumeration order
+    
+    def touch(self):
+        self.last_write = InMemoryRegistryProvider._filetime_now()
+        self._sorted_names = None
+    
+    def put_value(self, name: str, data: Any, value_type: int):
+        self.values[name.lower()] = (name, data, value_type)
+        self._value_list = None
+    
+    def drop_value(self, name: str) -> bool:
+        """Remove a value, returning whether it existed"""
+        self._value_list = None
+        return self.values.pop(name.lower(), None) is not None
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        return False
+
+class InMemoryRegistryProvider(RegistryProvider):
+    """Registry provider over an in-memory tree, loadable from JSON or .reg exports.
+    
+    Used to benchmark and regression-test the registry scans off Windows;
+    synthesize() builds large trees for throughput measurements.
+    """
+    
+    def __init__(self):
+        self._hives: Dict[int, _MemoryKey] = {hive: _MemoryKey(name) for hive, name in HIVE_NAMES.items()}
+    
+    @staticmethod
+    def _filetime_now() -> int:
+        # FILETIME: 100 ns intervals since 1601-01-01, as returned by QueryInfoKey
+        return time.time_ns() // 100 + 116444736000000000
+    
+    def _resolve(self, key) -> _MemoryKey:
+        if isinstance(key, _MemoryKey):
+            return key
+        try:
+            return self._hives[key]
+        except KeyError:
+            raise OSError(6, "The handle is invalid")
+    
+    def _walk(self, key, sub_key: str, create: bool = False) -> _MemoryKey:
+        node = self._resolve(key)
+        for part in sub_key.split("\\"):
+            if not part:
+                continue
+            child = node.subkeys.get(part.lower())
+            if child is None:
+                if not create:
+                    raise FileNotFoundError(2, "The system cannot find the file specified")
+                child = node.subkeys[part.lower()] = _MemoryKey(part)
+                node.touch()
+            node = child
+        return node
+    
+    def open_key(self, key, sub_key: str, access: int = KEY_READ):
+        return self._walk(key, sub_key)
+    
+    def create_key(self, key, sub_key: str):
+        return self._walk(key, sub_key, create=True)
+    
+    def close_key(self, handle):
+        pass
+    
+    def enum_key(self, handle, index: int) -> str:
+        node = self._resolve(handle)
+        if node._sorted_names is None:
+            # The registry enumerates subkeys in case-insensitive order
+            node._sorted_names = [node.subkeys[name].name for name in sorted(node.subkeys)]
+        try:
+            return node._sorted_names[index]
+        except IndexError:
+            raise OSError(259, "No more data is available")
+    
+    def enum_value(self, handle, index: int) -> Tuple[str, Any, int]:
+        node = self._resolve(handle)
+        if node._value_list is None:
+            node._value_list = list(node.values.values())
+        try:
+            return node._value_list[index]
+        except IndexError:
+            raise OSError(259, "No more data is available")
+    
+    def query_value(self, handle, name: str) -> Tuple[Any, int]:
+        try:
+            _, data, value_type = self._resolve(handle).values[name.lower()]
+        except KeyError:
+            raise FileNotFoundError(2, "The system cannot find the file specified")
+        return data, value_type
+    
+    def query_info_key(self, handle) -> Tuple[int, int, int]:
+        node = self._resolve(handle)
+        return len(node.subkeys), len(node.values), node.last_write
+    
+    def set_value(self, handle, name: str, value_type: int, value: Any):
+        node = self._resolve(handle)
+        node.put_value(name, value, value_type)
+        node.last_write = self._filetime_now()
+    
+    def delete_value(self, handle, name: str):
+        node = self._resolve(handle)
+        if not node.drop_value(name):
+            raise FileNotFoundError(2, "The system cannot find the file specified")
+        node.last_write = self._filetime_now()
+    
+    def delete_key(self, handle, sub_key: str):
+        parts = [part for part in sub_key.split("\\") if part]
+        parent = self._walk(handle, "\\".join(parts[:-1]))
+        target = parent.subkeys.get(parts[-1].lower()) if parts else None
+        if target is None:
+            raise FileNotFoundError(2, "The system cannot find the file specified")
+        if target.subkeys:
+            raise PermissionError(5, "Access is denied")
+        del parent.subkeys[parts[-1].lower()]
+        parent.touch()
+    
+    # Loading and synthesizing trees
+    def load_json(self, json_path: Path):
+        """Load a tree saved by to_json(), e.g. {"HKEY_LOCAL_MACHINE": {"subkeys": {...}, "values": {...}}}"""
+        with open(json_path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        
+        def load_node(node: _MemoryKey, node_data: Dict[str, Any]):
+            for name, value in node_data.get("values", {}).items():
+                if isinstance(value, dict):
+                    node.put_value(name, value["data"], value["type"])
+                else:
+                    node.put_value(name, value, self._infer_type(value))
+            for name, child_data in node_data.get("subkeys", {}).items():
+                load_node(self.create_key(node, name), child_data)
+        
+        for hive_name, hive_data in data.items():
+            load_node(self.create_key(HIVES_BY_NAME[hive_name.upper()], ""), hive_data)
+    
+    def to_json(self, json_path: Path):
+        """Save the tree in the format read by load_json()"""
+        def dump_node(node: _MemoryKey) -> Dict[str, Any]:
+            node_data: Dict[str, Any] = {}
+            if node.values:
+                node_data["values"] = {
+                    name: value if self._infer_type(value) == value_type else {"type": value_type, "data": value}
+                    for name, value, value_type in node.values.values()
+                    if not isinstance(value, bytes)
+                }
+            if node.subkeys:
+                node_data["subkeys"] = {child.name: dump_node(child) for child in node.subkeys.values()}
+            return node_data
+        
+        data = {node.name: dump_node(node) for node in self._hives.values() if node.subkeys or node.values}
+        with open(json_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2)
+    
+    @staticmethod
+    def _infer_type(value: Any) -> int:
+        if isinstance(value, list):
+            return REG_MULTI_SZ
+        if isinstance(value, bytes):
+            return REG_BINARY
+        if isinstance(value, int):
+            return REG_DWORD if 0 <= value <= 0xFFFFFFFF else REG_QWORD
+        return REG_SZ
+    
+    def load_reg(self, reg_path: Path):
+        """Load a regedit export (.reg, REGEDIT4 or version 5.00 / UTF-16)"""
+        raw = Path(reg_path).read_bytes()
+        if raw.startswith(b"\xff\xfe") or raw.startswith(b"\xfe\xff"):
+            text = raw.decode("utf-16")
+        else:
+            text = raw.decode("utf-8-sig", errors="replace")
+        
+        # Join hex continuation lines ending in a backslash
+        lines = []
+        pending = ""
+        for line in text.splitlines():
+            line = line.strip()
+            if pending:
+                line = pending + line
+                pending = ""
+            if line.endswith("\\") and "=" in line and not line.startswith("["):
+                pending = line[:-1]
+                continue
+            lines.append(line)
+        
+        node: Optional[_MemoryKey] = None
+        for line in lines:
+            if not line or line.startswith(";"):
+                continue
+            if line.startswith("[") and line.endswith("]"):
+                key_path = line[1:-1]
+                delete = key_path.startswith("-")
+                hive_name, _, sub_key = key_path.lstrip("-").partition("\\")
+                hive = HIVES_BY_NAME.get(hive_name.upper())
+                if hive is None or delete:
+                    node = None
+                    if hive is not None and sub_key:
+                        self._delete_tree(hive, sub_key)
+                    continue
+                node = self.create_key(hive, sub_key)
+            elif node is not None and "=" in line:
+                name, data = self._split_reg_value(line)
+                if name is None:
+                    continue
+                if data == "-":
+                    node.drop_value(name)
+                else:
+                    value, value_type = self._parse_reg_data(data)
+                    node.put_value(name, value, value_type)
+    
+    def _delete_tree(self, key, sub_key: str):
+        try:
+            node = self._walk(key, sub_key)
+        except FileNotFoundError:
+            return
+        for child in list(node.subkeys.values()):
+            self._delete_tree(node, child.name)
+        self.delete_key(key, sub_key)
+    
+    @staticmethod
+    def _split_reg_value(line: str) -> Tuple[Optional[str], str]:
+        """Split a '"name"=data' or '@=data' line"""
+        if line.startswith("@="):
+            return "", line[2:]
+        if not line.startswith('"'):
+            return None, ""
+        i = 1
+        name_chars = []
+        while i < len(line):
+            char = line[i]
+            if char == "\\" and i + 1 < len(line):
+                name_chars.append(line[i + 1])
+                i += 2
+                continue
+            if char == '"':
+                break
+            name_chars.append(char)
+            i += 1
+        rest = line[i + 1:]
+        if not rest.startswith("="):
+            return None, ""
+        return "".join(name_chars), rest[1:]
+    
+    @staticmethod
+    def _parse_reg_data(data: str) -> Tuple[Any, int]:
+        if data.startswith('"'):
+            return data[1:-1].replace('\\"', '"').replace("\\\\", "\\"), REG_SZ
+        if data.lower().startswith("dword:"):
+            return int(data[6:], 16), REG_DWORD
+        
+        match = re.match(r"hex(?:\(([0-9a-fA-F]+)\))?:(.*)", data)
+        if not match:
+            return data, REG_SZ
+        value_type = int(match.group(1), 16) if match.group(1) else REG_BINARY
+        hex_bytes = match.group(2).replace(",", "").replace(" ", "")
+        raw = bytes.fromhex(hex_bytes)
+        
+        if value_type in (REG_SZ, REG_EXPAND_SZ):
+            return raw.decode("utf-16-le", errors="replace").rstrip("\x00"), value_type
+        if value_type == REG_MULTI_SZ:
+            return [s for s in raw.decode("utf-16-le", errors="replace").split("\x00") if s], value_type
+        if value_type in (REG_DWORD, REG_QWORD):
+            return int.from_bytes(raw, "little"), value_type
+        return raw, value_type
+    
+    def synthesize(self, hive: int, root_path: str, key_count: int, fanout: int = 16,
+                   values_per_key: int = 2, name_prefix: str = "Key") -> int:
+        """Add about key_count keys below hive\\root_path, breadth first with the given fanout.
+        
+        Key names are deterministic ("Key000123") so benchmarks are repeatable.
+        Returns the number of keys created.
+        """
+        root = self.create_key(hive, root_path)
+        frontier = [root]
+        created = 0
+        
+        while frontier and created < key_count:
+            next_frontier = []
+            for parent in frontier:
+                for _ in range(fanout):
+                    if created >= key_count:
+                        break
+                    name = f"{name_prefix}{created:06d}"
+                    child = parent.subkeys[name.lower()] = _MemoryKey(name)
+                    for v in range(values_per_key):
+                        child.put_value(f"Value{v}", f"{name} data {v}", REG_SZ)
+                    next_frontier.append(child)
+                    created += 1
+                parent.touch()
+            frontier = next_frontier
+        
+        return created
+
+_registry_provider: Optional[RegistryProvider] = None
+
+def get_registry_provider() -> RegistryProvider:
+    """Return the active registry provider (winreg on Windows, in-memory elsewhere)"""
+    global _registry_provider
+    if _registry_provider is None:
+        _registry_provider = WinRegProvider() if winreg is not None else InMemoryRegistryProvider()
+    return _registry_provider
+
+def set_registry_provider(provider: RegistryProvider):
+    """Swap the registry provider used by the helpers, scanners and automation tasks"""
+    global _registry_provider
+    _registry_provider = provider
+
 # === Smart Automation System ===
 class OptimizationProfile(Enum):
     GAMING = "gaming"
@@ -139,10 +701,12 @@ class AutomationResult:
 class SmartAutomation:
     """Advanced automation system with intelligent profiles and scheduling"""
     
-    def __init__(self, config_path: Optional[Path] = None, logger=None):
+    def __init__(self, config_path: Optional[Path] = None, logger=None,
+                 registry: Optional[RegistryProvider] = None, autostart: bool = True):
         self.config_path = config_path or Path.home() / ".pyuninstallx" / "automation_config.json"
         self.config_path.parent.mkdir(exist_ok=True)
         self.logger = logger
+        self.registry = registry or get_registry_provider()
         
         # Task storage
         self.tasks: Dict[str, AutomationTask] = {}
@@ -160,8 +724,9 @@ class SmartAutomation:
         self._initialize_builtin_tasks()
         self.load_config()
         
-        # Start scheduler
-        self.start_scheduler()
+        # Start scheduler; one-shot callers such as the CLI leave it off
+        if autostart:
+            self.start_scheduler()
     
     def _initialize_builtin_tasks(self):
         """Initialize built-in automation tasks"""
@@ -272,6 +837,7 @@ class SmartAutomation:
         profile_tasks.sort(key=lambda t: t.priority.value, reverse=True)
         
         if interactive:
+            from tkinter import messagebox
             task_names = [task.name for task in profile_tasks]
             response = messagebox.askyesno(
                 f"Apply {profile.value.title()} Profile",
@@ -383,10 +949,10 @@ class SmartAutomation:
             
             # Disable Windows Game Mode (can cause issues)
             try:
-                key = winreg.OpenKey(winreg.HKEY_CURRENT_USER, 
-                                   r"Software\Microsoft\GameBar", 0, winreg.KEY_SET_VALUE)
-                winreg.SetValueEx(key, "AutoGameModeEnabled", 0, winreg.REG_DWORD, 0)
-                winreg.CloseKey(key)
+                key = self.registry.open_key(HKEY_CURRENT_USER, 
+                                             r"Software\Microsoft\GameBar", KEY_SET_VALUE)
+                self.registry.set_value(key, "AutoGameModeEnabled", REG_DWORD, 0)
+                self.registry.close_key(key)
             except Exception:
                 pass
             
@@ -411,11 +977,11 @@ class SmartAutomation:
         try:
             # Enable Do Not Disturb
             try:
-                key = winreg.OpenKey(winreg.HKEY_CURRENT_USER, 
-                                   r"Software\Microsoft\Windows\CurrentVersion\Notifications\Settings", 
-                                   0, winreg.KEY_SET_VALUE)
-                winreg.SetValueEx(key, "NOC_GLOBAL_SETTING_ALLOW_NOTIFICATION_SOUND", 0, winreg.REG_DWORD, 0)
-                winreg.CloseKey(key)
+                key = self.registry.open_key(HKEY_CURRENT_USER, 
+                                             r"Software\Microsoft\Windows\CurrentVersion\Notifications\Settings", 
+                                             KEY_SET_VALUE)
+                self.registry.set_value(key, "NOC_GLOBAL_SETTING_ALLOW_NOTIFICATION_SOUND", REG_DWORD, 0)
+                self.registry.close_key(key)
             except Exception:
                 pass
             
@@ -430,23 +996,25 @@ class SmartAutomation:
         try:
             # Clear Windows Run history
             try:
-                key = winreg.OpenKey(winreg.HKEY_CURRENT_USER, 
-                                   r"Software\Microsoft\Windows\CurrentVersion\Explorer\RunMRU", 
-                                   0, winreg.KEY_SET_VALUE)
+                key = self.registry.open_key(HKEY_CURRENT_USER, 
+                                             r"Software\Microsoft\Windows\CurrentVersion\Explorer\RunMRU", 
+                                             KEY_SET_VALUE)
                 
                 # Get all values and delete them
                 i = 0
                 while True:
                     try:
-                        value_name = winreg.EnumValue(key, i)[0]
+                        value_name = self.registry.enum_value(key, i)[0]
                         if value_name != "MRUList":
-                            winreg.DeleteValue(key, value_name)
+                            # Deleting shifts the remaining values down into this index
+                            self.registry.delete_value(key, value_name)
                             results["cleared_items"] += 1
-                        i += 1
-                    except WindowsError:
+                        else:
+                            i += 1
+                    except OSError:
                         break
                 
-                winreg.CloseKey(key)
+                self.registry.close_key(key)
             except Exception:
                 results["errors"] += 1
             
@@ -534,6 +1102,7 @@ class SmartAutomation:
     
     def _system_health_check(self) -> Dict[str, Any]:
         """Perform comprehensive system health check"""
+        import psutil
         results = {
             "cpu_usage": psutil.cpu_percent(interval=1),
             "memory_usage": psutil.virtual_memory().percent,
@@ -611,6 +1180,7 @@ class SmartAutomation:
                     except Exception:
                         pass
         
+        import schedule
         if scheduled_task.schedule_type == "daily":
             schedule.every().day.at(scheduled_task.schedule_time).do(run_scheduled_task)
         elif scheduled_task.schedule_type == "weekly":
@@ -639,6 +1209,7 @@ class SmartAutomation:
     
     def _scheduler_loop(self):
         """Main scheduler loop"""
+        import schedule
         while self.is_running:
             schedule.run_pending()
             time.sleep(1)
@@ -648,6 +1219,7 @@ class SmartAutomation:
         if self.logger:
             try:
                 self.logger.log(message, "INFO")
+                return
             except Exception:
                 pass
         print(f"[Automation] {message}")
@@ -967,9 +1539,6 @@ def run_as_admin():
     ctypes.windll.shell32.ShellExecuteW(None, "runas", sys.executable, f'"{script}" {params}', None, 1)
     sys.exit(0)
 
-if not is_admin():
-    run_as_admin()
-
 # === Enhanced Animation Handler ===
 class SmoothAnimationHandler:
     def __init__(self, widget):
@@ -1011,8 +1580,8 @@ class SmoothAnimationHandler:
 
 # === Enhanced Progress Handler ===
 class EnhancedProgressHandler:
-    def __init__(self, progressbar: ttk.Progressbar, status_label: ttk.Label = None, 
-                 detail_label: ttk.Label = None):
+    def __init__(self, progressbar: "ttk.Progressbar", status_label: "ttk.Label" = None, 
+                 detail_label: "ttk.Label" = None):
         self.progressbar = progressbar
         self.status_label = status_label
         self.detail_label = detail_label
@@ -1061,6 +1630,142 @@ class EnhancedProgressHandler:
         if self.detail_label:
             self.detail_label.configure(text="")
 
+# === Virtual Treeview ===
+class VirtualTreeview:
+    """Shows a large row list in a ttk.Treeview by recycling one item per visible row.
+    
+    Only the visible window is materialized: scrolling, filtering and sorting
+    rewrite the pooled items' values in place, and items whose values did not
+    change are left alone, so the Tcl calls per update grow with the window
+    height, not with the number of rows. Selection is kept as row indices so it
+    survives scrolling; with a row key it also survives replacing the rows.
+    """
+    
+    def __init__(self, tree: "ttk.Treeview", scrollbar: "ttk.Scrollbar", 
+                 row_values: Callable[[Any], Tuple], key: Optional[Callable[[Any], Any]] = None):
+        self.tree = tree
+        self.scrollbar = scrollbar
+        self.row_values = row_values
+        self.key = key
+        self.rows: List[Any] = []
+        self.offset = 0
+        self._pool: List[str] = []  # Treeview item ids, one per visible row
+        self._shown: List[Optional[Tuple]] = []  # Values each pooled item currently displays
+        self._attached = 0  # Leading pool items currently shown
+        self._selected: Set[int] = set()
+        self._visible_rows = int(tree.cget("height"))
+        
+        scrollbar.configure(command=self.yview)
+        # add="+" keeps bindings the owner of the tree already made
+        tree.bind("<Configure>", self._on_configure, add="+")
+        tree.bind("<<TreeviewSelect>>", self._on_select, add="+")
+        # Windows and macOS report the wheel as <MouseWheel>, X11 as buttons 4 and 5
+        for wheel in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            tree.bind(wheel, self._on_mousewheel, add="+")
+        for key in ("<Up>", "<Down>", "<Prior>", "<Next>", "<Home>", "<End>"):
+            tree.bind(key, self._on_key, add="+")
+    
+    def set_rows(self, rows: List[Any], keep_view: bool = False):
+        """Replace the rows shown.
+        
+        With keep_view (and a key), the selected rows and the top visible row are
+        found again by key, so a refresh keeps selection and scroll position;
+        otherwise the selection is cleared.
+        """
+        if keep_view and self.key:
+            selected_keys = {self.key(self.rows[index]) for index in self._selected if index < len(self.rows)}
+            top_key = self.key(self.rows[self.offset]) if self.offset < len(self.rows) else None
+            positions = {self.key(row): index for index, row in enumerate(rows)}
+            self._selected = {positions[key] for key in selected_keys if key in positions}
+            self.offset = positions.get(top_key, self.offset)
+        else:
+            self._selected.clear()
+        self.rows = rows
+        self.render()
+    
+    def selected(self) -> List[Any]:
+        return [self.rows[index] for index in sorted(self._selected) if index < len(self.rows)]
+    
+    def see(self, index: int):
+        if index < self.offset:
+            self.offset = index
+        elif index >= self.offset + self._visible_rows:
+            self.offset = index - self._visible_rows + 1
+        self.render()
+    
+    def render(self):
+        """Write the visible window of rows into the pooled items"""
+        self.offset = max(0, min(self.offset, len(self.rows) - self._visible_rows))
+        count = max(0, min(self._visible_rows, len(self.rows) - self.offset))
+        
+        while len(self._pool) < count:
+            self._pool.append(self.tree.insert("", "end"))
+            self._shown.append(None)
+            self._attached += 1
+        for position in range(self._attached, count):
+            self.tree.move(self._pool[position], "", position)
+        if self._attached > count:
+            self.tree.detach(*self._pool[count:self._attached])
+        self._attached = count
+        
+        for position in range(count):
+            values = self.row_values(self.rows[self.offset + position])
+            if values != self._shown[position]:
+                self.tree.item(self._pool[position], values=values)
+                self._shown[position] = values
+        self.tree.selection_set([self._pool[position] for position in range(count) 
+                                 if self.offset + position in self._selected])
+        
+        if self.rows:
+            self.scrollbar.set(self.offset / len(self.rows), (self.offset + count) / len(self.rows))
+        else:
+            self.scrollbar.set(0.0, 1.0)
+    
+    def yview(self, *args):
+        """Scrollbar command: ("moveto", fraction) or ("scroll", n, "units" | "pages")"""
+        if args[0] == "moveto":
+            self.offset = int(float(args[1]) * len(self.rows))
+        elif args[0] == "scroll":
+            step = self._visible_rows if args[2] == "pages" else 1
+            self.offset += int(args[1]) * step
+        self.render()
+    
+    def _on_configure(self, event):
+        row_height = int(ttk.Style().lookup("Treeview", "rowheight") or 20)
+        visible_rows = max(1, event.height // row_height - 1)  # Less the heading row
+        if visible_rows != self._visible_rows:
+            self._visible_rows = visible_rows
+            self.render()
+    
+    def _on_mousewheel(self, event):
+        if getattr(event, "num", None) in (4, 5):
+            direction = -1 if event.num == 4 else 1
+        elif event.delta:
+            direction = -1 if event.delta > 0 else 1
+        else:
+            return "break"
+        self.yview("scroll", direction * 3, "units")
+        return "break"
+    
+    def _on_select(self, event=None):
+        shown = set(self.tree.selection())
+        for position in range(self._attached):
+            if self._pool[position] in shown:
+                self._selected.add(self.offset + position)
+            else:
+                self._selected.discard(self.offset + position)
+    
+    def _on_key(self, event):
+        if not self.rows:
+            return "break"
+        current = max(self._selected) if self._selected else self.offset - 1
+        moves = {"Up": current - 1, "Down": current + 1, "Prior": current - self._visible_rows,
+                 "Next": current + self._visible_rows, "Home": 0, "End": len(self.rows) - 1}
+        index = max(0, min(moves.get(event.keysym, current), len(self.rows) - 1))
+        self._selected = {index}
+        self.see(index)
+        return "break"
+
 # === Virus Scanner Engine ===
 class VirusScanner:
     def __init__(self, logger=None):
@@ -1107,6 +1812,7 @@ class VirusScanner:
             return []
         
         self.is_scanning = True
+        import uuid
         self.current_scan_id = str(uuid.uuid4())[:8]
         
         if self.logger:
@@ -1172,6 +1878,7 @@ class VirusScanner:
             
             # Parse XML results
             if os.path.exists(temp_file):
+                import xml.etree.ElementTree as ET
                 tree = ET.parse(temp_file)
                 root = tree.getroot()
                 
@@ -1217,89 +1924,517 @@ class VirusScanner:
         except Exception as e:
             return {"error": str(e)}
 
+# === Search Term Matcher ===
+class SearchTermMatcher:
+    """Search terms compiled once into a single regex that also reports which terms hit"""
+    
+    def __init__(self, terms: Iterable[str]):
+        # Longest first so the combined alternation prefers the most specific term
+        self.terms: Tuple[str, ...] = tuple(sorted({term for term in terms if term}, key=len, reverse=True))
+        self._pattern = re.compile("|".join(re.escape(term) for term in self.terms)) if self.terms else None
+    
+    def search(self, name: str) -> Tuple[str, ...]:
+        """Return the terms contained in an already lower-cased name, or () if none"""
+        if self._pattern is None or self._pattern.search(name) is None:
+            return ()
+        # Rare path: only names that passed the compiled pre-check are split into terms
+        return tuple(term for term in self.terms if term in name)
+
+# === Folder Size Cache ===
+def vanished_subdirs(dir_key: str, old_subdirs: str, subdirs: List[str]) -> List[str]:
+    """Keys of the subdirectories a cached listing had that a fresh listing no longer has"""
+    previous = {os.path.normcase(name) for name in old_subdirs.split("\n") if name}
+    current = {os.path.normcase(name) for name in subdirs}
+    return [os.path.join(dir_key, name) for name in previous - current]
+
+def delete_dir_rows(conn: sqlite3.Connection, table: str, dir_keys: List[str]):
+    """Delete the rows of each directory and of every directory below it"""
+    # Keys below a directory sort between "dir<sep>" and "dir<sep + 1>"
+    conn.executemany(
+        f"DELETE FROM {table} WHERE path = ? OR (path >= ? AND path < ?)",
+        [(dir_key, dir_key + os.sep, dir_key + chr(ord(os.sep) + 1)) for dir_key in dir_keys]
+    )
+
+class FolderSizeCache:
+    """Persistent folder-size cache validated against directory mtimes.
+    
+    Each directory row stores the size of the files directly inside it and the
+    names of its subdirectories. A directory whose mtime is unchanged is not
+    listed again; only its subdirectories are stat'ed to validate their rows.
+    Content-only changes to existing files do not touch the directory mtime,
+    so such growth is picked up the next time the directory itself changes.
+    """
+    
+    def __init__(self, db_path: Optional[Path] = None):
+        self.db_path = db_path or Path.home() / ".pyuninstallx" / "scan_cache.db"
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        
+        try:
+            self.db_path.parent.mkdir(exist_ok=True)
+            self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS folder_sizes ("
+                "path TEXT PRIMARY KEY, mtime_ns INTEGER NOT NULL, "
+                "files_size INTEGER NOT NULL, subdirs TEXT NOT NULL)"
+            )
+            self._conn.commit()
+        except (sqlite3.Error, OSError):
+            self._conn = None  # Fall back to uncached walks
+    
+    def get_size(self, folder_path: Path, cancel_token: Optional[CancellationToken] = None) -> int:
+        """Return the total size of a folder, re-listing only directories that changed"""
+        total_size = 0
+        updates = []
+        removed = []
+        pending = [os.path.abspath(folder_path)]
+        
+        while pending:
+            if cancel_token and cancel_token.cancelled:
+                break  # Rows already gathered are complete per directory and still stored
+            dir_path = pending.pop()
+            dir_key = os.path.normcase(dir_path)
+            
+            try:
+                mtime_ns = os.stat(dir_path).st_mtime_ns
+            except OSError:
+                removed.append(dir_key)
+                continue
+            
+            row = self._lookup(dir_key)
+            if row and row[0] == mtime_ns:
+                files_size = row[1]
+                subdirs = row[2].split("\n") if row[2] else []
+            else:
+                listing = self._list_directory(dir_path)
+                if listing is None:
+                    continue
+                files_size, subdirs = listing
+                updates.append((dir_key, mtime_ns, files_size, "\n".join(subdirs)))
+                if row:
+                    removed.extend(vanished_subdirs(dir_key, row[2], subdirs))
+            
+            total_size += files_size
+            pending.extend(os.path.join(dir_path, name) for name in subdirs)
+        
+        self._store(updates, removed)
+        return total_size
+    
+    def _lookup(self, dir_key: str) -> Optional[Tuple[int, int, str]]:
+        """Fetch the cached row for a directory"""
+        if self._conn is None:
+            return None
+        try:
+            with self._lock:
+                return self._conn.execute(
+                    "SELECT mtime_ns, files_size, subdirs FROM folder_sizes WHERE path = ?",
+                    (dir_key,)
+                ).fetchone()
+        except sqlite3.Error:
+            return None
+    
+    def _store(self, updates: List[Tuple], removed: List[str]):
+        """Persist refreshed rows and drop the subtrees of directories that no longer exist"""
+        if self._conn is None or not (updates or removed):
+            return
+        try:
+            with self._lock:
+                delete_dir_rows(self._conn, "folder_sizes", removed)
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO folder_sizes (path, mtime_ns, files_size, subdirs) "
+                    "VALUES (?, ?, ?, ?)", updates
+                )
+                self._conn.commit()
+        except sqlite3.Error:
+            pass
+    
+    @staticmethod
+    def _list_directory(dir_path: str) -> Optional[Tuple[int, List[str]]]:
+        """List a directory once, returning its direct file size total and subdirectory names"""
+        files_size = 0
+        subdirs = []
+        try:
+            with os.scandir(dir_path) as it:
+                for entry in it:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            subdirs.append(entry.name)
+                        elif entry.is_file():
+                            files_size += entry.stat().st_size
+                    except OSError:
+                        continue
+        except (PermissionError, OSError):
+            return None
+        return files_size, subdirs
+    
+    def close(self):
+        """Close the cache database"""
+        if self._conn is not None:
+            with self._lock:
+                self._conn.close()
+                self._conn = None
+
+# === Junk Directory Index ===
+class JunkIndex:
+    """Persistent per-directory listings for junk scans, validated against directory mtimes.
+    
+    Each row holds a directory's files (name, size, mtime), its subdirectory
+    names and whether it contains links or entries that could not be read.
+    A directory whose mtime is unchanged is served from the index, so a repeat
+    scan stats each directory once instead of listing it. As with
+    FolderSizeCache, a file that grows in place is picked up once its
+    directory changes.
+    """
+    
+    def __init__(self, db_path: Optional[Path] = None):
+        self.db_path = db_path or Path.home() / ".pyuninstallx" / "scan_cache.db"
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._updates: List[Tuple] = []
+        self._removed: List[str] = []  # Directories whose rows and subtree rows are dropped
+        
+        try:
+            self.db_path.parent.mkdir(exist_ok=True)
+            self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False, timeout=10)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS junk_dirs ("
+                "path TEXT PRIMARY KEY, mtime_ns INTEGER NOT NULL, "
+                "files TEXT NOT NULL, subdirs TEXT NOT NULL, blocked INTEGER NOT NULL)"
+            )
+            self._conn.commit()
+        except (sqlite3.Error, OSError):
+            self._conn = None  # Fall back to listing every directory
+    
+    def listing(self, dir_path: str) -> Optional[Tuple[List[Tuple[str, int, float]], List[str], bool]]:
+        """Return (files, subdirectory names, blocked) for a directory, or None if unreadable"""
+        dir_key = os.path.normcase(os.path.abspath(dir_path))
+        try:
+            mtime_ns = os.stat(dir_path).st_mtime_ns
+        except OSError:
+            with self._lock:
+                self._removed.append(dir_key)
+            return None
+        
+        row = self._lookup(dir_key)
+        if row and row[0] == mtime_ns:
+            try:
+                files = [tuple(item) for item in json.loads(row[1])]
+                return files, row[2].split("\n") if row[2] else [], bool(row[3])
+            except ValueError:
+                pass
+        
+        listing = self.scan_directory(dir_path)
+        if listing is not None:
+            files, subdirs, blocked = listing
+            with self._lock:
+                self._updates.append((dir_key, mtime_ns, json.dumps(files), "\n".join(subdirs), int(blocked)))
+                if row:
+                    self._removed.extend(vanished_subdirs(dir_key, row[2], subdirs))
+        return listing
+    
+    @staticmethod
+    def scan_directory(dir_path: str) -> Optional[Tuple[List[Tuple[str, int, float]], List[str], bool]]:
+        """List a directory with os.scandir, taking file sizes and mtimes from the entries"""
+        files = []
+        subdirs = []
+        blocked = False
+        try:
+            with os.scandir(dir_path) as it:
+                for entry in it:
+                    try:
+                        # Links and junctions are neither followed nor reported
+                        if entry.is_symlink() or getattr(entry, "is_junction", lambda: False)():
+                            blocked = True
+                        elif entry.is_dir(follow_symlinks=False):
+                            subdirs.append(entry.name)
+                        elif entry.is_file(follow_symlinks=False):
+                            stat = entry.stat(follow_symlinks=False)
+                            files.append((entry.name, stat.st_size, stat.st_mtime))
+                        else:
+                            blocked = True
+                    except OSError:
+                        blocked = True  # In use or vanished mid-scan
+        except (PermissionError, OSError):
+            return None
+        return files, subdirs, blocked
+    
+    def _lookup(self, dir_key: str) -> Optional[Tuple[int, str, str, int]]:
+        if self._conn is None:
+            return None
+        try:
+            with self._lock:
+                return self._conn.execute(
+                    "SELECT mtime_ns, files, subdirs, blocked FROM junk_dirs WHERE path = ?",
+                    (dir_key,)
+                ).fetchone()
+        except sqlite3.Error:
+            return None
+    
+    def flush(self):
+        """Persist refreshed listings and drop the subtrees of directories that no longer exist"""
+        with self._lock:
+            updates, self._updates = self._updates, []
+            removed, self._removed = self._removed, []
+            if self._conn is None or not (updates or removed):
+                return
+            try:
+                delete_dir_rows(self._conn, "junk_dirs", removed)
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO junk_dirs (path, mtime_ns, files, subdirs, blocked) "
+                    "VALUES (?, ?, ?, ?, ?)", updates
+                )
+                self._conn.commit()
+            except sqlite3.Error:
+                pass
+    
+    def close(self):
+        """Flush pending rows and close the index database"""
+        self.flush()
+        if self._conn is not None:
+            with self._lock:
+                self._conn.close()
+                self._conn = None
+
 # === Deep Scan Engine ===
 class DeepScanEngine:
-    def __init__(self, logger=None):
+    def __init__(self, logger=None, size_cache: Optional[FolderSizeCache] = None,
+                 registry: Optional[RegistryProvider] = None):
         self.logger = logger
-        self.common_program_locations = [
-            Path(os.getenv("ProgramFiles", "")),
-            Path(os.getenv("ProgramFiles(x86)", "")),
-        ]
-        self.user_data_locations = [
-            Path(os.getenv("LOCALAPPDATA", "")),
-            Path(os.getenv("APPDATA", "")),
-            Path(os.getenv("USERPROFILE", "")) / "Documents",
-            Path(os.getenv("PUBLIC", "")) / "Documents",
-        ]
+        self.size_cache = size_cache or FolderSizeCache()
+        self.registry = registry or get_registry_provider()
+        self._scan_state = threading.local()  # Per-thread state of the scan in progress
+        # Locations under an unset variable are left out rather than resolved against the cwd
+        env_path = self._env_path
+        self.common_program_locations = self._present(
+            env_path("ProgramFiles"),
+            env_path("ProgramFiles(x86)"),
+        )
+        self.user_data_locations = self._present(
+            env_path("LOCALAPPDATA"),
+            env_path("APPDATA"),
+            env_path("USERPROFILE", "Documents"),
+            env_path("PUBLIC", "Documents"),
+        )
         self.system_locations = [
             Path("C:\\Windows\\System32"),
             Path("C:\\Windows\\SysWOW64"),
         ]
+        self.shortcut_locations = self._present(
+            env_path("PUBLIC", "Desktop"),
+            env_path("USERPROFILE", "Desktop"),
+            env_path("APPDATA", "Microsoft", "Windows", "Start Menu", "Programs"),
+            env_path("PROGRAMDATA", "Microsoft", "Windows", "Start Menu", "Programs"),
+        )
+        self.temp_locations = self._present(
+            env_path("TEMP"),
+            Path("C:\\Windows\\Temp"),
+            env_path("LOCALAPPDATA", "Temp"),
+        )
+        
+        # File-system stages share a single directory walk
+        self.scan_stages = [
+            ScanStage("program_files", self.common_program_locations, self._match_program_folder),
+            ScanStage("appdata", self.user_data_locations, self._match_user_data),
+            ScanStage("shortcuts", self.shortcut_locations, self._match_shortcut, recursive=True),
+            ScanStage("temp", self.temp_locations, self._match_temp_entry),
+            ScanStage("system", self.system_locations, self._match_system_file),
+        ]
+        
+        # Registry scan limits: keys visited per root and seconds per scan
+        self.registry_node_budget = 250000
+        self.registry_time_budget = 15.0
+        # Keys below a root are listed this many levels deep (Software\Vendor\Product\Key,
+        # as the old recursive scan did); deeper, only keys matching a program, publisher
+        # or install folder term are opened. The budgets above bound the work either way
+        self.registry_listed_depth = 3
+        # Subtrees (relative to the hive) that hold no per-application leftovers;
+        # they are skipped unless their own name matches a search term
+        self.registry_pruned_paths = {
+            r"software\classes",
+            r"software\microsoft",
+            r"software\policies",
+            r"software\wow6432node",  # Scanned as its own root
+            r"software\wow6432node\classes",
+            r"software\wow6432node\microsoft",
+            r"software\wow6432node\policies",
+        }
+
+    @staticmethod
+    def _env_path(variable: str, *parts: str) -> Optional[Path]:
+        """Path below an environment variable, or None when the variable is unset or empty"""
+        base = os.getenv(variable)
+        return Path(base, *parts) if base else None
+
+    @staticmethod
+    def _present(*paths: Optional[Path]) -> List[Path]:
+        return [path for path in paths if path is not None]
 
     def deep_scan_leftovers(self, program_name: str, install_location: str = "", 
-                           progress_callback: Optional[Callable] = None) -> DeepScanResult:
+                           progress_callback: Optional[Callable] = None,
+                           cancel_token: Optional[CancellationToken] = None,
+                           publisher: str = "") -> DeepScanResult:
         """Perform deep scan for leftover files, folders, and registry entries"""
+        return self._deep_scan([(program_name, install_location, publisher)], progress_callback, cancel_token)[0]
+
+    def deep_scan_many(self, programs: List[ProgramInfo], 
+                       progress_callback: Optional[Callable] = None,
+                       cancel_token: Optional[CancellationToken] = None) -> List[DeepScanResult]:
+        """Scan leftovers for several programs with a single file-system and registry traversal"""
+        return self._deep_scan([(prog.name, prog.install_location, prog.publisher) for prog in programs], 
+                               progress_callback, cancel_token)
+
+    def iter_deep_scan(self, program_name: str, install_location: str = "",
+                       progress_callback: Optional[Callable] = None,
+                       cancel_token: Optional[CancellationToken] = None,
+                       publisher: str = "") -> Iterator[List[LeftoverItem]]:
+        """Yield scored leftovers in small batches as the scan finds them"""
+        for _, batch in self._iter_deep_scan([(program_name, install_location, publisher)], 
+                                             progress_callback, cancel_token):
+            yield batch
+
+    def iter_deep_scan_many(self, programs: List[ProgramInfo],
+                            progress_callback: Optional[Callable] = None,
+                            cancel_token: Optional[CancellationToken] = None
+                            ) -> Iterator[Tuple[int, List[LeftoverItem]]]:
+        """Yield (program index, batch) as the shared scan finds each program's leftovers"""
+        return self._iter_deep_scan([(prog.name, prog.install_location, prog.publisher) for prog in programs], 
+                                    progress_callback, cancel_token)
+
+    def _deep_scan(self, targets: List[Tuple[str, str, str]], 
+                   progress_callback: Optional[Callable] = None,
+                   cancel_token: Optional[CancellationToken] = None) -> List[DeepScanResult]:
+        """Scan for the leftovers of every (program name, install location, publisher) target in one pass"""
         start_time = time.time()
-        leftover_items = []
+        leftovers_by_target: List[List[LeftoverItem]] = [[] for _ in targets]
         
-        # Clean program name for searching
-        clean_name = self._clean_program_name(program_name)
-        search_terms = self._generate_search_terms(program_name, clean_name)
+        for index, batch in self._iter_deep_scan(targets, progress_callback, cancel_token):
+            leftovers_by_target[index].extend(batch)
         
-        total_steps = 7
-        current_step = 0
+        scan_time = time.time() - start_time
         
-        try:
-            # Step 1: Scan Program Files
-            if progress_callback:
-                progress_callback(current_step, total_steps, "Scanning Program Files", "")
-            leftover_items.extend(self._scan_program_files(search_terms, install_location))
-            current_step += 1
-            
-            # Step 2: Scan User Data
-            if progress_callback:
-                progress_callback(current_step, total_steps, "Scanning User Data", "")
-            leftover_items.extend(self._scan_user_data(search_terms))
-            current_step += 1
+        return [
+            DeepScanResult(program_name, leftover_items, sum(item.size for item in leftover_items), scan_time)
+            for (program_name, _, _), leftover_items in zip(targets, leftovers_by_target)
+        ]
+
+    def _iter_deep_scan(self, targets: List[Tuple[str, str, str]], progress_callback: Optional[Callable] = None,
+                        cancel_token: Optional[CancellationToken] = None, batch_size: int = 25, 
+                        batch_interval: float = 0.1) -> Iterator[Tuple[int, List[LeftoverItem]]]:
+        """Yield (target index, scored leftovers) batches for every target in one pass.
+        
+        A batch is flushed once it holds batch_size items, batch_interval seconds
+        after the previous flush, or at the end of a stage. The first item found
+        is flushed on its own so results appear immediately. Once cancel_token is
+        cancelled the scan stops at the next entry or key and flushes what it has.
+        """
+        cancel_token = cancel_token or CancellationToken()
+        # Folder sizing runs inside the stage matchers; it reads the token from here
+        self._scan_state.cancel_token = cancel_token
+
+        # Build one matcher per program plus a combined one over all terms,
+        # remembering which programs each term belongs to
+        matchers = []
+        term_owners: Dict[str, Set[int]] = {}
+        vendor_terms: Set[str] = set()
+        for index, (program_name, install_location, publisher) in enumerate(targets):
+            clean_name = self._clean_program_name(program_name)
+            search_terms = self._generate_search_terms(program_name, clean_name)
+            matchers.append(SearchTermMatcher(search_terms))
+            for term in search_terms:
+                term_owners.setdefault(term, set()).add(index)
+            vendor_terms |= self._generate_vendor_terms(publisher, install_location)
+        combined_matcher = SearchTermMatcher(term_owners)
+        # Registry keys matching these are descended into but not reported
+        descend_matcher = SearchTermMatcher(set(term_owners) | vendor_terms)
+        
+        pending: List[List[LeftoverItem]] = [[] for _ in targets]
+        flushed_any = False
+        last_flush = time.monotonic()
+        
+        def flush(force: bool = False) -> List[Tuple[int, List[LeftoverItem]]]:
+            nonlocal flushed_any, last_flush
+            buffered = sum(len(items) for items in pending)
+            if not buffered:
+                return []
+            if not (force or not flushed_any or buffered >= batch_size 
+                    or time.monotonic() - last_flush >= batch_interval):
+                return []
             
-            # Step 3: Scan Registry
+            batches = []
+            for index, items in enumerate(pending):
+                if items:
+                    self._calculate_confidence_scores(items, matchers[index])
+                    batches.append((index, items))
+                    pending[index] = []
+            flushed_any = True
+            last_flush = time.monotonic()
+            return batches
+        
+        total_steps = 2
+        current_step = 0
+        
+        def step_progress(current, total, message, detail=""):
             if progress_callback:
-                progress_callback(current_step, total_steps, "Scanning Registry", "")
-            leftover_items.extend(self._scan_registry(search_terms))
-            current_step += 1
+                progress_callback(current_step, total_steps, message, detail)
+        
+        try:
+            # Step 1: Scan the install locations, then walk program files, user data,
+            # shortcuts, temp and system folders once for all file-system stages
+            step_progress(0, 0, "Scanning File System")
             
-            # Step 4: Scan Shortcuts
-            if progress_callback:
-                progress_callback(current_step, total_steps, "Scanning Shortcuts", "")
-            leftover_items.extend(self._scan_shortcuts(search_terms))
-            current_step += 1
+            for index, (_, install_location, _) in enumerate(targets):
+                if cancel_token.cancelled:
+                    break
+                if install_location and Path(install_location).is_dir():
+                    install_path = Path(install_location)
+                    pending[index].append(LeftoverItem(
+                        install_path, "folder", 
+                        self._get_folder_size(install_path),
+                        "program_files", "High"
+                    ))
+                    yield from flush()
             
-            # Step 5: Scan Temporary Files
-            if progress_callback:
-                progress_callback(current_step, total_steps, "Scanning Temp Files", "")
-            leftover_items.extend(self._scan_temp_files(search_terms))
+            for item in self._iter_scan_stages(self.scan_stages, combined_matcher, step_progress, cancel_token):
+                self._assign_leftovers([item], term_owners, pending)
+                yield from flush()
+            yield from flush(force=True)
             current_step += 1
             
-            # Step 6: Scan System Files
-            if progress_callback:
-                progress_callback(current_step, total_steps, "Scanning System Files", "")
-            leftover_items.extend(self._scan_system_files(search_terms))
+            # Step 2: Scan Registry, one batch per root as the roots complete in order
+            if not cancel_token.cancelled:
+                step_progress(0, 0, "Scanning Registry")
+                for root_leftovers in self._iter_registry_roots(combined_matcher, step_progress, cancel_token,
+                                                                descend_matcher):
+                    self._assign_leftovers(root_leftovers, term_owners, pending)
+                    yield from flush(force=True)
             current_step += 1
             
-            # Step 7: Calculate confidence scores
-            if progress_callback:
-                progress_callback(current_step, total_steps, "Analyzing Results", "")
-            self._calculate_confidence_scores(leftover_items, search_terms)
-            current_step += 1
+            step_progress(0, 0, "Analyzing Results")
             
         except Exception as e:
             if self.logger:
                 self.logger.log(f"Deep scan error: {str(e)}", LogLevel.ERROR)
-        
-        total_size = sum(item.size for item in leftover_items)
-        scan_time = time.time() - start_time
-        
-        return DeepScanResult(program_name, leftover_items, total_size, scan_time)
+            yield from flush(force=True)
+        finally:
+            self._scan_state.cancel_token = None
+
+    def _assign_leftovers(self, items: List[LeftoverItem], term_owners: Dict[str, Set[int]], 
+                          leftovers_by_target: List[List[LeftoverItem]]):
+        """Hand each leftover found by the combined matcher to the programs whose terms hit it"""
+        for item in items:
+            owners = set()
+            for term in item.matched_terms:
+                owners.update(term_owners[term])
+            
+            if len(owners) == 1:
+                leftovers_by_target[owners.pop()].append(item)
+                continue
+            
+            # Shared items get a copy per program, carrying only that program's terms
+            for owner in sorted(owners):
+                leftovers_by_target[owner].append(replace(
+                    item, matched_terms=tuple(term for term in item.matched_terms if owner in term_owners[term])
+                ))
 
     def _clean_program_name(self, name: str) -> str:
         """Clean program name for better searching"""
@@ -1331,238 +2466,328 @@ class DeepScanEngine:
         
         return terms
 
-    def _scan_program_files(self, search_terms: Set[str], install_location: str = "") -> List[LeftoverItem]:
-        """Scan Program Files directories for leftovers"""
-        leftovers = []
-        
-        # First check the specific install location if provided
-        if install_location and Path(install_location).exists():
-            try:
-                install_path = Path(install_location)
-                if install_path.is_dir():
-                    leftovers.append(LeftoverItem(
-                        install_path, "folder", 
-                        self._get_folder_size(install_path),
-                        "program_files", "High"
-                    ))
-            except (PermissionError, OSError):
-                pass
-        
-        # Scan common program directories
-        for base_dir in self.common_program_locations:
-            if not base_dir.exists():
+    # Words that say nothing about which vendor key a publisher uses
+    PUBLISHER_NOISE = {"inc", "corp", "corporation", "llc", "ltd", "limited", "gmbh", "company",
+                       "software", "systems", "technologies", "the"}
+
+    def _generate_vendor_terms(self, publisher: str, install_location: str = "") -> Set[str]:
+        """Names a program's vendor registry key may carry: publisher words and install folder names"""
+        words = [word for word in re.sub(r'[^\w\s]', '', publisher).lower().split() 
+                 if word not in self.PUBLISHER_NOISE]
+        terms = {" ".join(words)} | {word for word in words if len(word) > 2}
+        
+        # "C:\Program Files\VideoLAN\VLC" -> "vlc", "videolan"; top-level folders are skipped
+        folders = [part.lower() for part in PureWindowsPath(install_location).parts[1:]]
+        terms.update(folders[-1:] if len(folders) < 3 else folders[-2:])
+        return {term for term in terms if len(term) > 2}
+
+    def _iter_scan_stages(self, stages: List[ScanStage], matcher: SearchTermMatcher,
+                          progress_callback: Optional[Callable] = None,
+                          cancel_token: Optional[CancellationToken] = None) -> Iterator[LeftoverItem]:
+        """Visit each stage root once with os.scandir and feed every entry to the stages watching it"""
+        # Group stages by root so shared roots (e.g. %TEMP% and %LOCALAPPDATA%\Temp) are listed once
+        roots: Dict[str, Tuple[str, List[ScanStage]]] = {}
+        for stage in stages:
+            for root in stage.roots:
+                root_key = os.path.normcase(os.path.abspath(root))
+                roots.setdefault(root_key, (os.path.abspath(root), []))[1].append(stage)
+        
+        visited: Set[str] = set()
+        
+        # Sorted keys put ancestors first, so a root nested under a recursive
+        # stage is picked up by that walk instead of being listed again
+        for index, root_key in enumerate(sorted(roots)):
+            if root_key in visited:
                 continue
+            
+            if progress_callback:
+                progress_callback(index, len(roots), "Scanning File System", roots[root_key][0])
+            
+            pending = [(roots[root_key][0], root_key, [])]
+            while pending:
+                dir_path, dir_key, inherited = pending.pop()
+                if dir_key in visited:
+                    continue
+                visited.add(dir_key)
                 
-            try:
-                for item in base_dir.iterdir():
-                    if item.is_dir():
-                        item_name = item.name.lower()
-                        if any(term in item_name for term in search_terms):
-                            size = self._get_folder_size(item)
-                            leftovers.append(LeftoverItem(
-                                item, "folder", size, "program_files", "High"
-                            ))
-            except (PermissionError, OSError):
-                continue
+                active = list(inherited)
+                if dir_key in roots:
+                    active.extend(stage for stage in roots[dir_key][1] if stage not in active)
+                recursive = [stage for stage in active if stage.recursive]
                 
-        return leftovers
+                try:
+                    with os.scandir(dir_path) as it:
+                        entries = list(it)
+                except (PermissionError, OSError):
+                    continue
+                
+                for entry in entries:
+                    if cancel_token and cancel_token.cancelled:
+                        return
+                    item_name = entry.name.lower()
+                    
+                    for stage in active:
+                        try:
+                            item = stage.matcher(entry, item_name, matcher)
+                        except (PermissionError, OSError):
+                            continue
+                        if item:
+                            yield item
+                    
+                    try:
+                        is_dir = entry.is_dir(follow_symlinks=False)
+                    except OSError:
+                        continue
+                    
+                    if is_dir:
+                        child_key = os.path.normcase(entry.path)
+                        if recursive or child_key in roots:
+                            pending.append((entry.path, child_key, recursive))
+
+    def _match_program_folder(self, entry: os.DirEntry, item_name: str,
+                              matcher: SearchTermMatcher) -> Optional[LeftoverItem]:
+        """Match a Program Files entry: only folders are considered"""
+        hits = matcher.search(item_name)
+        if hits and entry.is_dir():
+            item = Path(entry.path)
+            return LeftoverItem(item, "folder", self._get_folder_size(item), "program_files", "High", hits)
+        return None
+
+    def _match_user_data(self, entry: os.DirEntry, item_name: str,
+                         matcher: SearchTermMatcher) -> Optional[LeftoverItem]:
+        """Match a user data entry (AppData, Documents)"""
+        hits = matcher.search(item_name)
+        if hits:
+            return self._entry_to_leftover(entry, "appdata", "Medium", hits)
+        return None
+
+    def _match_shortcut(self, entry: os.DirEntry, item_name: str,
+                        matcher: SearchTermMatcher) -> Optional[LeftoverItem]:
+        """Match a .lnk shortcut anywhere below the desktop and Start Menu roots"""
+        if not item_name.endswith(".lnk"):
+            return None
+        hits = matcher.search(item_name)
+        if hits and entry.is_file():
+            return LeftoverItem(Path(entry.path), "file", entry.stat().st_size, "shortcuts", "High", hits)
+        return None
+
+    def _match_temp_entry(self, entry: os.DirEntry, item_name: str,
+                          matcher: SearchTermMatcher) -> Optional[LeftoverItem]:
+        """Match an entry in a temporary directory"""
+        hits = matcher.search(item_name)
+        if hits:
+            return self._entry_to_leftover(entry, "temp", "Low", hits)
+        return None
+
+    def _match_system_file(self, entry: os.DirEntry, item_name: str,
+                           matcher: SearchTermMatcher) -> Optional[LeftoverItem]:
+        """Match a DLL left behind in a system directory"""
+        if not item_name.endswith(".dll"):
+            return None
+        hits = matcher.search(item_name)
+        if hits and entry.is_file():
+            return LeftoverItem(Path(entry.path), "file", entry.stat().st_size, "system", "Low", hits)
+        return None
 
-    def _scan_user_data(self, search_terms: Set[str]) -> List[LeftoverItem]:
-        """Scan user data directories for leftovers"""
+    def _entry_to_leftover(self, entry: os.DirEntry, category: str, confidence: str,
+                           hits: Tuple[str, ...]) -> LeftoverItem:
+        """Build a leftover item from a directory entry, reusing its cached stat data"""
+        item = Path(entry.path)
+        if entry.is_dir():
+            return LeftoverItem(item, "folder", self._get_folder_size(item), category, confidence, hits)
+        return LeftoverItem(item, "file", entry.stat().st_size, category, confidence, hits)
+
+    def _scan_registry(self, matcher: SearchTermMatcher, progress_callback: Optional[Callable] = None,
+                       cancel_token: Optional[CancellationToken] = None,
+                       descend_matcher: Optional[SearchTermMatcher] = None) -> List[LeftoverItem]:
+        """Scan Windows Registry for leftover entries, one worker per root key"""
         leftovers = []
-        
-        for base_dir in self.user_data_locations:
-            if not base_dir.exists():
-                continue
-                
-            try:
-                for item in base_dir.iterdir():
-                    item_name = item.name.lower()
-                    if any(term in item_name for term in search_terms):
-                        if item.is_dir():
-                            size = self._get_folder_size(item)
-                            leftovers.append(LeftoverItem(
-                                item, "folder", size, "appdata", "Medium"
-                            ))
-                        else:
-                            size = item.stat().st_size
-                            leftovers.append(LeftoverItem(
-                                item, "file", size, "appdata", "Medium"
-                            ))
-            except (PermissionError, OSError):
-                continue
-                
+        for root_leftovers in self._iter_registry_roots(matcher, progress_callback, cancel_token, descend_matcher):
+            leftovers.extend(root_leftovers)
         return leftovers
 
-    def _scan_registry(self, search_terms: Set[str]) -> List[LeftoverItem]:
-        """Scan Windows Registry for leftover entries"""
-        leftovers = []
-        
+    def _iter_registry_roots(self, matcher: SearchTermMatcher, progress_callback: Optional[Callable] = None,
+                             cancel_token: Optional[CancellationToken] = None,
+                             descend_matcher: Optional[SearchTermMatcher] = None) -> Iterator[List[LeftoverItem]]:
+        """Scan the registry roots concurrently, yielding each root's leftovers in root order"""
         registry_paths = [
-            (winreg.HKEY_CURRENT_USER, r"Software"),
-            (winreg.HKEY_LOCAL_MACHINE, r"Software"),
-            (winreg.HKEY_LOCAL_MACHINE, r"Software\WOW6432Node"),
+            (HKEY_CURRENT_USER, r"Software"),
+            (HKEY_LOCAL_MACHINE, r"Software"),
+            (HKEY_LOCAL_MACHINE, r"Software\WOW6432Node"),
         ]
+        deadline = time.monotonic() + self.registry_time_budget
         
-        for hive, path in registry_paths:
+        def scan_root(hive, path) -> List[LeftoverItem]:
+            root_leftovers = []
             try:
-                self._scan_registry_key(hive, path, search_terms, leftovers)
+                complete = self._scan_registry_key(hive, path, matcher, root_leftovers, deadline, cancel_token,
+                                                   descend_matcher)
+                if not complete and self.logger and not (cancel_token and cancel_token.cancelled):
+                    self.logger.log(f"Registry scan budget reached under {HIVE_NAMES[hive]}\\{path}", 
+                                    LogLevel.WARNING)
             except (PermissionError, OSError):
-                continue
-                
-        return leftovers
-
-    def _scan_registry_key(self, hive, path: str, search_terms: Set[str], 
-                          leftovers: List[LeftoverItem], depth: int = 0):
-        """Recursively scan a registry key"""
-        if depth > 3:  # Limit recursion depth
-            return
+                pass
+            return root_leftovers
+        
+        # winreg releases the GIL while in the registry API, so the roots
+        # are walked concurrently; each worker opens its own handles
+        with ThreadPoolExecutor(max_workers=len(registry_paths), thread_name_prefix="RegistryScan") as pool:
+            futures = [pool.submit(scan_root, hive, path) for hive, path in registry_paths]
             
+            # Yield in root order so results do not depend on thread timing
+            for index, ((hive, path), future) in enumerate(zip(registry_paths, futures), 1):
+                root_leftovers = future.result()
+                if progress_callback:
+                    progress_callback(index, len(registry_paths), "Scanning Registry", 
+                                      f"{HIVE_NAMES[hive]}\\{path}")
+                yield root_leftovers
+
+    def _scan_registry_key(self, hive, path: str, matcher: SearchTermMatcher, leftovers: List[LeftoverItem], 
+                          deadline: float, cancel_token: Optional[CancellationToken] = None,
+                          descend_matcher: Optional[SearchTermMatcher] = None) -> bool:
+        """Depth-first scan below a registry key within the node and time budgets.
+        
+        Every key within registry_listed_depth of the root, or of a key whose name
+        matches matcher or descend_matcher (program, publisher and install folder
+        terms), is listed; other keys below that depth are not opened. Each key is opened relative to its
+        parent's handle, which stays open until its children are done, so open
+        handles are bounded by the depth. Returns False if a budget ran out or the
+        scan was cancelled first.
+        """
+        registry = self.registry
+        descend_matcher = descend_matcher or matcher
+        root_key = registry.open_key(hive, path)
+        # (open handle, key path, remaining subkey names, depth below the root or last matching key)
+        stack = [(root_key, path, iter(self._enum_subkeys(root_key)), 0)]
+        
+        visited = 0
         try:
-            key = winreg.OpenKey(hive, path)
-            num_subkeys = winreg.QueryInfoKey(key)[0]
-            
-            for i in range(min(num_subkeys, 100)):  # Limit number of subkeys to scan
-                try:
-                    subkey_name = winreg.EnumKey(key, i)
-                    if any(term in subkey_name.lower() for term in search_terms):
-                        full_path = f"{path}\\{subkey_name}"
-                        leftovers.append(LeftoverItem(
-                            Path(full_path), "registry", 0, "registry", "Medium"
-                        ))
-                    
-                    # Recurse into subkey if it might contain relevant entries
-                    if depth < 2 and len(subkey_name) > 3:
-                        subkey_path = f"{path}\\{subkey_name}"
-                        self._scan_registry_key(hive, subkey_path, search_terms, 
-                                              leftovers, depth + 1)
-                        
-                except (OSError, PermissionError):
+            while stack:
+                parent_key, parent_path, subkey_names, depth = stack[-1]
+                subkey_name = next(subkey_names, None)
+                if subkey_name is None:
+                    registry.close_key(parent_key)
+                    stack.pop()
                     continue
-                    
-            winreg.CloseKey(key)
-        except (FileNotFoundError, PermissionError, OSError):
-            pass
-
-    def _scan_shortcuts(self, search_terms: Set[str]) -> List[LeftoverItem]:
-        """Scan for leftover shortcuts"""
-        leftovers = []
-        
-        shortcut_locations = [
-            Path(os.getenv("PUBLIC", "")) / "Desktop",
-            Path(os.getenv("USERPROFILE", "")) / "Desktop",
-            Path(os.getenv("APPDATA", "")) / "Microsoft" / "Windows" / "Start Menu" / "Programs",
-            Path(os.getenv("PROGRAMDATA", "")) / "Microsoft" / "Windows" / "Start Menu" / "Programs",
-        ]
-        
-        for location in shortcut_locations:
-            if not location.exists():
-                continue
-                
-            try:
-                for item in location.rglob("*.lnk"):
-                    item_name = item.name.lower()
-                    if any(term in item_name for term in search_terms):
-                        leftovers.append(LeftoverItem(
-                            item, "file", item.stat().st_size, "shortcuts", "High"
-                        ))
-            except (PermissionError, OSError):
-                continue
                 
-        return leftovers
-
-    def _scan_temp_files(self, search_terms: Set[str]) -> List[LeftoverItem]:
-        """Scan temporary directories for leftovers"""
-        leftovers = []
-        
-        temp_locations = [
-            Path(os.getenv("TEMP", "")),
-            Path("C:\\Windows\\Temp"),
-            Path(os.getenv("LOCALAPPDATA", "")) / "Temp",
-        ]
-        
-        for temp_dir in temp_locations:
-            if not temp_dir.exists():
-                continue
+                visited += 1
+                if visited > self.registry_node_budget or time.monotonic() > deadline:
+                    return False
+                if cancel_token and cancel_token.cancelled:
+                    return False
                 
-            try:
-                for item in temp_dir.iterdir():
-                    item_name = item.name.lower()
-                    if any(term in item_name for term in search_terms):
-                        if item.is_dir():
-                            size = self._get_folder_size(item)
-                            leftovers.append(LeftoverItem(
-                                item, "folder", size, "temp", "Low"
-                            ))
-                        else:
-                            size = item.stat().st_size
-                            leftovers.append(LeftoverItem(
-                                item, "file", size, "temp", "Low"
-                            ))
-            except (PermissionError, OSError):
-                continue
+                subkey_path = f"{parent_path}\\{subkey_name}"
+                lower_name = subkey_name.lower()
+                hits = matcher.search(lower_name)
+                if hits:
+                    # Keep the hive in the path so the cleanup can reopen the key
+                    leftovers.append(LeftoverItem(
+                        PureWindowsPath(HIVE_NAMES[hive], subkey_path), "registry", 0, 
+                        "registry", "Medium", hits
+                    ))
+                child_depth = 0 if hits or descend_matcher.search(lower_name) else depth + 1
+                if child_depth and (child_depth >= self.registry_listed_depth 
+                                    or subkey_path.lower() in self.registry_pruned_paths):
+                    continue
                 
-        return leftovers
-
-    def _scan_system_files(self, search_terms: Set[str]) -> List[LeftoverItem]:
-        """Scan system directories for leftover files (DLLs, etc.)"""
-        leftovers = []
+                try:
+                    subkey = registry.open_key(parent_key, subkey_name)
+                except (PermissionError, OSError):
+                    continue
+                child_names = self._enum_subkeys(subkey)
+                if child_names:
+                    stack.append((subkey, subkey_path, iter(child_names), child_depth))
+                else:
+                    registry.close_key(subkey)
+        finally:
+            for handle, _, _, _ in stack:
+                registry.close_key(handle)
         
-        for sys_dir in self.system_locations:
-            if not sys_dir.exists():
-                continue
-                
-            try:
-                for item in sys_dir.glob("*.dll"):
-                    item_name = item.name.lower()
-                    if any(term in item_name for term in search_terms):
-                        leftovers.append(LeftoverItem(
-                            item, "file", item.stat().st_size, "system", "Low"
-                        ))
-            except (PermissionError, OSError):
-                continue
-                
-        return leftovers
+        return True
 
-    def _get_folder_size(self, folder_path: Path) -> int:
-        """Calculate total size of a folder"""
-        total_size = 0
+    def _enum_subkeys(self, key) -> List[str]:
+        """List the subkey names of an open registry key"""
+        names = []
         try:
-            for item in folder_path.rglob("*"):
-                if item.is_file():
-                    try:
-                        total_size += item.stat().st_size
-                    except (OSError, FileNotFoundError):
-                        continue
+            num_subkeys = self.registry.query_info_key(key)[0]
+            for i in range(num_subkeys):
+                names.append(self.registry.enum_key(key, i))
         except (PermissionError, OSError):
             pass
-        return total_size
+        return names
+
+    def registry_key_owned(self, key_path: PureWindowsPath, program_name: str, publisher: str = "") -> bool:
+        """Whether a registry leftover is the program's own key rather than one shared with others.
+
+        Registry leftovers are found by substring terms, so a hit such as
+        Software\\Google for "Google Chrome" may hold other programs' settings.
+        Owned keys are named after the whole program ("Google Chrome"), or after
+        one of its words directly under the publisher's vendor key (Google\\Chrome).
+        """
+        key_name = key_path.name.lower()
+        clean_name = self._clean_program_name(program_name).lower()
+        if key_name in {program_name.lower(), clean_name} - {""}:
+            return True
+
+        vendor_words = [word for word in re.sub(r'[^\w\s]', '', publisher).lower().split()
+                        if word not in self.PUBLISHER_NOISE]
+        return (bool(vendor_words) and key_path.parent.name.lower() == " ".join(vendor_words)
+                and key_name in self._generate_search_terms(program_name, clean_name))
+
+    def delete_registry_leftover(self, item: LeftoverItem, program_name: str, publisher: str = ""):
+        """Delete a registry leftover key of program_name.
+
+        Raises PermissionError for keys the program does not own (see
+        registry_key_owned) and OSError when the registry refuses the delete,
+        e.g. for a key that still has subkeys. A key already gone is not an error.
+        """
+        hive_name, *parent_parts, key_name = PureWindowsPath(item.path).parts
+        hive = HIVES_BY_NAME.get(hive_name.upper())
+        if hive is None or not parent_parts:
+            raise PermissionError("not a removable registry key")
+        if not self.registry_key_owned(PureWindowsPath(item.path), program_name, publisher):
+            raise PermissionError("left in place, the key may be shared with other programs")
+
+        try:
+            key = self.registry.open_key(hive, "\\".join(parent_parts), KEY_SET_VALUE)
+        except FileNotFoundError:
+            return  # Already deleted
+        try:
+            self.registry.delete_key(key, key_name)
+        except FileNotFoundError:
+            pass
+        finally:
+            self.registry.close_key(key)
+
+    def _get_folder_size(self, folder_path: Path) -> int:
+        """Calculate total size of a folder using the persistent size cache"""
+        return self.size_cache.get_size(folder_path, getattr(self._scan_state, "cancel_token", None))
 
-    def _calculate_confidence_scores(self, leftovers: List[LeftoverItem], search_terms: Set[str]):
+    def _calculate_confidence_scores(self, leftovers: List[LeftoverItem], matcher: SearchTermMatcher):
         """Calculate confidence scores based on various factors"""
+        category_weights = {
+            "program_files": 0.4,
+            "shortcuts": 0.3,
+            "appdata": 0.2,
+            "registry": 0.1,
+            "temp": 0.05,
+            "system": 0.05
+        }
+        
         for item in leftovers:
-            # Start with base confidence
-            confidence_score = 0.5
+            # Start with base confidence, increased based on category
+            confidence_score = 0.5 + category_weights.get(item.category, 0)
             
-            # Increase confidence based on category
-            category_weights = {
-                "program_files": 0.4,
-                "shortcuts": 0.3,
-                "appdata": 0.2,
-                "registry": 0.1,
-                "temp": 0.05,
-                "system": 0.05
-            }
-            confidence_score += category_weights.get(item.category, 0)
-            
-            # Increase confidence based on exact matches
+            # Reuse the terms that hit during the scan where available
             item_name = item.path.name.lower()
-            exact_matches = sum(1 for term in search_terms if term == item_name)
-            confidence_score += exact_matches * 0.2
+            hits = item.matched_terms or matcher.search(item_name)
+            
+            # Increase confidence based on an exact match
+            if item_name in hits:
+                confidence_score += 0.2
             
             # Increase confidence based on partial matches
-            partial_matches = sum(1 for term in search_terms if term in item_name)
-            confidence_score += partial_matches * 0.1
+            confidence_score += len(hits) * 0.1
             
             # Assign final confidence level
             if confidence_score >= 0.8:
@@ -1574,12 +2799,25 @@ class DeepScanEngine:
 
 # === Enhanced Async Logger ===
 class AsyncLogger:
-    def __init__(self, text_widget: tk.Text):
+    """Thread-safe log sink for the log Text widget.
+    
+    log() may be called from any thread and only queues the message; the Tk
+    thread drains the queue every FRAME_MS and writes the whole batch with a
+    single insert, so a burst of messages (one per failed file during cleanup)
+    costs a handful of Tcl calls per frame instead of several per line.
+    """
+    FRAME_MS = 50  # Drain interval, about 20 updates per second
+    MAX_LINES = 1000  # Oldest lines are trimmed beyond this
+    
+    def __init__(self, text_widget: "tk.Text", auto_scroll: Optional["tk.BooleanVar"] = None):
         self.log_widget = text_widget
+        self.auto_scroll = auto_scroll
         self.log_queue = queue.Queue()
         self.is_running = True
+        self._line_count = 0
+        self._drain_job = None
         self._setup_log_colors()
-        self._start_log_processor()
+        self._drain_job = self.log_widget.after(self.FRAME_MS, self._drain)
 
     def _setup_log_colors(self):
         """Setup enhanced color scheme for different log levels"""
@@ -1594,98 +2832,374 @@ class AsyncLogger:
         
         for level, (fg, bg) in colors.items():
             self.log_widget.tag_configure(level, foreground=fg, background=bg)
+        self.log_widget.tag_configure("timestamp", foreground="gray", font=("Consolas", 9))
 
-    def _start_log_processor(self):
-        def process_logs():
-            while self.is_running:
-                try:
-                    log_msg = self.log_queue.get(timeout=0.1)
-                    self._update_log_widget(log_msg)
-                except queue.Empty:
-                    continue
-                except tk.TclError:
-                    break
+    def _drain(self):
+        """Write everything queued since the last frame, then reschedule (Tk thread only)"""
+        if not self.is_running:
+            return
+        batch = deque(maxlen=self.MAX_LINES - 1)  # Older lines would be trimmed anyway; one left for the notice
+        dropped = 0
+        while True:
+            try:
+                log_msg = self.log_queue.get_nowait()
+            except queue.Empty:
+                break
+            if len(batch) == batch.maxlen:
+                dropped += 1
+            batch.append(log_msg)
         
-        threading.Thread(target=process_logs, daemon=True).start()
-
-    def _update_log_widget(self, log_msg: LogMessage):
         try:
-            self.log_widget.config(state=tk.NORMAL)
-            
-            # Add log entry with enhanced formatting
-            timestamp_tag = f"{log_msg.level.value}_timestamp"
-            self.log_widget.tag_configure(timestamp_tag, foreground="gray", font=("Consolas", 9))
-            
-            self.log_widget.insert(tk.END, f"[{log_msg.timestamp}] ", timestamp_tag)
-            self.log_widget.insert(tk.END, f"[{log_msg.level.value}] ", log_msg.level.value)
-            self.log_widget.insert(tk.END, f"{log_msg.message}\n")
-            
-            # Limit log size
-            lines = int(self.log_widget.index(tk.END).split('.')[0])
-            if lines > 1000:
-                self.log_widget.delete('1.0', '100.0')
-            
-            self.log_widget.see(tk.END)
-            self.log_widget.config(state=tk.DISABLED)
+            if batch:
+                self._write_batch(batch, dropped)
+            self._drain_job = self.log_widget.after(self.FRAME_MS, self._drain)
         except tk.TclError:
-            pass
+            self.is_running = False  # Widget destroyed
+
+    def _write_batch(self, batch: Iterable[LogMessage], dropped: int = 0):
+        """Insert a batch of messages in one call and trim the widget by line count"""
+        chunks = []
+        if dropped:
+            chunks += [f"[{time.strftime('%H:%M:%S')}] ", "timestamp",
+                       f"[{LogLevel.WARNING.value}] ", LogLevel.WARNING.value,
+                       f"{dropped} older log lines skipped\n", ()]
+        for log_msg in batch:
+            chunks += [f"[{log_msg.timestamp}] ", "timestamp",
+                       f"[{log_msg.level.value}] ", log_msg.level.value,
+                       f"{log_msg.message}\n", ()]
+        # Messages may span several lines (e.g. exception text); trimming needs real line counts
+        lines = sum(log_msg.message.count("\n") + 1 for log_msg in batch) + (1 if dropped else 0)
+        
+        self.log_widget.config(state=tk.NORMAL)
+        self.log_widget.insert(tk.END, *chunks)
+        self._line_count += lines
+        if self._line_count > self.MAX_LINES:
+            excess = self._line_count - self.MAX_LINES
+            self.log_widget.delete('1.0', f'{excess + 1}.0')
+            self._line_count = self.MAX_LINES
+        if self.auto_scroll is None or self.auto_scroll.get():
+            self.log_widget.see(tk.END)
+        self.log_widget.config(state=tk.DISABLED)
 
-    def log(self, message: str, level: LogLevel = LogLevel.INFO):
+    def log(self, message: str, level: Union[LogLevel, str] = LogLevel.INFO):
+        """Queue a message; safe to call from any thread"""
+        if not isinstance(level, LogLevel):
+            try:
+                level = LogLevel(str(level).upper())
+            except ValueError:
+                level = LogLevel.INFO
         timestamp = time.strftime("%H:%M:%S")
         log_msg = LogMessage(message, level, timestamp)
         self.log_queue.put(log_msg)
 
+    def clear(self):
+        """Empty the widget (Tk thread only)"""
+        self.log_widget.config(state=tk.NORMAL)
+        self.log_widget.delete('1.0', tk.END)
+        self.log_widget.config(state=tk.DISABLED)
+        self._line_count = 0
+
     def stop(self):
         self.is_running = False
+        if self._drain_job:
+            try:
+                self.log_widget.after_cancel(self._drain_job)
+            except tk.TclError:
+                pass
+            self._drain_job = None
+
+# === Installed Programs Snapshot ===
+class ProgramSnapshot:
+    """Persisted ProgramInfo records keyed by Uninstall subkey and its last-write time.
+    
+    Layout: {root: {"last_write": t, "subkeys": {name: {"last_write": t, "program": {...} or None}}}}
+    where root is "HIVE\\path" of an Uninstall key. Subkeys without a DisplayName are
+    kept with program None so they are not re-read on every refresh either.
+    """
+    VERSION = 2  # 2: ProgramInfo.size_kb
+    
+    def __init__(self, snapshot_path: Optional[Path] = None):
+        self.snapshot_path = snapshot_path or Path.home() / ".pyuninstallx" / "programs_snapshot.json"
+        self._lock = threading.Lock()
+        self.roots: Dict[str, Dict[str, Any]] = {}
+        self.load()
+    
+    def load(self):
+        """Load the snapshot, discarding it if unreadable or from another format version"""
+        try:
+            with open(self.snapshot_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") == self.VERSION:
+                self.roots = data.get("roots", {})
+        except (OSError, ValueError):
+            self.roots = {}
+    
+    def save(self):
+        """Write the snapshot atomically"""
+        with self._lock:
+            try:
+                self.snapshot_path.parent.mkdir(exist_ok=True)
+                temp_path = self.snapshot_path.with_suffix(".tmp")
+                with open(temp_path, "w", encoding="utf-8") as f:
+                    json.dump({"version": self.VERSION, "roots": self.roots}, f)
+                os.replace(temp_path, self.snapshot_path)
+            except OSError:
+                pass
+    
+    def get_root(self, root: str) -> Dict[str, Any]:
+        return self.roots.get(root, {})
+    
+    def set_root(self, root: str, root_data: Dict[str, Any]):
+        with self._lock:
+            self.roots[root] = root_data
+    
+    def programs(self) -> List[ProgramInfo]:
+        """Return the snapshotted programs sorted by name"""
+        programs = [
+            ProgramInfo(**entry["program"])
+            for root_data in list(self.roots.values())
+            for entry in root_data.get("subkeys", {}).values()
+            if entry.get("program")
+        ]
+        return sorted(programs, key=lambda x: x.name.lower())
+
+# === Program Search Index ===
+class ProgramSearchIndex:
+    """Bigram index over program name, publisher and install location, with publisher facets.
+    
+    Built once per refresh. A query becomes an intersection of the posting sets
+    of its bigrams, and only those candidates get a substring check. Hits are
+    ranked by where they match (exact name, name prefix, word start, name, other
+    fields). When nothing matches exactly, programs sharing most of the query's
+    bigrams are returned as ranked fuzzy matches.
+    """
+    FUZZY_MIN_SHARE = 0.5  # Fraction of the query's bigrams a fuzzy match must contain
+    FUZZY_LIMIT = 50
+    
+    def __init__(self, programs: Optional[List[ProgramInfo]] = None):
+        self.programs: List[ProgramInfo] = []
+        self._names: List[str] = []
+        self._texts: List[str] = []
+        self._postings: Dict[str, Set[int]] = {}
+        self._facets: Dict[str, Set[int]] = {}
+        self._orders: Dict[Tuple[str, bool], List[int]] = {}  # (field, descending) -> sorted ids
+        if programs:
+            self.build(programs)
+    
+    def build(self, programs: List[ProgramInfo]):
+        self.programs = list(programs)
+        self._names = [prog.name.lower() for prog in self.programs]
+        # Fields are joined with a separator no query contains, so no bigram spans two fields
+        self._texts = [f"{name}\n{prog.publisher.lower()}\n{prog.install_location.lower()}"
+                       for name, prog in zip(self._names, self.programs)]
+        postings: Dict[str, Set[int]] = {}
+        facets: Dict[str, Set[int]] = {}
+        for program_id, text in enumerate(self._texts):
+            for gram in self._bigrams(text):
+                postings.setdefault(gram, set()).add(program_id)
+            facets.setdefault(self.programs[program_id].publisher, set()).add(program_id)
+        self._postings = postings
+        self._facets = facets
+        self._orders = {}
+    
+    @staticmethod
+    def _bigrams(text: str) -> Set[str]:
+        return {field[i:i + 2] for field in text.split("\n") for i in range(len(field) - 1)}
+    
+    @staticmethod
+    def _sort_key(field: str) -> Callable[[ProgramInfo], Any]:
+        """Typed sort key for a ProgramInfo field; None marks a missing value"""
+        if field == "size_kb":
+            return lambda prog: prog.size_kb or None
+        if field == "install_date":
+            return lambda prog: prog.install_day
+        if field == "version":
+            # "10.2.1" after "9.8": compare the numeric parts
+            return lambda prog: tuple(int(part) for part in re.findall(r"\d+", prog.version)) or None
+        return lambda prog: getattr(prog, field).lower() or None
+    
+    def order(self, field: str, descending: bool = False) -> List[int]:
+        """Return all program ids sorted by a field; programs without a value come last.
+        
+        Both directions are computed and cached together on first use, so
+        re-sorting until the next build is a dictionary lookup.
+        """
+        cached = self._orders.get((field, descending))
+        if cached is not None:
+            return cached
+        
+        key = self._sort_key(field)
+        keyed = [(key(prog), program_id) for program_id, prog in enumerate(self.programs)]
+        present = [program_id for value, program_id in sorted(entry for entry in keyed if entry[0] is not None)]
+        missing = [program_id for value, program_id in keyed if value is None]
+        self._orders[(field, False)] = present + missing
+        self._orders[(field, True)] = present[::-1] + missing
+        return self._orders[(field, descending)]
+    
+    def publisher_counts(self) -> List[Tuple[str, int]]:
+        """Return (publisher, program count), most common first; unnamed publishers are left out"""
+        counts = [(publisher, len(ids)) for publisher, ids in self._facets.items() if publisher]
+        return sorted(counts, key=lambda c: (-c[1], c[0].lower()))
+    
+    def search(self, query: str, publisher: Optional[str] = None) -> List[int]:
+        """Return the ids (indices into programs) matching query, best match first"""
+        query = query.lower().strip()
+        allowed = self._facets.get(publisher, set()) if publisher is not None else None
+        
+        if not query:
+            return sorted(allowed) if allowed is not None else list(range(len(self.programs)))
+        
+        if len(query) < 2:
+            pool = allowed if allowed is not None else range(len(self._texts))
+            matches = [program_id for program_id in pool if query in self._texts[program_id]]
+        else:
+            postings = [self._postings.get(gram) for gram in self._bigrams(query)]
+            if not all(postings):
+                return self._fuzzy_search(query, allowed)
+            postings.sort(key=len)
+            candidates = postings[0].intersection(*postings[1:])
+            if allowed is not None:
+                candidates &= allowed
+            matches = [program_id for program_id in candidates if query in self._texts[program_id]]
+            if not matches:
+                return self._fuzzy_search(query, allowed)
+        
+        return sorted(matches, key=lambda program_id: (self._rank(query, program_id), program_id))
+    
+    def _rank(self, query: str, program_id: int) -> int:
+        name = self._names[program_id]
+        if name == query:
+            return 0
+        if name.startswith(query):
+            return 1
+        if f" {query}" in name:
+            return 2
+        return 3 if query in name else 4
+    
+    def _fuzzy_search(self, query: str, allowed: Optional[Set[int]]) -> List[int]:
+        """Rank programs by the share of the query's bigrams they contain"""
+        grams = self._bigrams(query)
+        if len(grams) < 2:
+            return []
+        shared = Counter()
+        for gram in grams:
+            shared.update(self._postings.get(gram, ()))
+        needed = max(2, self.FUZZY_MIN_SHARE * len(grams))
+        scored = [(count, program_id) for program_id, count in shared.items()
+                  if count >= needed and (allowed is None or program_id in allowed)]
+        # More shared bigrams first; among equals, prefer bigrams found in the name
+        best = heapq.nsmallest(self.FUZZY_LIMIT, scored, key=lambda e: (
+            -e[0], -sum(gram in self._names[e[1]] for gram in grams), e[1]
+        ))
+        return [program_id for _, program_id in best]
 
 # === Enhanced Registry Helper ===
 class EnhancedRegistryHelper:
     @staticmethod
-    def get_installed_programs_async(progress_callback: Optional[Callable] = None) -> List[ProgramInfo]:
-        programs = []
+    def get_installed_programs_async(progress_callback: Optional[Callable] = None,
+                                     snapshot: Optional[ProgramSnapshot] = None) -> List[ProgramInfo]:
+        """Read installed programs, re-reading only subkeys changed since the snapshot"""
+        registry = get_registry_provider()
         keys = [
-            (winreg.HKEY_LOCAL_MACHINE, r"SOFTWARE\Microsoft\Windows\CurrentVersion\Uninstall"),
-            (winreg.HKEY_LOCAL_MACHINE, r"SOFTWARE\WOW6432Node\Microsoft\Windows\CurrentVersion\Uninstall"),
-            (winreg.HKEY_CURRENT_USER, r"SOFTWARE\Microsoft\Windows\CurrentVersion\Uninstall")
+            (HKEY_LOCAL_MACHINE, r"SOFTWARE\Microsoft\Windows\CurrentVersion\Uninstall"),
+            (HKEY_LOCAL_MACHINE, r"SOFTWARE\WOW6432Node\Microsoft\Windows\CurrentVersion\Uninstall"),
+            (HKEY_CURRENT_USER, r"SOFTWARE\Microsoft\Windows\CurrentVersion\Uninstall")
         ]
-        
         total_keys = len(keys)
-        for idx, (hive, path) in enumerate(keys):
-            if progress_callback:
-                progress_callback(idx, total_keys, f"Scanning registry", path)
-                
-            try:
-                reg_key = winreg.OpenKey(hive, path)
-                num_subkeys = winreg.QueryInfoKey(reg_key)[0]
+        changed_roots = []  # Roots whose snapshot data differs from the saved one
+        
+        def read_root(idx, hive, path) -> Dict[str, Any]:
+            def report_entries(i, num_subkeys):
+                if progress_callback:
+                    progress_callback(idx, total_keys, f"Processing entries", f"{i}/{num_subkeys}")
+            
+            root = f"{HIVE_NAMES[hive]}\\{path}"
+            cached_root = snapshot.get_root(root) if snapshot else {}
+            root_data = EnhancedRegistryHelper._read_uninstall_root(
+                registry, hive, path, cached_root, report_entries
+            )
+            if snapshot and root_data != cached_root:
+                snapshot.set_root(root, root_data)
+                changed_roots.append(root)
+            return root_data
+        
+        # Each Uninstall root is read by its own worker with its own key handles
+        with ThreadPoolExecutor(max_workers=total_keys, thread_name_prefix="UninstallScan") as pool:
+            futures = {pool.submit(read_root, idx, hive, path): path for idx, (hive, path) in enumerate(keys)}
+            for done, future in enumerate(as_completed(futures), 1):
+                if progress_callback:
+                    progress_callback(done, total_keys, f"Scanning registry", futures[future])
+            
+            programs = []
+            for future in futures:
+                programs.extend(ProgramInfo(**entry["program"]) 
+                                for entry in future.result()["subkeys"].values() if entry["program"])
+        
+        # Periodic refreshes mostly find nothing new; only rewrite the file on a change
+        if changed_roots:
+            snapshot.save()
                 
+        return sorted(programs, key=lambda x: x.name.lower())
+
+    @staticmethod
+    def _read_uninstall_root(registry: RegistryProvider, hive: int, path: str,
+                             cached_root: Dict[str, Any], progress_callback: Callable) -> Dict[str, Any]:
+        """Read one Uninstall key into snapshot form, reusing unchanged cached subkeys"""
+        root = f"{HIVE_NAMES[hive]}\\{path}"
+        cached_subkeys = cached_root.get("subkeys", {})
+        subkeys = {}
+        
+        try:
+            reg_key = registry.open_key(hive, path)
+        except (FileNotFoundError, PermissionError):
+            return {"last_write": 0, "subkeys": {}}
+        
+        try:
+            num_subkeys, _, root_write = registry.query_info_key(reg_key)
+            
+            # Adding or removing a subkey bumps the parent's last-write time, so an
+            # unchanged root means the cached subkey names are still complete
+            if cached_root.get("last_write") == root_write and len(cached_subkeys) == num_subkeys:
+                subkey_names = list(cached_subkeys)
+            else:
+                subkey_names = []
                 for i in range(num_subkeys):
-                    if progress_callback and i % 5 == 0:
-                        progress_callback(idx, total_keys, f"Processing entries", f"{i}/{num_subkeys}")
-                    
                     try:
-                        subkey_name = winreg.EnumKey(reg_key, i)
-                        subkey = winreg.OpenKey(reg_key, subkey_name)
-                        
-                        # Get program information
-                        program_info = EnhancedRegistryHelper._extract_program_info(subkey)
-                        if program_info:
-                            programs.append(program_info)
-                            
-                        winreg.CloseKey(subkey)
-                    except (OSError, PermissionError):
-                        continue
-                        
-                winreg.CloseKey(reg_key)
-            except (FileNotFoundError, PermissionError):
-                continue
+                        subkey_names.append(registry.enum_key(reg_key, i))
+                    except OSError:
+                        break
+            
+            for i, subkey_name in enumerate(subkey_names):
+                if i % 5 == 0:
+                    progress_callback(i, len(subkey_names))
                 
-        return sorted(programs, key=lambda x: x.name.lower())
+                try:
+                    subkey = registry.open_key(reg_key, subkey_name)
+                    try:
+                        last_write = registry.query_info_key(subkey)[2]
+                        entry = cached_subkeys.get(subkey_name)
+                        
+                        if not entry or entry["last_write"] != last_write:
+                            program_info = EnhancedRegistryHelper._extract_program_info(registry, subkey)
+                            if program_info:
+                                program_info.registry_key = f"{root}\\{subkey_name}"
+                            entry = {"last_write": last_write,
+                                     "program": asdict(program_info) if program_info else None}
+                        subkeys[subkey_name] = entry
+                    finally:
+                        registry.close_key(subkey)
+                except (OSError, PermissionError):
+                    continue
+        finally:
+            registry.close_key(reg_key)
+        
+        return {"last_write": root_write, "subkeys": subkeys}
 
     @staticmethod
-    def _extract_program_info(subkey) -> Optional[ProgramInfo]:
+    def _extract_program_info(registry: RegistryProvider, subkey) -> Optional[ProgramInfo]:
         """Extract detailed program information from registry"""
         try:
-            display_name = winreg.QueryValueEx(subkey, "DisplayName")[0]
+            display_name = registry.query_value(subkey, "DisplayName")[0]
             if not display_name:
                 return None
                 
@@ -1695,195 +3209,830 @@ class EnhancedRegistryHelper:
             publisher = ""
             version = ""
             size = ""
+            size_kb = 0
             install_date = ""
             
             try:
-                uninstall_str = winreg.QueryValueEx(subkey, "UninstallString")[0]
+                uninstall_str = registry.query_value(subkey, "UninstallString")[0]
             except FileNotFoundError:
                 pass
                 
             try:
-                install_location = winreg.QueryValueEx(subkey, "InstallLocation")[0]
+                install_location = registry.query_value(subkey, "InstallLocation")[0]
             except FileNotFoundError:
                 pass
                 
             try:
-                publisher = winreg.QueryValueEx(subkey, "Publisher")[0]
+                publisher = registry.query_value(subkey, "Publisher")[0]
             except FileNotFoundError:
                 pass
                 
             try:
-                version = winreg.QueryValueEx(subkey, "DisplayVersion")[0]
+                version = registry.query_value(subkey, "DisplayVersion")[0]
             except FileNotFoundError:
                 pass
                 
             try:
-                size_kb = int(winreg.QueryValueEx(subkey, "EstimatedSize")[0])
+                size_kb = int(registry.query_value(subkey, "EstimatedSize")[0])
                 size = f"{size_kb / 1024:.1f} MB"
             except (FileNotFoundError, ValueError):
                 pass
                 
             try:
-                install_date = winreg.QueryValueEx(subkey, "InstallDate")[0]
+                install_date = registry.query_value(subkey, "InstallDate")[0]
                 if len(install_date) == 8:  # Format: YYYYMMDD
                     install_date = f"{install_date[:4]}-{install_date[4:6]}-{install_date[6:8]}"
             except FileNotFoundError:
                 pass
             
             return ProgramInfo(display_name, uninstall_str, install_location, 
-                             publisher, version, size, install_date)
+                             publisher, version, size, install_date, size_kb=size_kb)
                              
         except FileNotFoundError:
             return None
 
     @staticmethod
-    def get_startup_programs_async(progress_callback: Optional[Callable] = None) -> List[StartupItem]:
-        items = []
-        paths = [
-            (winreg.HKEY_CURRENT_USER, r"Software\Microsoft\Windows\CurrentVersion\Run"),
-            (winreg.HKEY_LOCAL_MACHINE, r"Software\Microsoft\Windows\CurrentVersion\Run")
-        ]
-        
-        for idx, (hive, path) in enumerate(paths):
-            if progress_callback:
-                progress_callback(idx, len(paths), "Scanning startup entries", path)
-                
-            try:
-                reg_key = winreg.OpenKey(hive, path)
-                i = 0
-                while True:
-                    try:
-                        name, val, _ = winreg.EnumValue(reg_key, i)
-                        items.append(StartupItem(name, val, hive, path))
-                        i += 1
-                    except OSError:
-                        break
-                winreg.CloseKey(reg_key)
-            except FileNotFoundError:
-                continue
-                
-        return items
+    def get_startup_programs_async(progress_callback: Optional[Callable] = None) -> List[StartupItem]:
+        registry = get_registry_provider()
+        items = []
+        paths = [
+            (HKEY_CURRENT_USER, r"Software\Microsoft\Windows\CurrentVersion\Run"),
+            (HKEY_LOCAL_MACHINE, r"Software\Microsoft\Windows\CurrentVersion\Run")
+        ]
+        
+        for idx, (hive, path) in enumerate(paths):
+            if progress_callback:
+                progress_callback(idx, len(paths), "Scanning startup entries", path)
+                
+            try:
+                reg_key = registry.open_key(hive, path)
+                i = 0
+                while True:
+                    try:
+                        name, val, _ = registry.enum_value(reg_key, i)
+                        items.append(StartupItem(name, val, hive, path))
+                        i += 1
+                    except OSError:
+                        break
+                registry.close_key(reg_key)
+            except FileNotFoundError:
+                continue
+                
+        return items
+
+    @staticmethod
+    def remove_startup_entry(item: StartupItem) -> bool:
+        registry = get_registry_provider()
+        try:
+            reg_key = registry.open_key(item.hive, item.registry_path, KEY_SET_VALUE)
+            registry.delete_value(reg_key, item.name)
+            registry.close_key(reg_key)
+            return True
+        except Exception:
+            return False
+
+# === Compact Result Store ===
+class ScanResultStore:
+    """Columnar store for large file result sets.
+    
+    Parent directories are interned once; file names live UTF-8 encoded in one
+    bytearray addressed by offsets; sizes, mtimes and category codes are typed
+    arrays. A row costs a few dozen bytes instead of a Path plus a record object.
+    Rows are materialized as JunkRecord on access; per-category sizes and counts
+    are kept as rows are appended so the stat cards never walk the rows.
+    """
+    
+    def __init__(self):
+        self.directories: List[str] = []
+        self._directory_ids: Dict[str, int] = {}
+        self.categories: List[str] = []
+        self._category_ids: Dict[str, int] = {}
+        
+        self._names = bytearray()
+        self._name_offsets = array("Q", [0])  # Row i's name is _names[offsets[i]:offsets[i + 1]]
+        self.directory_ids = array("I")
+        self.sizes = array("q")
+        self.mtimes = array("d")
+        self.category_codes = array("B")
+        self.is_dirs = array("B")
+        self.file_counts = array("I")  # 1 for a file, the files inside for a directory row
+        self._file_count = 0
+        self._category_sizes = array("q")
+        self._category_counts = array("Q")
+    
+    def intern_directory(self, directory: str) -> int:
+        directory_id = self._directory_ids.get(directory)
+        if directory_id is None:
+            directory_id = self._directory_ids[directory] = len(self.directories)
+            self.directories.append(directory)
+        return directory_id
+    
+    def category_code(self, category: str) -> Optional[int]:
+        """Return the code rows of a category carry, or None if no row has it"""
+        return self._category_ids.get(category)
+    
+    def intern_category(self, category: str) -> int:
+        code = self._category_ids.get(category)
+        if code is None:
+            code = self._category_ids[category] = len(self.categories)
+            self.categories.append(category)
+            self._category_sizes.append(0)
+            self._category_counts.append(0)
+        return code
+    
+    def append(self, directory_id: int, name: str, size: int, mtime: float, category_code: int,
+               is_dir: bool = False, file_count: int = 1) -> int:
+        """Add a row for an interned directory and category; returns its index"""
+        self._names += name.encode("utf-8", "surrogatepass")
+        self._name_offsets.append(len(self._names))
+        self.directory_ids.append(directory_id)
+        self.sizes.append(size)
+        self.mtimes.append(mtime)
+        self.category_codes.append(category_code)
+        self.is_dirs.append(is_dir)
+        self.file_counts.append(file_count)
+        self._file_count += file_count
+        self._category_sizes[category_code] += size
+        self._category_counts[category_code] += 1
+        return len(self.sizes) - 1
+    
+    def append_record(self, record: JunkRecord) -> int:
+        return self.append(self.intern_directory(str(record.path.parent)), record.path.name,
+                           record.size, record.mtime, self.intern_category(record.category), record.is_dir)
+    
+    def name(self, index: int) -> str:
+        start, end = self._name_offsets[index], self._name_offsets[index + 1]
+        return self._names[start:end].decode("utf-8", "surrogatepass")
+    
+    def path(self, index: int) -> str:
+        return os.path.join(self.directories[self.directory_ids[index]], self.name(index))
+    
+    def __len__(self) -> int:
+        return len(self.sizes)
+    
+    def __getitem__(self, index: int) -> JunkRecord:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        return JunkRecord(Path(self.path(index)), self.sizes[index], self.mtimes[index],
+                          self.categories[self.category_codes[index]], bool(self.is_dirs[index]))
+    
+    def __iter__(self) -> Iterator[JunkRecord]:
+        for index in range(len(self)):
+            yield self[index]
+    
+    # Aggregates read the per-category columns without materializing rows
+    def total_size(self) -> int:
+        return sum(self._category_sizes)
+    
+    def total_files(self) -> int:
+        """Files covered by all rows, counting every file inside directory rows"""
+        return self._file_count
+    
+    def category_totals(self) -> Dict[str, int]:
+        """Return total size per category"""
+        return dict(zip(self.categories, self._category_sizes))
+    
+    def category_counts(self) -> Dict[str, int]:
+        return dict(zip(self.categories, self._category_counts))
+    
+    def subset(self, rows: Iterable[int]) -> "ScanResultStore":
+        """Copy the given rows into a new store, e.g. to clean only part of a scan"""
+        subset = ScanResultStore()
+        for index in rows:
+            subset.append(subset.intern_directory(self.directories[self.directory_ids[index]]),
+                          self.name(index), self.sizes[index], self.mtimes[index],
+                          subset.intern_category(self.categories[self.category_codes[index]]),
+                          bool(self.is_dirs[index]), self.file_counts[index])
+        return subset
+
+@dataclass
+class JunkScanResult:
+    """Junk scan rows with totals, largest-file heaps and an age histogram kept as rows are added.
+    
+    Queries read these running aggregates or make one pass over the columns;
+    none of them sorts the full result.
+    """
+    AGE_BUCKETS = (1, 7, 30, 90, 365)  # Histogram edges in days
+    
+    store: ScanResultStore = field(default_factory=ScanResultStore)
+    top_n: int = 100
+    scan_time: float = field(default_factory=time.time)
+    _largest: List[Tuple[int, int]] = field(default_factory=list, repr=False)  # Min-heap of (size, file row)
+    _largest_by_category: Dict[int, List[Tuple[int, int]]] = field(default_factory=dict, repr=False)
+    _age_counts: List[int] = field(default_factory=lambda: [0] * (len(JunkScanResult.AGE_BUCKETS) + 1), repr=False)
+    _age_sizes: List[int] = field(default_factory=lambda: [0] * (len(JunkScanResult.AGE_BUCKETS) + 1), repr=False)
+    
+    def add(self, directory_id: int, name: str, size: int, mtime: float, category_code: int,
+            is_dir: bool = False, file_count: int = 1):
+        index = self.store.append(directory_id, name, size, mtime, category_code, is_dir, file_count)
+        
+        # Collapsed directory rows are left out of the largest-file heaps
+        if not is_dir:
+            self._push_largest(self._largest, size, index)
+            self._push_largest(self._largest_by_category.setdefault(category_code, []), size, index)
+        
+        # Directory rows carry their newest mtime, so they age as their youngest file
+        bucket = bisect.bisect_right(self.AGE_BUCKETS, (self.scan_time - mtime) / 86400)
+        self._age_counts[bucket] += file_count
+        self._age_sizes[bucket] += size
+    
+    def _push_largest(self, heap: List[Tuple[int, int]], size: int, index: int):
+        if len(heap) < self.top_n:
+            heapq.heappush(heap, (size, index))
+        elif size > heap[0][0]:
+            heapq.heapreplace(heap, (size, index))
+    
+    @property
+    def total_size(self) -> int:
+        return self.store.total_size()
+    
+    @property
+    def category_sizes(self) -> Dict[str, int]:
+        return self.store.category_totals()
+    
+    def top_k(self, n: int, category: Optional[str] = None) -> List[JunkRecord]:
+        """Return the n largest files, biggest first, optionally within one category"""
+        code = self.store.category_code(category) if category is not None else None
+        if category is not None and code is None:
+            return []
+        
+        if n <= self.top_n:
+            heap = self._largest if code is None else self._largest_by_category.get(code, [])
+            entries = heapq.nlargest(n, heap, key=lambda e: (e[0], -e[1]))
+            return [self.store[index] for _, index in entries]
+        
+        # Beyond the kept heaps: one bounded pass over the size column
+        sizes = self.store.sizes
+        is_dirs = self.store.is_dirs
+        codes = self.store.category_codes
+        rows = (i for i in range(len(self.store)) if not is_dirs[i] and (code is None or codes[i] == code))
+        return [self.store[index] for index in heapq.nlargest(n, rows, key=lambda i: (sizes[i], -i))]
+    
+    def older_than(self, days: float, category: Optional[str] = None) -> ScanResultStore:
+        """Return the rows not modified for the given number of days, ready to clean"""
+        cutoff = self.scan_time - days * 86400
+        code = self.store.category_code(category) if category is not None else None
+        if category is not None and code is None:
+            return ScanResultStore()
+        
+        codes = self.store.category_codes
+        return self.store.subset(
+            index for index, mtime in enumerate(self.store.mtimes)
+            if mtime <= cutoff and (code is None or codes[index] == code)
+        )
+    
+    def by_category(self) -> Dict[str, Tuple[int, int]]:
+        """Return (rows, bytes) per category, largest category first"""
+        counts = self.store.category_counts()
+        sizes = self.store.category_totals()
+        return {category: (counts[category], sizes[category]) 
+                for category in sorted(sizes, key=lambda category: -sizes[category])}
+    
+    def age_histogram(self) -> List[Tuple[str, int, int]]:
+        """Return (label, files, bytes) for each age bucket, newest first"""
+        edges = self.AGE_BUCKETS
+        labels = [f"< {edges[0]} day"] + [f"{low}-{high} days" for low, high in zip(edges, edges[1:])] + \
+                 [f"> {edges[-1]} days"]
+        return list(zip(labels, self._age_counts, self._age_sizes))
+
+# === Deletion Engine ===
+@dataclass
+class DeletionResult:
+    deleted: int = 0  # Files, counting those inside removed directory targets
+    freed: int = 0
+    failed: int = 0
+    failed_paths: List[str] = field(default_factory=list)  # First few failures, for logging
+    cancelled: bool = False
+    kept: List[int] = field(default_factory=list)  # Targets left in place (failed or cancelled), by input position
+
+# (name, size, is_dir, file count, input position, scanned mtime) under a parent directory
+DeletionTarget = Tuple[str, int, bool, int, int, Optional[float]]
+
+class _UnscannedFiles:
+    """remove_tree keep-callback for a junk directory row.
+    
+    Keeps files modified after the newest file the scan recorded for the row
+    (so created or rewritten since) and files the junk rules never delete.
+    """
+    __slots__ = ("scanned_mtime", "found")
+    
+    def __init__(self, scanned_mtime: float):
+        self.scanned_mtime = scanned_mtime
+        self.found = False  # Whether any file was kept
+    
+    def __call__(self, entry: os.DirEntry) -> bool:
+        try:
+            changed = entry.stat(follow_symlinks=False).st_mtime > self.scanned_mtime
+        except OSError:
+            changed = True
+        if changed or not AsyncJunkCleaner._is_safe_to_delete(entry.name.lower()):
+            self.found = True
+            return True
+        return False
+
+class DeletionEngine:
+    """Deletes targets grouped by directory on a bounded worker pool.
+    
+    Targets are DeletionTarget tuples under their parent directory. Sizes are
+    the ones captured at scan time; only directory targets are listed again. A
+    target that is already gone counts as deleted. Large directories are split
+    into chunks so a single huge folder still spreads over the workers.
+    
+    A directory target with a scanned mtime (a collapsed junk row) only loses
+    the files the scan saw; see _UnscannedFiles.
+    """
+    CHUNK_SIZE = 2000
+    MAX_FAILED_PATHS = 100
+    
+    def __init__(self, max_workers: Optional[int] = None):
+        self.max_workers = max_workers or min(16, (os.cpu_count() or 4) * 2)
+    
+    def delete_store(self, store: ScanResultStore, progress_callback: Optional[Callable] = None,
+                     cancel_token: Optional[CancellationToken] = None) -> DeletionResult:
+        """Delete every row of a ScanResultStore; directory rows are removed as a whole"""
+        groups: Dict[str, List[DeletionTarget]] = {}
+        for index in range(len(store)):
+            directory = store.directories[store.directory_ids[index]]
+            is_dir = bool(store.is_dirs[index])
+            # A directory row's mtime is the newest among the files the scan found in it
+            groups.setdefault(directory, []).append((store.name(index), store.sizes[index], is_dir,
+                                                     store.file_counts[index], index,
+                                                     store.mtimes[index] if is_dir else None))
+        return self.delete_groups(groups, progress_callback, cancel_token)
+    
+    def delete_paths(self, targets: Iterable[Tuple[Path, int, bool]], progress_callback: Optional[Callable] = None,
+                     cancel_token: Optional[CancellationToken] = None) -> DeletionResult:
+        """Delete (path, size, is_dir) targets.
+        
+        Targets inside another directory target (or listed twice) are dropped, since
+        removing the outer directory removes them too and counting them again would
+        inflate the deleted and freed totals.
+        """
+        targets = list(targets)
+        # Comparing split keys puts every directory directly before its descendants
+        keys = [os.path.normcase(os.path.abspath(str(path))).split(os.sep) for path, _, _ in targets]
+        groups: Dict[str, List[DeletionTarget]] = {}
+        covering: Optional[List[str]] = None
+        previous: Optional[List[str]] = None
+        for index in sorted(range(len(targets)), key=keys.__getitem__):
+            key = keys[index]
+            if key == previous or (covering and key[:len(covering)] == covering):
+                continue
+            previous = key
+            path, size, is_dir = targets[index]
+            if is_dir:
+                covering = key
+            directory, name = os.path.split(str(path))
+            groups.setdefault(directory, []).append((name, size, is_dir, 1, index, None))
+        return self.delete_groups(groups, progress_callback, cancel_token)
+    
+    def delete_groups(self, groups: Dict[str, List[DeletionTarget]], 
+                      progress_callback: Optional[Callable] = None,
+                      cancel_token: Optional[CancellationToken] = None) -> DeletionResult:
+        """Delete grouped targets in parallel and return the combined result"""
+        result = DeletionResult()
+        total = sum(len(targets) for targets in groups.values())
+        if not total:
+            return result
+        
+        lock = threading.Lock()
+        done = [0]
+        report_every = max(1, total // 200)
+        
+        def delete_chunk(directory: str, chunk: List[DeletionTarget]):
+            deleted = freed = failed = 0
+            failed_paths = []
+            kept = []
+            for position, (name, size, is_dir, file_count, index, scanned_mtime) in enumerate(chunk):
+                if cancel_token and cancel_token.cancelled:
+                    kept.extend(target[4] for target in chunk[position:])
+                    break
+                path = os.path.join(directory, name)
+                try:
+                    if is_dir:
+                        keep = None if scanned_mtime is None else _UnscannedFiles(scanned_mtime)
+                        if not remove_tree(Path(path), cancel_token, keep):
+                            kept.extend(target[4] for target in chunk[position:])
+                            break  # Cancelled part-way through the tree
+                        if os.path.exists(path) and not (keep and keep.found):
+                            raise OSError(f"Could not remove every entry under {path}")
+                    else:
+                        os.unlink(path)
+                except FileNotFoundError:
+                    pass  # Already gone, which is what we wanted
+                except (PermissionError, OSError):
+                    failed += 1
+                    failed_paths.append(path)
+                    kept.append(index)
+                    continue
+                deleted += file_count
+                freed += size
+            
+            with lock:
+                result.deleted += deleted
+                result.freed += freed
+                result.failed += failed
+                room = self.MAX_FAILED_PATHS - len(result.failed_paths)
+                result.failed_paths.extend(failed_paths[:max(0, room)])
+                result.kept.extend(kept)
+                before = done[0]
+                done[0] += len(chunk)
+                current = done[0]
+            
+            if progress_callback and (current // report_every != before // report_every or current == total):
+                progress_callback(current, total, "Deleting files", directory)
+        
+        chunks = [
+            (directory, targets[start:start + self.CHUNK_SIZE])
+            for directory, targets in groups.items()
+            for start in range(0, len(targets), self.CHUNK_SIZE)
+        ]
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(chunks)), 
+                                thread_name_prefix="Delete") as pool:
+            for future in [pool.submit(delete_chunk, directory, chunk) for directory, chunk in chunks]:
+                future.result()
+        
+        result.cancelled = bool(cancel_token and cancel_token.cancelled)
+        result.kept.sort()
+        return result
+
+# === Junk Rules ===
+class JunkRootRules:
+    """The junk rules sharing one root, compiled into a single name matcher"""
+    
+    def __init__(self, root: str):
+        self.root = root
+        self.key = os.path.normcase(os.path.abspath(root))
+        self.rules: List[JunkRule] = []
+        self.collapse_rule: Optional[JunkRule] = None
+        self._matcher: Optional[re.Pattern] = None
+        self._rule_matchers: List[re.Pattern] = []
+    
+    def compile(self):
+        """Build one regex with a named group per rule; names are matched lower-case"""
+        # Windows file names are case-insensitive
+        self._rule_matchers = [
+            re.compile("|".join(fnmatch.translate(pattern.lower()) for pattern in rule.patterns))
+            for rule in self.rules
+        ]
+        self._matcher = re.compile("|".join(
+            f"(?P<r{i}>{matcher.pattern})" for i, matcher in enumerate(self._rule_matchers)
+        ))
+        # A rule matching every name lets fully eligible subtrees be recorded whole
+        self.collapse_rule = next((rule for rule in self.rules if "*" in rule.patterns), None)
+    
+    def match(self, lower_name: str, size: int, mtime: float, now: float) -> Optional[JunkRule]:
+        """Return the first rule whose pattern and thresholds accept the file"""
+        match = self._matcher.match(lower_name)
+        if not match:
+            return None
+        first = int(match.lastgroup[1:])
+        if self.rules[first].accepts(size, mtime, now):
+            return self.rules[first]
+        # Thresholds rejected the first hit; later rules may still take the file
+        for rule, matcher in zip(self.rules[first + 1:], self._rule_matchers[first + 1:]):
+            if matcher.match(lower_name) and rule.accepts(size, mtime, now):
+                return rule
+        return None
+
+@dataclass(slots=True)
+class _JunkTreeFrame:
+    """A directory on AsyncJunkCleaner._collect_junk_tree's stack with its running totals"""
+    path: str
+    name: str
+    files: List[Tuple[str, int, float]]
+    subdirs: Iterator[str]
+    eligible: bool
+    size: int = 0
+    newest: float = 0.0
+    file_count: int = 0
+    rows: List[Tuple[str, str, int, float, str, bool, int]] = field(default_factory=list)
+
+# === Enhanced Async Junk Cleaner ===
+class AsyncJunkCleaner:
+    DEFAULT_RULES = [
+        JunkRule("Temporary Files", "%TEMP%"),
+        JunkRule("Temporary Files", "%SystemRoot%\\Temp"),
+        JunkRule("Temporary Files", "%LOCALAPPDATA%\\Temp"),
+        JunkRule("Browser Cache", "%LOCALAPPDATA%\\Google\\Chrome\\User Data\\Default\\Cache"),
+        JunkRule("Browser Cache", "%LOCALAPPDATA%\\Mozilla\\Firefox\\Profiles", ["*.default*", "cache2"]),
+        JunkRule("Browser Cache", "%LOCALAPPDATA%\\Microsoft\\Edge\\User Data\\Default\\Cache"),
+        JunkRule("Windows Cache", "%SystemRoot%\\SoftwareDistribution\\Download"),
+        JunkRule("Windows Cache", "%LOCALAPPDATA%\\Microsoft\\Windows\\Explorer", ["thumbcache*.db"]),
+        JunkRule("Windows Cache", "%SystemRoot%\\Prefetch", ["*.pf"]),
+        JunkRule("System Logs", "%SystemRoot%\\Logs", ["*.log", "*.etl"]),
+        JunkRule("System Logs", "%LOCALAPPDATA%\\CrashDumps", ["*.dmp"]),
+        JunkRule("Recycle Bin", "%SystemDrive%\\$Recycle.Bin"),
+    ]
+
+    @staticmethod
+    def load_rules(rules_path: Optional[Path] = None, logger=None,
+                   problems: Optional[List[str]] = None) -> List[JunkRule]:
+        """Load junk rules from ~/.pyuninstallx/junk_rules.json, writing the defaults on first use.
+        
+        Rules that fail validation are left out; they are never compiled. Each
+        problem is logged to logger and appended to problems, when given.
+        """
+        rules_path = rules_path or Path.home() / ".pyuninstallx" / "junk_rules.json"
+        
+        def warn(message: str):
+            if logger:
+                logger.log(message, LogLevel.WARNING)
+            if problems is not None:
+                problems.append(message)
+        
+        try:
+            with open(rules_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            entries = data["rules"] if isinstance(data, dict) else None
+            if not isinstance(entries, list):
+                raise ValueError('expected {"rules": [...]}')
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError, KeyError) as e:
+            # Unreadable file: keep it for the admin to fix
+            warn(f"Ignoring junk rules file {rules_path} ({e}); using the default rules")
+            return list(AsyncJunkCleaner.DEFAULT_RULES)
+        else:
+            rules = []
+            for position, entry in enumerate(entries, 1):
+                entry_problems = AsyncJunkCleaner.rule_problems(entry)
+                if entry_problems:
+                    warn(f"Skipping junk rule {position} in {rules_path}: {'; '.join(entry_problems)}")
+                else:
+                    rules.append(JunkRule(**entry))
+            return rules
+        
+        try:
+            rules_path.parent.mkdir(exist_ok=True)
+            with open(rules_path, "w", encoding="utf-8") as f:
+                json.dump({"version": 1, "rules": [asdict(rule) for rule in AsyncJunkCleaner.DEFAULT_RULES]}, 
+                          f, indent=2)
+        except OSError:
+            pass
+        return list(AsyncJunkCleaner.DEFAULT_RULES)
+
+    @staticmethod
+    def rule_problems(entry: Any) -> List[str]:
+        """Describe what is wrong with a junk_rules.json entry; an empty list means it is valid"""
+        if not isinstance(entry, dict):
+            return ["not an object"]
+        problems = []
+        unknown = set(entry) - set(JunkRule.__dataclass_fields__)
+        if unknown:
+            problems.append(f"unknown keys {', '.join(sorted(map(str, unknown)))}")
+        for key in ("category", "path"):
+            if not isinstance(entry.get(key), str) or not entry[key].strip():
+                problems.append(f"'{key}' must be a non-empty string")
+        if "patterns" in entry:
+            patterns = entry["patterns"]
+            # An empty pattern list would compile to a group matching every name
+            if not isinstance(patterns, list) or not patterns:
+                problems.append("'patterns' must be a non-empty list")
+            elif not all(isinstance(pattern, str) and pattern for pattern in patterns):
+                problems.append("'patterns' may only hold non-empty strings")
+        for key, types in (("min_age_days", (int, float)), ("min_size_kb", (int,))):
+            value = entry.get(key, 0)
+            if isinstance(value, bool) or not isinstance(value, types) or value < 0:
+                problems.append(f"'{key}' must be a number of at least 0")
+        if not isinstance(entry.get("enabled", True), bool):
+            problems.append("'enabled' must be true or false")
+        return problems
+
+    @staticmethod
+    def group_rules(rules: List[JunkRule]) -> List["JunkRootRules"]:
+        """Expand rule paths and group the rules by root, skipping unresolved variables"""
+        roots: Dict[str, JunkRootRules] = {}
+        for rule in rules:
+            if not rule.enabled or not rule.patterns:
+                continue  # An empty pattern list would match every name
+            root = os.path.expandvars(rule.path)
+            if re.search(r"%[^%\\]+%", root) or not root.strip():
+                continue  # Variable not set on this machine
+            root_rules = JunkRootRules(root)
+            roots.setdefault(root_rules.key, root_rules).rules.append(rule)
+        
+        for root_rules in roots.values():
+            root_rules.compile()
+        return list(roots.values())
+
+    @staticmethod
+    def iter_junk_files(progress_callback: Optional[Callable] = None,
+                        cancel_token: Optional[CancellationToken] = None,
+                        index: Optional[JunkIndex] = None,
+                        rules: Optional[List[JunkRule]] = None) -> Iterator[JunkRecord]:
+        """Yield junk files as they are found, with size and mtime taken from the scandir entry"""
+        for dir_path, name, size, mtime, category, is_dir, _ in AsyncJunkCleaner._iter_junk_entries(
+                progress_callback, cancel_token, index, rules):
+            yield JunkRecord(Path(dir_path, name), size, mtime, category, is_dir)
 
     @staticmethod
-    def remove_startup_entry(item: StartupItem) -> bool:
-        try:
-            reg_key = winreg.OpenKey(item.hive, item.registry_path, 0, winreg.KEY_SET_VALUE)
-            winreg.DeleteValue(reg_key, item.name)
-            winreg.CloseKey(reg_key)
-            return True
-        except Exception:
-            return False
+    def _list_directory(dir_path: str, index: Optional[JunkIndex]
+                        ) -> Optional[Tuple[List[Tuple[str, int, float]], List[str], bool]]:
+        """List a directory through the index when one is given"""
+        return index.listing(dir_path) if index else JunkIndex.scan_directory(dir_path)
 
-# === Enhanced Async Junk Cleaner ===
-class AsyncJunkCleaner:
     @staticmethod
-    def scan_junk_files(progress_callback: Optional[Callable] = None) -> List[Path]:
-        """Enhanced junk file scanning with better categorization"""
-        junk_files = []
-        
-        # Define junk file locations and patterns
-        junk_locations = {
-            "Temporary Files": [
-                (Path(os.getenv("TEMP", "")), ["*"]),
-                (Path("C:\\Windows\\Temp"), ["*"]),
-                (Path(os.getenv("LOCALAPPDATA", "")) / "Temp", ["*"]),
-            ],
-            "Browser Cache": [
-                (Path(os.getenv("LOCALAPPDATA", "")) / "Google" / "Chrome" / "User Data" / "Default" / "Cache", ["*"]),
-                (Path(os.getenv("LOCALAPPDATA", "")) / "Mozilla" / "Firefox" / "Profiles", ["*.default*", "cache2"]),
-                (Path(os.getenv("LOCALAPPDATA", "")) / "Microsoft" / "Edge" / "User Data" / "Default" / "Cache", ["*"]),
-            ],
-            "Windows Cache": [
-                (Path("C:\\Windows\\SoftwareDistribution\\Download"), ["*"]),
-                (Path(os.getenv("LOCALAPPDATA", "")) / "Microsoft" / "Windows" / "Explorer", ["thumbcache*.db"]),
-                (Path("C:\\Windows\\Prefetch"), ["*.pf"]),
-            ],
-            "System Logs": [
-                (Path("C:\\Windows\\Logs"), ["*.log", "*.etl"]),
-                (Path(os.getenv("LOCALAPPDATA", "")) / "CrashDumps", ["*.dmp"]),
-            ],
-            "Recycle Bin": [
-                (Path("C:\\$Recycle.Bin"), ["*"]),
-            ]
-        }
-        
-        total_locations = sum(len(locations) for locations in junk_locations.values())
-        current_location = 0
+    def _iter_junk_entries(progress_callback: Optional[Callable] = None,
+                           cancel_token: Optional[CancellationToken] = None,
+                           index: Optional[JunkIndex] = None,
+                           rules: Optional[List[JunkRule]] = None
+                           ) -> Iterator[Tuple[str, str, int, float, str, bool, int]]:
+        """Yield (directory, name, size, mtime, category, is_dir, file count) junk rows.
+        
+        Rules sharing a root are matched together, so each root is traversed once
+        and every file is stat'ed once. Below roots with a match-all ("*") rule, a
+        subdirectory whose files all pass that rule is yielded as one directory row
+        with aggregated size. With an index, only directories whose mtime changed
+        since the last scan are listed.
+        
+        Each directory is walked once, under the most specific root containing it:
+        a walk stops at directories that are roots of their own, so nested roots
+        are matched by their own rules and nothing is yielded twice.
+        """
+        root_groups = AsyncJunkCleaner.group_rules(
+            rules if rules is not None else AsyncJunkCleaner.load_rules()
+        )
+        root_keys = {root_rules.key for root_rules in root_groups}
+        visited: Set[str] = set()
+        now = time.time()
         
-        for category, locations in junk_locations.items():
-            for base_path, patterns in locations:
-                current_location += 1
-                
+        try:
+            for location_index, root_rules in enumerate(root_groups, 1):
                 if progress_callback:
-                    progress_callback(current_location, total_locations, 
-                                    f"Scanning {category}", str(base_path))
-                
-                if not base_path.exists():
-                    continue
+                    categories = ", ".join(dict.fromkeys(rule.category for rule in root_rules.rules))
+                    progress_callback(location_index, len(root_groups), 
+                                      f"Scanning {categories}", root_rules.root)
                 
-                try:
-                    for pattern in patterns:
-                        if pattern == "*":
-                            # Scan all files in directory
-                            for item in base_path.rglob("*"):
-                                if item.is_file() and AsyncJunkCleaner._is_safe_to_delete(item):
-                                    junk_files.append(item)
-                        else:
-                            # Scan specific patterns
-                            for item in base_path.rglob(pattern):
-                                if item.is_file() and AsyncJunkCleaner._is_safe_to_delete(item):
-                                    junk_files.append(item)
-                except (PermissionError, OSError):
-                    continue
-        
-        # Remove duplicates and sort
-        junk_files = list(set(junk_files))
-        junk_files.sort(key=lambda x: x.stat().st_size, reverse=True)
-        
-        return junk_files
+                collapse_rule = root_rules.collapse_rule
+                pending = [root_rules.root]
+                while pending:
+                    if cancel_token and cancel_token.cancelled:
+                        return  # Keep what was found so far
+                    dir_path = pending.pop()
+                    dir_key = os.path.normcase(os.path.abspath(dir_path))
+                    if dir_key in visited or (dir_key in root_keys and dir_key != root_rules.key):
+                        continue
+                    visited.add(dir_key)
+                    
+                    listing = AsyncJunkCleaner._list_directory(dir_path, index)
+                    if listing is None:
+                        continue
+                    files, subdirs, _ = listing
+                    
+                    for subdir in subdirs:
+                        subdir_path = os.path.join(dir_path, subdir)
+                        if collapse_rule is None:
+                            pending.append(subdir_path)
+                            continue
+                        
+                        eligible, size, mtime, file_count, rows = AsyncJunkCleaner._collect_junk_tree(
+                            subdir_path, root_rules, root_keys, visited, now, cancel_token, index
+                        )
+                        if eligible and file_count:
+                            yield dir_path, subdir, size, mtime, collapse_rule.category, True, file_count
+                        yield from rows
+                    
+                    for name, size, mtime in files:
+                        lower_name = name.lower()
+                        if not AsyncJunkCleaner._is_safe_to_delete(lower_name):
+                            continue
+                        rule = root_rules.match(lower_name, size, mtime, now)
+                        if rule:
+                            yield dir_path, name, size, mtime, rule.category, False, 1
+        finally:
+            if index:
+                index.flush()
 
     @staticmethod
-    def clean_junk_files(files: List[Path], progress_callback: Optional[Callable] = None) -> Tuple[int, int]:
-        """Clean junk files with progress tracking"""
-        cleaned_count = 0
-        total_freed = 0
+    def _collect_junk_tree(dir_path: str, root_rules: JunkRootRules, root_keys: Set[str],
+                           visited: Set[str], now: float,
+                           cancel_token: Optional[CancellationToken] = None,
+                           index: Optional[JunkIndex] = None
+                           ) -> Tuple[bool, int, float, int, List[Tuple[str, str, int, float, str, bool, int]]]:
+        """Walk a subtree below a root with a match-all rule.
+        
+        Returns (eligible, size, newest mtime, file count, rows). The subtree is
+        eligible when every entry in it is a safe file accepted by the match-all
+        rule; the caller then records the directory itself and rows is empty.
+        Otherwise rows holds junk rows for the eligible child directories and the
+        files some rule accepts, so only the blocking entries are left out.
+        The walk keeps its own stack, so a deep tree cannot exhaust the recursion limit.
+        """
+        collapse_rule = root_rules.collapse_rule
+        
+        def open_frame(path: str, name: str) -> Optional[_JunkTreeFrame]:
+            dir_key = os.path.normcase(os.path.abspath(path))
+            if dir_key in visited or dir_key in root_keys:
+                return None  # Already walked, or walked under its own root's rules
+            visited.add(dir_key)
+            listing = AsyncJunkCleaner._list_directory(path, index)
+            if listing is None:
+                return None
+            files, subdirs, blocked = listing
+            # Links, junctions and unreadable entries keep a directory from being removed whole
+            return _JunkTreeFrame(path, name, files, iter(subdirs), not blocked)
+        
+        root = open_frame(dir_path, os.path.basename(dir_path))
+        if root is None:
+            return False, 0, 0.0, 0, []
+        stack = [root]
+        
+        while True:
+            frame = stack[-1]
+            cancelled = bool(cancel_token and cancel_token.cancelled)
+            subdir = None if cancelled else next(frame.subdirs, None)
+            if subdir is not None:
+                child = open_frame(os.path.join(frame.path, subdir), subdir)
+                if child is None:
+                    frame.eligible = False
+                else:
+                    stack.append(child)
+                continue
+            
+            # All subdirectories are done (or the walk was cancelled): match the files
+            if cancelled:
+                frame.eligible = False
+            else:
+                for name, size, mtime in frame.files:
+                    lower_name = name.lower()
+                    rule = root_rules.match(lower_name, size, mtime, now) \
+                        if AsyncJunkCleaner._is_safe_to_delete(lower_name) else None
+                    if rule is not collapse_rule:
+                        frame.eligible = False  # Kept by the thresholds, or taken by a narrower rule
+                    if rule is None:
+                        continue
+                    frame.rows.append((frame.path, name, size, mtime, rule.category, False, 1))
+                    frame.size += size
+                    frame.newest = max(frame.newest, mtime)
+                    frame.file_count += 1
+            
+            stack.pop()
+            if not stack:
+                return frame.eligible, frame.size, frame.newest, frame.file_count, \
+                    [] if frame.eligible else frame.rows
+            
+            parent = stack[-1]
+            if frame.eligible:
+                if frame.file_count:
+                    parent.rows.append((parent.path, frame.name, frame.size, frame.newest, 
+                                        collapse_rule.category, True, frame.file_count))
+            else:
+                parent.eligible = False
+                parent.rows.extend(frame.rows)
+            parent.size += frame.size
+            parent.newest = max(parent.newest, frame.newest)
+            parent.file_count += frame.file_count
+
+    @staticmethod
+    def scan_junk_files(progress_callback: Optional[Callable] = None,
+                        cancel_token: Optional[CancellationToken] = None,
+                        index: Optional[JunkIndex] = None,
+                        rules: Optional[List[JunkRule]] = None) -> JunkScanResult:
+        """Enhanced junk file scanning with better categorization"""
+        result = JunkScanResult()
+        store = result.store
+        location = [0, 0, ""]
         
-        for i, file_path in enumerate(files):
+        def location_progress(current, total, message, detail=""):
+            location[:] = [current, total, message]
             if progress_callback:
-                progress_callback(i, len(files), "Cleaning files", str(file_path))
-            
-            try:
-                if file_path.exists():
-                    file_size = file_path.stat().st_size
-                    if file_path.is_dir():
-                        shutil.rmtree(file_path, ignore_errors=True)
-                    else:
-                        file_path.unlink()
-                    cleaned_count += 1
-                    total_freed += file_size
-            except (PermissionError, OSError, FileNotFoundError):
-                continue
+                progress_callback(current, total, message, detail)
+        
+        # Rows go straight into the columnar store; no Path or record objects are kept
+        for dir_path, name, size, mtime, category, is_dir, file_count in AsyncJunkCleaner._iter_junk_entries(
+                location_progress, cancel_token, index, rules):
+            result.add(store.intern_directory(dir_path), name, size, mtime, store.intern_category(category),
+                       is_dir, file_count)
+            if progress_callback and len(store) % 500 == 0:
+                progress_callback(location[0], location[1], location[2], 
+                                  f"{len(store)} files found so far")
         
-        return cleaned_count, total_freed
+        return result
+
+    @staticmethod
+    def clean_junk_files(files: ScanResultStore, progress_callback: Optional[Callable] = None,
+                         cancel_token: Optional[CancellationToken] = None) -> DeletionResult:
+        """Clean junk files in parallel, counting the sizes recorded by the scan"""
+        return DeletionEngine().delete_store(files, progress_callback, cancel_token)
 
     @staticmethod
-    def _is_safe_to_delete(file_path: Path) -> bool:
-        """Check if a file is safe to delete"""
+    def _is_safe_to_delete(file_name: str) -> bool:
+        """Check if a file is safe to delete by its (lower-case) name"""
         # Don't delete system-critical files
         unsafe_extensions = {'.sys', '.dll', '.exe', '.ini'}
-        if file_path.suffix.lower() in unsafe_extensions:
-            return False
-        
-        # Don't delete files that are currently in use
-        try:
-            file_path.stat()
-            return True
-        except (PermissionError, FileNotFoundError):
-            return False
+        return os.path.splitext(file_name)[1] not in unsafe_extensions
 
 # === Enhanced Main Application ===
 class EnhancedPyUninstallXPro:
+    FIRST_PAINT_BUDGET_MS = 300
+    EAGER_TABS = ("Programs", "Logs")  # Logs provides the log_text widget the logger needs
+    
     def __init__(self):
+        self._startup_started = time.perf_counter()
+        
         # Initialize main window with enhanced styling
         self.root = tb.Window(themename="cosmo")
         self.root.title("PyUninstallX Pro - Enhanced Deep Scan Edition")
@@ -1908,6 +4057,8 @@ class EnhancedPyUninstallXPro:
         self.programs_data: List[ProgramInfo] = []
         self.startup_data: List[StartupItem] = []
         self.last_scan_result: Optional[DeepScanResult] = None
+        self._deep_scan_categories: Dict[str, List] = {}  # category -> [tree node id, item count, total size]
+        self.deep_scan_token: Optional[CancellationToken] = None
     
         # UI state
         self.auto_scroll_var = tk.BooleanVar(value=True)
@@ -1919,23 +4070,41 @@ class EnhancedPyUninstallXPro:
         # Initialize components
         self.deep_scanner = DeepScanEngine()
         self.virus_scanner = VirusScanner()
+        self.program_snapshot = ProgramSnapshot()
+        self.program_index = ProgramSearchIndex()
+        self._publisher_labels: Dict[str, str] = {}  # Publisher filter entry -> publisher
+        self._filtered_program_ids: List[int] = []  # Filter result in rank order
+        self._sort_column: Optional[str] = None
+        self._sort_reverse = False
+        self._startup_rows: Dict[Tuple[int, str, str], Tuple[str, Tuple]] = {}  # key -> (tree item, values)
+        self._startup_items: Dict[str, StartupItem] = {}  # tree item -> entry
+        self._auto_refresh_job = None
+        self._queued_refreshes: Set[str] = set()  # Refreshes requested while the same one was running
+        self.junk_index = JunkIndex()
         
         # Setup UI (creates self.log_text widget)
         self._setup_enhanced_ui()
         
         # NOW initialize logger with existing log_text widget
-        self.logger = AsyncLogger(self.log_text)
+        self.logger = AsyncLogger(self.log_text, self.auto_scroll_var)
         
-        # Initialize smart automation with ready logger
-        self.smart_automation = SmartAutomation(logger=self.logger)
-        
-        # Load initial data asynchronously
-        self._load_initial_data()
+        # Smart automation (and its scheduler thread) starts with its tab
+        self.smart_automation: Optional[SmartAutomation] = None
         
         # Log startup
         self.safe_log("Enhanced PyUninstallX Pro started successfully", LogLevel.SUCCESS)
         
-        # Start background optimization
+        # Registry loads and background work wait until the window is on screen
+        self.root.after_idle(self._on_first_paint)
+
+    def _on_first_paint(self):
+        """Report startup time once the window is drawn, then start the deferred work"""
+        self.root.update_idletasks()
+        elapsed_ms = (time.perf_counter() - self._startup_started) * 1000
+        level = LogLevel.SUCCESS if elapsed_ms <= self.FIRST_PAINT_BUDGET_MS else LogLevel.WARNING
+        self.safe_log(f"First paint after {elapsed_ms:.0f} ms (budget {self.FIRST_PAINT_BUDGET_MS} ms)", level)
+        
+        self._load_initial_data()
         self._start_background_optimization()
 
     def safe_log(self, message: str, level: LogLevel = LogLevel.INFO):
@@ -1963,6 +4132,8 @@ class EnhancedPyUninstallXPro:
 
         # Initialize tabs dictionary
         self.tabs = {}
+        self._tab_names: List[str] = []
+        self._pending_tabs: Dict[str, Callable] = {}  # Tabs whose contents are not built yet
         
         # Optimized tab configuration with lazy loading support
         tab_configs = [
@@ -1977,35 +4148,52 @@ class EnhancedPyUninstallXPro:
             ("Logs", "📑", self._setup_enhanced_logs_tab)
         ]
         
-        # Create tabs with optimized rendering
+        # Create empty tab frames; contents are built on first show
         for name, icon, setup_func in tab_configs:
             frame = ttk.Frame(self.notebook)
             self.tabs[name] = frame
+            self._tab_names.append(name)
+            self._pending_tabs[name] = setup_func
             self.notebook.add(frame, text=f"{icon} {name}")
-            
-            # Setup tab content (logs tab MUST be created to get log_text widget)
-            try:
-                setup_func()
-            except Exception as e:
-                print(f"Error setting up {name} tab: {e}")
+        
+        for name in self.EAGER_TABS:
+            self._ensure_tab(name)
+        self.notebook.bind("<<NotebookTabChanged>>", self._on_tab_changed)
+
+    def _ensure_tab(self, name: str):
+        """Build a tab's contents the first time it is needed"""
+        setup_func = self._pending_tabs.pop(name, None)
+        if setup_func is None:
+            return
+        try:
+            setup_func()
+        except Exception as e:
+            self.safe_log(f"Error setting up {name} tab: {e}", LogLevel.ERROR)
+
+    def _on_tab_changed(self, event=None):
+        self._ensure_tab(self._tab_names[self.notebook.index("current")])
+
+    def _select_tab(self, name: str):
+        """Switch to a tab, building it first so its widgets can be used right away"""
+        self._ensure_tab(name)
+        self.notebook.select(self._tab_names.index(name))
 
     def _load_initial_data(self):
         """Load initial data with enhanced progress tracking and parallel loading"""
+        # Show the last snapshot right away; the refresh below only re-reads changed entries
+        cached_programs = self.program_snapshot.programs()
+        if cached_programs:
+            self._populate_programs_tree(cached_programs)
+            self.safe_log(f"Loaded {len(cached_programs)} programs from snapshot, refreshing...")
+        
         def load_programs():
             try:
                 self.refresh_installed_programs()
             except Exception as e:
                 self.safe_log(f"Error loading programs: {e}", LogLevel.ERROR)
         
-        def load_startup():
-            try:
-                self.refresh_startup_programs()
-            except Exception as e:
-                self.safe_log(f"Error loading startup items: {e}", LogLevel.ERROR)
-        
-        # Submit parallel loading tasks
+        # Startup entries are loaded when the Startup tab is first shown
         self.thread_pool.submit(load_programs)
-        self.thread_pool.submit(load_startup)
 
     def _start_background_optimization(self):
         """Start background optimization tasks"""
@@ -2024,6 +4212,7 @@ class EnhancedPyUninstallXPro:
     def _cache_system_info(self):
         """Cache frequently accessed system information"""
         try:
+            import psutil
             # Cache drive info
             self.cached_drives = [d.device for d in psutil.disk_partitions()]
             # Cache user directories
@@ -2119,16 +4308,14 @@ class EnhancedPyUninstallXPro:
                                       command=lambda c=col: self._sort_programs(c))
             self.programs_tree.column(col, width=column_widths[col], anchor="w")
         
-        # Optimized scrollbars
-        v_scrollbar = ttk.Scrollbar(list_frame, orient="vertical", 
-                                   command=self.programs_tree.yview)
+        # Vertical scrolling is virtual: the scrollbar drives which rows the pooled items show
+        v_scrollbar = ttk.Scrollbar(list_frame, orient="vertical")
         h_scrollbar = ttk.Scrollbar(list_frame, orient="horizontal", 
                                    command=self.programs_tree.xview)
         
-        self.programs_tree.configure(
-            yscrollcommand=v_scrollbar.set, 
-            xscrollcommand=h_scrollbar.set
-        )
+        self.programs_tree.configure(xscrollcommand=h_scrollbar.set)
+        self.programs_list = VirtualTreeview(self.programs_tree, v_scrollbar, self._program_row_values,
+                                             key=self._program_key)
         
         self.programs_tree.grid(row=0, column=0, sticky="nsew")
         v_scrollbar.grid(row=0, column=1, sticky="ns")
@@ -2199,32 +4386,26 @@ class EnhancedPyUninstallXPro:
     def _copy_program_info(self, info_type: str):
         """Copy program information to clipboard"""
         try:
-            selection = self.programs_tree.selection()
+            selection = self.programs_list.selected()
             if not selection:
                 return
             
-            item = self.programs_tree.item(selection[0])
-            values = item['values']
-            
-            if info_type == 'name' and values:
+            if info_type == 'name':
                 self.root.clipboard_clear()
-                self.root.clipboard_append(values[0])
-                self.safe_log(f"Copied '{values[0]}' to clipboard", LogLevel.INFO)
+                self.root.clipboard_append(selection[0].name)
+                self.safe_log(f"Copied '{selection[0].name}' to clipboard", LogLevel.INFO)
         except Exception as e:
             self.safe_log(f"Error copying info: {e}", LogLevel.ERROR)
 
     def _open_install_location(self):
         """Open program install location in explorer"""
         try:
-            selection = self.programs_tree.selection()
+            selection = self.programs_list.selected()
             if not selection:
                 return
             
-            item = self.programs_tree.item(selection[0])
-            values = item['values']
-            
-            if len(values) > 5 and values[5]:
-                location = values[5]
+            location = selection[0].install_location
+            if location:
                 if os.path.exists(location):
                     os.startfile(location)
                 else:
@@ -2239,88 +4420,74 @@ class EnhancedPyUninstallXPro:
         
         self._filter_timer = self.root.after(300, self._filter_programs)
 
-    def _filter_programs(self, *args):
-        """Optimized program filtering with batch updates"""
+    def _filter_programs(self, *args, keep_view: bool = False):
+        """Filter the program list; only the visible rows are redrawn"""
         try:
-            search_text = self.search_var.get().lower()
-            publisher = self.publisher_filter.get()
-            
-            # Disable updates during filtering
-            self.programs_tree.configure(selectmode='none')
-            
-            # Clear tree efficiently
-            for item in self.programs_tree.get_children():
-                self.programs_tree.delete(item)
-            
-            # Filter and insert in batches
-            filtered_programs = [
-                prog for prog in self.programs_data
-                if (not search_text or search_text in prog.name.lower()) and
-                   (not publisher or publisher == "All" or prog.publisher == publisher)
-            ]
+            search_text = self.search_var.get()
+            label = self.publisher_filter.get()
+            publisher = self._publisher_labels.get(label, label) if label and label != "All" else None
             
-            # Batch insert for better performance
-            for prog in filtered_programs:
-                self._insert_program_item(prog)
-            
-            # Re-enable selection
-            self.programs_tree.configure(selectmode='extended')
+            # Index lookup, best matches first; no per-program scan
+            self._filtered_program_ids = self.program_index.search(search_text, publisher)
+            if not keep_view:
+                self.programs_list.offset = 0
+            self._show_program_ids(keep_view)
             
         except Exception as e:
             self.safe_log(f"Filter error: {e}", LogLevel.ERROR)
 
-    def _insert_program_item(self, prog: ProgramInfo):
-        """Insert program item into tree efficiently"""
-        try:
-            self.programs_tree.insert(
-                "", "end",
-                values=(
-                    prog.name,
-                    prog.publisher or "Unknown",
-                    prog.version or "N/A",
-                    prog.size or "N/A",
-                    prog.install_date or "N/A",
-                    prog.install_location or "N/A"
-                )
-            )
-        except Exception as e:
-            self.safe_log(f"Error inserting program: {e}", LogLevel.ERROR)
+    @staticmethod
+    def _program_key(prog: ProgramInfo) -> str:
+        """Identity of a program across refreshes"""
+        return prog.registry_key or prog.name
+
+    @staticmethod
+    def _program_row_values(prog: ProgramInfo) -> Tuple[str, ...]:
+        """Column values shown for a program"""
+        return (
+            prog.name,
+            prog.publisher or "Unknown",
+            prog.version or "N/A",
+            prog.size or "N/A",
+            prog.install_date or "N/A",
+            prog.install_location or "N/A"
+        )
+
+    PROGRAM_SORT_FIELDS = {
+        "Name": "name", "Publisher": "publisher", "Version": "version",
+        "Size": "size_kb", "Install Date": "install_date", "Install Location": "install_location"
+    }
 
     def _sort_programs(self, column: str):
-        """Sort programs by column"""
+        """Sort programs by column; a second click on the same column reverses the order"""
         try:
-            # Get current sort order
-            current_sort = getattr(self, '_sort_column', None)
-            reverse = False
-            
-            if current_sort == column:
-                reverse = getattr(self, '_sort_reverse', False)
-                self._sort_reverse = not reverse
+            if self._sort_column == column:
+                self._sort_reverse = not self._sort_reverse
             else:
                 self._sort_column = column
                 self._sort_reverse = False
             
-            # Sort data
-            column_index = {
-                "Name": 0, "Publisher": 1, "Version": 2,
-                "Size": 3, "Install Date": 4, "Install Location": 5
-            }
-            
-            idx = column_index.get(column, 0)
-            
-            items = [(self.programs_tree.item(item)['values'], item) 
-                    for item in self.programs_tree.get_children()]
-            
-            items.sort(key=lambda x: x[0][idx] if len(x[0]) > idx else "", 
-                      reverse=reverse)
-            
-            # Rearrange items
-            for index, (values, item) in enumerate(items):
-                self.programs_tree.move(item, '', index)
+            for col in self.PROGRAM_SORT_FIELDS:
+                arrow = (" ▼" if self._sort_reverse else " ▲") if col == column else ""
+                self.programs_tree.heading(col, text=col + arrow)
+            self._show_program_ids()
                 
         except Exception as e:
             self.safe_log(f"Sort error: {e}", LogLevel.ERROR)
 
+    def _show_program_ids(self, keep_view: bool = False):
+        """Show the filtered programs, in the active sort order if any, in one view update"""
+        index = self.program_index
+        program_ids = self._filtered_program_ids
+        if self._sort_column:
+            # Cached permutation of all programs, restricted to the filter result
+            order = index.order(self.PROGRAM_SORT_FIELDS[self._sort_column], self._sort_reverse)
+            if len(program_ids) != len(order):
+                wanted = set(program_ids)
+                order = [program_id for program_id in order if program_id in wanted]
+            program_ids = order
+        self.programs_list.set_rows([index.programs[program_id] for program_id in program_ids], keep_view)
+
     def _setup_enhanced_logs_tab(self):
         """Setup logs tab - MUST create log_text widget"""
         frame = self.tabs["Logs"]
@@ -2401,6 +4568,7 @@ class EnhancedPyUninstallXPro:
         self.scan_program_combo = ttk.Combobox(selection_frame, textvariable=self.scan_program_var, 
                                              width=50, font=("Segoe UI", 10))
         self.scan_program_combo.pack(side="left", padx=(0, 15))
+        self.scan_program_combo['values'] = [p.name for p in self.programs_data]
         
         # Scan options
         options_frame = ttk.Frame(controls_frame)
@@ -2630,6 +4798,8 @@ class EnhancedPyUninstallXPro:
     def _setup_smart_automation_tab(self): 
         """Setup the Smart Automation tab with optimization profiles"""
         frame = self.tabs["Smart Automation"]
+        if self.smart_automation is None:
+            self.smart_automation = SmartAutomation(logger=self.logger)
     
         # Header
         header_frame = ttk.LabelFrame(frame, text="", padding=15)
@@ -3015,6 +5185,9 @@ class EnhancedPyUninstallXPro:
                                           bootstyle="danger", width=18,
                                           command=self.remove_startup_program)
         self.remove_startup_btn.pack(side="left", padx=8)
+        
+        # Load entries now that the tab is shown
+        self.refresh_startup_programs()
 
     def _setup_enhanced_cleaner_tab(self): 
         """Enhanced junk cleaner tab with better UI"""
@@ -3107,8 +5280,9 @@ class EnhancedPyUninstallXPro:
                                        command=self.cancel_junk_operation, state="disabled")
         self.cancel_junk_btn.pack(side="left", padx=10)
         
-        self.junk_files = []
+        self.junk_files = ScanResultStore()
         self.junk_progress_handler = None
+        self.junk_token: Optional[CancellationToken] = None
 
     def _setup_enhanced_tools_tab(self): 
         """Enhanced tools tab with better organization"""
@@ -3213,75 +5387,141 @@ class EnhancedPyUninstallXPro:
         
         ttk.Label(performance_frame, text=f"Thread Pool Size: {self.thread_pool._max_workers}").pack(anchor="w", pady=5)
         ttk.Label(performance_frame, text=f"Active Operations: {len(self.active_operations)}").pack(anchor="w", pady=5)
-
-    def refresh_installed_programs(self):
-        """Enhanced program refresh with better progress tracking"""
+        
+        auto_refresh_frame = ttk.Frame(performance_frame)
+        auto_refresh_frame.pack(anchor="w", pady=5)
+        
+        self.auto_refresh_var = tk.BooleanVar(value=False)
+        self.auto_refresh_seconds_var = tk.IntVar(value=10)
+        ttk.Checkbutton(auto_refresh_frame, text="Auto-refresh program and startup lists every",
+                        variable=self.auto_refresh_var, command=self._toggle_auto_refresh).pack(side="left")
+        ttk.Spinbox(auto_refresh_frame, from_=2, to=3600, width=6, 
+                    textvariable=self.auto_refresh_seconds_var).pack(side="left", padx=5)
+        ttk.Label(auto_refresh_frame, text="seconds").pack(side="left")
+
+    def _toggle_auto_refresh(self):
+        """Start or stop the periodic keyed refresh of the program and startup lists"""
+        if self._auto_refresh_job:
+            self.root.after_cancel(self._auto_refresh_job)
+            self._auto_refresh_job = None
+        if self.auto_refresh_var.get():
+            self.safe_log("Auto-refresh enabled", LogLevel.INFO)
+            self._schedule_auto_refresh()
+
+    def _schedule_auto_refresh(self):
+        try:
+            seconds = max(2, self.auto_refresh_seconds_var.get())
+        except tk.TclError:
+            seconds = 10  # Spinbox holds something that is not a number
+        self._auto_refresh_job = self.root.after(seconds * 1000, self._auto_refresh_tick)
+
+    def _auto_refresh_tick(self):
+        """Refresh quietly; unchanged snapshot entries are not re-read and unchanged rows not redrawn"""
+        self.refresh_installed_programs(quiet=True)
+        if "Startup" not in self._pending_tabs:
+            self.refresh_startup_programs(quiet=True)
+        self._schedule_auto_refresh()
+
+    def _finish_refresh(self, operation: str, refresh: Callable):
+        """End a refresh on the Tk thread, then run one the user requested while it was running"""
+        self.active_operations.discard(operation)
+        if operation in self._queued_refreshes:
+            self._queued_refreshes.discard(operation)
+            refresh()
+
+    def refresh_installed_programs(self, quiet: bool = False):
+        """Enhanced program refresh with better progress tracking; quiet skips the progress UI"""
         if "refresh_programs" in self.active_operations:
+            if not quiet:
+                # Run the user's refresh once the running one (e.g. an auto-refresh) is done
+                self._queued_refreshes.add("refresh_programs")
             return
             
         self.active_operations.add("refresh_programs")
-        self._set_programs_buttons_state(scanning=True)
-        self.programs_animator.start('scanning', "Loading programs")
-        
-        progress_handler = EnhancedProgressHandler(
-            self.programs_progress, 
-            self.programs_status, 
-            self.programs_animation_label
-        )
-        progress_handler.set_indeterminate(True)
+        progress_handler = None
+        if not quiet:
+            self._set_programs_buttons_state(scanning=True)
+            self.programs_animator.start('scanning', "Loading programs")
+            
+            progress_handler = EnhancedProgressHandler(
+                self.programs_progress, 
+                self.programs_status, 
+                self.programs_animation_label
+            )
+            progress_handler.set_indeterminate(True)
         
         def update_progress(current, total, message, detail=""):
-            self.root.after(0, lambda: progress_handler.update(current, total, message, detail))
+            if progress_handler:
+                self.root.after(0, lambda: progress_handler.update(current, total, message, detail))
         
         def on_complete(future):
             try:
                 programs = future.result()
-                self.root.after(0, lambda: self._update_programs_tree_enhanced(programs, progress_handler))
+                # Built here, off the Tk thread; skipped when nothing changed
+                index = ProgramSearchIndex(programs) if programs != self.programs_data else None
+                self.root.after(0, lambda: self._update_programs_tree_enhanced(programs, progress_handler, index))
             except Exception as e:
                 self.logger.log(f"Failed to refresh programs: {str(e)}", LogLevel.ERROR)
             finally:
-                self.active_operations.discard("refresh_programs")
-                self.root.after(0, lambda: self._set_programs_buttons_state(scanning=False))
+                if not quiet:
+                    self.root.after(0, lambda: self._set_programs_buttons_state(scanning=False))
+                self.root.after(0, lambda: self._finish_refresh("refresh_programs", self.refresh_installed_programs))
         
         future = self.thread_pool.submit(
             EnhancedRegistryHelper.get_installed_programs_async, 
-            update_progress
+            update_progress,
+            self.program_snapshot
         )
         future.add_done_callback(on_complete)
 
     def _update_programs_tree_enhanced(self, programs: List[ProgramInfo], 
-                                     progress_handler: EnhancedProgressHandler):
-        """Update programs tree with enhanced information"""
-        # Clear existing items
-        for item in self.programs_tree.get_children():
-            self.programs_tree.delete(item)
-        
+                                     progress_handler: Optional[EnhancedProgressHandler],
+                                     index: Optional[ProgramSearchIndex] = None):
+        """Reconcile the programs list with a refresh, keeping selection and scroll position"""
+        added, updated, removed = self._diff_by_key(self.programs_data, programs, self._program_key)
+        if added or updated or removed:
+            self._populate_programs_tree(programs, index)
+        
+        if progress_handler:
+            progress_handler.set_indeterminate(False)
+            progress_handler.reset()
+            self.programs_animator.stop()
+            self.logger.log(f"✅ Loaded {len(programs)} installed programs with detailed information", LogLevel.SUCCESS)
+        elif added or updated or removed:
+            self.logger.log(f"Programs changed: {added} added, {updated} updated, {removed} removed", LogLevel.INFO)
+
+    @staticmethod
+    def _diff_by_key(old: List[Any], new: List[Any], key: Callable[[Any], Any]) -> Tuple[int, int, int]:
+        """Count (added, updated, removed) rows between two lists matched by key"""
+        old_by_key = {key(row): row for row in old}
+        new_by_key = {key(row): row for row in new}
+        added = sum(1 for row_key in new_by_key if row_key not in old_by_key)
+        removed = sum(1 for row_key in old_by_key if row_key not in new_by_key)
+        updated = sum(1 for row_key, row in new_by_key.items() 
+                      if row_key in old_by_key and old_by_key[row_key] != row)
+        return added, updated, removed
+
+    def _populate_programs_tree(self, programs: List[ProgramInfo], 
+                                index: Optional[ProgramSearchIndex] = None):
+        """Fill the programs list, publisher filter and scan combo"""
         self.programs_data = programs
+        self.program_index = index or ProgramSearchIndex(programs)
         
-        # Update publisher filter
-        publishers = sorted(set(p.publisher for p in programs if p.publisher))
-        self.publisher_filter['values'] = ['All'] + publishers
-        self.publisher_filter.set('All')
-        
-        # Update scan program combo
-        program_names = [p.name for p in programs]
-        self.scan_program_combo['values'] = program_names
-        
-        # Add programs to tree
-        for program in programs:
-            self.programs_tree.insert("", "end", values=(
-                program.name,
-                program.publisher or "Unknown",
-                program.version or "N/A", 
-                program.size or "Unknown",
-                program.install_date or "Unknown",
-                program.install_location or "Unknown"
-            ))
+        # Update publisher filter, most common publishers first, keeping the chosen publisher
+        label = self.publisher_filter.get()
+        publisher = self._publisher_labels.get(label)
+        self._publisher_labels = {f"{publisher} ({count})": publisher 
+                                  for publisher, count in self.program_index.publisher_counts()}
+        self.publisher_filter['values'] = ['All'] + list(self._publisher_labels)
+        labels_by_publisher = {publisher: label for label, publisher in self._publisher_labels.items()}
+        self.publisher_filter.set(labels_by_publisher.get(publisher, 'All'))
         
-        progress_handler.set_indeterminate(False)
-        progress_handler.reset()
-        self.programs_animator.stop()
-        self.logger.log(f"✅ Loaded {len(programs)} installed programs with detailed information", LogLevel.SUCCESS)
+        # Update scan program combo; an unbuilt Deep Scanner tab fills it when shown
+        if "Deep Scanner" not in self._pending_tabs:
+            self.scan_program_combo['values'] = [p.name for p in programs]
+        
+        # Keep the current search, selection and scroll position
+        self._filter_programs(keep_view=True)
 
     def _set_programs_buttons_state(self, scanning: bool = False):
         """Manage programs tab button states"""
@@ -3292,20 +5532,13 @@ class EnhancedPyUninstallXPro:
 
     def smart_uninstall_program(self):
         """Enhanced uninstall with automatic deep scan"""
-        selected = self.programs_tree.selection()
+        selected = self.programs_list.selected()
         if not selected:
             messagebox.showwarning("Warning", "Please select a program to uninstall.")
             return
             
-        item = self.programs_tree.item(selected[0])
-        program_name = item["values"][0]
-        
-        # Find program info
-        program_info = None
-        for prog in self.programs_data:
-            if prog.name == program_name:
-                program_info = prog
-                break
+        program_info = selected[0]
+        program_name = program_info.name
         
         if not program_info or not program_info.uninstall_command:
             messagebox.showinfo("Info", "Uninstall command not found for this program.")
@@ -3351,10 +5584,7 @@ class EnhancedPyUninstallXPro:
     def _auto_deep_scan(self, program_info: ProgramInfo):
         """Automatically trigger deep scan after uninstall"""
         # Switch to Deep Scanner tab
-        for i, tab_id in enumerate(self.notebook.tabs()):
-            if "Deep Scanner" in self.notebook.tab(tab_id, "text"):
-                self.notebook.select(i)
-                break
+        self._select_tab("Deep Scanner")
         
         # Set the program in the combo box
         self.scan_program_combo.set(program_info.name)
@@ -3372,19 +5602,20 @@ class EnhancedPyUninstallXPro:
             messagebox.showwarning("Warning", "Please select a program to scan.")
             return
             
-        # Find program info for install location
-        install_location = ""
+        # Find program info for install location and publisher
+        install_location = publisher = ""
         for prog in self.programs_data:
             if prog.name == program_name:
                 install_location = prog.install_location
+                publisher = prog.publisher
                 break
         
         self.active_operations.add("deep_scan")
         self._set_deep_scan_buttons_state(scanning=True)
+        self.deep_scan_token = cancel_token = CancellationToken()
         
         # Clear previous results
-        for item in self.deep_scan_tree.get_children():
-            self.deep_scan_tree.delete(item)
+        self._clear_deep_scan_tree()
         
         self.deep_scan_animator.start('analyzing', "Deep scanning")
         
@@ -3397,10 +5628,26 @@ class EnhancedPyUninstallXPro:
         def update_progress(current, total, message, detail=""):
             self.root.after(0, lambda: progress_handler.update(current, total, message, detail))
         
+        def run_scan() -> DeepScanResult:
+            """Stream batches to the tree as they are found, stopping between batches on cancel"""
+            start_time = time.time()
+            leftover_items = []
+            
+            # The engine checks the token per entry and key, so a cancel ends the
+            # loop with the batches found so far
+            for batch in self.deep_scanner.iter_deep_scan(program_name, install_location, 
+                                                          update_progress, cancel_token, publisher):
+                leftover_items.extend(batch)
+                self.root.after(0, lambda batch=batch: self._append_deep_scan_batch(batch))
+            
+            return DeepScanResult(program_name, leftover_items, 
+                                  sum(item.size for item in leftover_items), time.time() - start_time)
+        
         def on_scan_complete(future):
             try:
                 scan_result = future.result()
-                self.root.after(0, lambda: self._display_deep_scan_results(scan_result, progress_handler))
+                self.root.after(0, lambda: self._finish_deep_scan(scan_result, progress_handler, 
+                                                                  cancel_token.cancelled))
             except Exception as e:
                 self.logger.log(f"Deep scan failed: {str(e)}", LogLevel.ERROR)
             finally:
@@ -3410,80 +5657,77 @@ class EnhancedPyUninstallXPro:
         # Set scanner logger
         self.deep_scanner.logger = self.logger
         
-        future = self.thread_pool.submit(
-            self.deep_scanner.deep_scan_leftovers,
-            program_name,
-            install_location,
-            update_progress
-        )
+        future = self.thread_pool.submit(run_scan)
         future.add_done_callback(on_scan_complete)
 
-    def _display_deep_scan_results(self, scan_result: DeepScanResult, 
-                                 progress_handler: EnhancedProgressHandler):
-        """Display deep scan results in the tree"""
-        self.last_scan_result = scan_result
-        
-        # Group items by category for better organization
-        categories = {}
-        for item in scan_result.leftover_items:
-            if item.category not in categories:
-                categories[item.category] = []
-            categories[item.category].append(item)
-        
-        # Add category nodes and items
-        for category, items in categories.items():
-            category_icons = {
-                'program_files': '📁',
-                'appdata': '👤', 
-                'registry': '📝',
-                'shortcuts': '🔗',
-                'temp': '🗂️',
-                'system': '⚙️'
-            }
-            
-            category_icon = category_icons.get(category, '📄')
-            category_name = category.replace('_', ' ').title()
-            
-            # Insert category parent
-            category_id = self.deep_scan_tree.insert("", "end", 
-                values=(f"{category_icon} {category_name} ({len(items)} items)", 
-                       "Category", self._format_bytes(sum(i.size for i in items)), 
-                       "", "", ""),
-                tags=("category",)
-            )
-            
-            # Add items under category
-            for item in items:
-                item_name = item.path.name
-                if len(item_name) > 50:
-                    item_name = item_name[:47] + "..."
-                
-                confidence_colors = {
-                    "High": "🔴", "Medium": "🟡", "Low": "🟢"
-                }
-                confidence_icon = confidence_colors.get(item.confidence, "⚪")
-                
-                self.deep_scan_tree.insert(category_id, "end",
-                    values=(
-                        item_name,
-                        item.item_type.title(),
-                        self._format_bytes(item.size) if item.size else "N/A",
-                        item.category.replace('_', ' ').title(),
-                        f"{confidence_icon} {item.confidence}",
-                        str(item.path)
-                    ),
-                    tags=(f"confidence_{item.confidence.lower()}",)
-                )
+    def _clear_deep_scan_tree(self):
+        """Remove all rows and category nodes from the deep scan tree"""
+        for item in self.deep_scan_tree.get_children():
+            self.deep_scan_tree.delete(item)
+        self._deep_scan_categories = {}
         
         # Configure tags for visual distinction
         self.deep_scan_tree.tag_configure("category", background="#E8F4FD", font=("Segoe UI", 10, "bold"))
         self.deep_scan_tree.tag_configure("confidence_high", background="#FFEBEE")
         self.deep_scan_tree.tag_configure("confidence_medium", background="#FFF3E0") 
         self.deep_scan_tree.tag_configure("confidence_low", background="#E8F5E8")
+
+    def _append_deep_scan_batch(self, items: List[LeftoverItem]):
+        """Insert a batch of leftovers under their category nodes, creating nodes as needed"""
+        category_icons = {
+            'program_files': '📁',
+            'appdata': '👤', 
+            'registry': '📝',
+            'shortcuts': '🔗',
+            'temp': '🗂️',
+            'system': '⚙️'
+        }
+        confidence_colors = {
+            "High": "🔴", "Medium": "🟡", "Low": "🟢"
+        }
+        touched = set()
         
-        # Expand all categories
-        for item in self.deep_scan_tree.get_children():
-            self.deep_scan_tree.item(item, open=True)
+        for item in items:
+            category = self._deep_scan_categories.get(item.category)
+            if category is None:
+                # Insert category parent; its label is filled in below
+                category_id = self.deep_scan_tree.insert("", "end", values=("", "Category", "", "", "", ""),
+                                                         tags=("category",), open=True)
+                category = self._deep_scan_categories[item.category] = [category_id, 0, 0]
+            category[1] += 1
+            category[2] += item.size
+            touched.add(item.category)
+            
+            item_name = item.path.name
+            if len(item_name) > 50:
+                item_name = item_name[:47] + "..."
+            confidence_icon = confidence_colors.get(item.confidence, "⚪")
+            
+            self.deep_scan_tree.insert(category[0], "end",
+                values=(
+                    item_name,
+                    item.item_type.title(),
+                    self._format_bytes(item.size) if item.size else "N/A",
+                    item.category.replace('_', ' ').title(),
+                    f"{confidence_icon} {item.confidence}",
+                    str(item.path)
+                ),
+                tags=(f"confidence_{item.confidence.lower()}",)
+            )
+        
+        for category_key in touched:
+            category_id, count, size = self._deep_scan_categories[category_key]
+            category_icon = category_icons.get(category_key, '📄')
+            category_name = category_key.replace('_', ' ').title()
+            self.deep_scan_tree.item(category_id, values=(
+                f"{category_icon} {category_name} ({count} items)", 
+                "Category", self._format_bytes(size), "", "", ""
+            ))
+
+    def _finish_deep_scan(self, scan_result: DeepScanResult, 
+                          progress_handler: EnhancedProgressHandler, cancelled: bool = False):
+        """Record the final result once every batch has been inserted"""
+        self.last_scan_result = scan_result
         
         # Update UI
         progress_handler.reset()
@@ -3499,6 +5743,11 @@ class EnhancedPyUninstallXPro:
         total_size = self._format_bytes(scan_result.total_size)
         scan_time = f"{scan_result.scan_time:.1f}s"
         
+        if cancelled:
+            self.logger.log(f"Deep scan stopped: keeping {total_items} leftovers found ({total_size})", 
+                            LogLevel.WARNING)
+            return
+        
         self.logger.log(
             f"🔍 Deep scan complete: {total_items} leftovers found "
             f"({total_size}) in {scan_time}", 
@@ -3530,9 +5779,9 @@ class EnhancedPyUninstallXPro:
             item_values = self.deep_scan_tree.item(item_id)["values"]
             if len(item_values) >= 6 and item_values[1] != "Category":
                 # This is an actual leftover item, not a category
-                item_path = Path(item_values[5])  # Path is in column 5
+                item_path = str(item_values[5])  # Path is in column 5
                 for leftover in self.last_scan_result.leftover_items:
-                    if leftover.path == item_path:
+                    if str(leftover.path) == item_path:
                         items_to_clean.append(leftover)
                         break
         
@@ -3583,6 +5832,7 @@ class EnhancedPyUninstallXPro:
         
         self._set_deep_scan_buttons_state(cleaning=True)
         self.deep_scan_animator.start('cleaning', "Cleaning leftovers")
+        self.deep_scan_token = CancellationToken()
         
         progress_handler = EnhancedProgressHandler(
             self.deep_scan_progress,
@@ -3593,6 +5843,10 @@ class EnhancedPyUninstallXPro:
         def update_progress(current, total, message, detail=""):
             self.root.after(0, lambda: progress_handler.update(current, total, message, detail))
         
+        # Registry keys are only deleted when they belong to the scanned program
+        program_name = self.last_scan_result.program_name
+        publisher = next((prog.publisher for prog in self.programs_data if prog.name == program_name), "")
+        
         def on_clean_complete(future):
             try:
                 cleaned_count, errors = future.result()
@@ -3605,65 +5859,50 @@ class EnhancedPyUninstallXPro:
         future = self.thread_pool.submit(
             self._perform_cleanup,
             items_to_clean,
-            update_progress
+            program_name,
+            publisher,
+            update_progress,
+            self.deep_scan_token
         )
         future.add_done_callback(on_clean_complete)
 
-    def _perform_cleanup(self, items_to_clean: List[LeftoverItem], 
-                        progress_callback: Optional[Callable] = None) -> Tuple[int, int]:
+    def _perform_cleanup(self, items_to_clean: List[LeftoverItem], program_name: str, publisher: str = "",
+                        progress_callback: Optional[Callable] = None,
+                        cancel_token: Optional[CancellationToken] = None) -> Tuple[int, int]:
         """Perform the actual cleanup of leftover items"""
         cleaned_count = 0
         error_count = 0
+        registry_items = [item for item in items_to_clean if item.item_type == "registry"]
+        file_items = [item for item in items_to_clean if item.item_type != "registry"]
         
-        for i, item in enumerate(items_to_clean):
+        for i, item in enumerate(registry_items):
+            if cancel_token and cancel_token.cancelled:
+                break
             if progress_callback:
                 progress_callback(i, len(items_to_clean), "Cleaning leftovers", str(item.path))
             
             try:
-                if item.item_type == "registry":
-                    # Handle registry cleanup
-                    self._clean_registry_item(item)
-                    cleaned_count += 1
-                elif item.path.exists():
-                    if item.path.is_dir():
-                        shutil.rmtree(item.path, ignore_errors=True)
-                    else:
-                        item.path.unlink()
-                    cleaned_count += 1
-                    
-            except Exception as e:
+                self.deep_scanner.delete_registry_leftover(item, program_name, publisher)
+                cleaned_count += 1
+            except (PermissionError, OSError) as e:
                 error_count += 1
                 self.logger.log(f"Failed to clean {item.path}: {str(e)}", LogLevel.WARNING)
         
+        def file_progress(current, total, message, detail=""):
+            if progress_callback:
+                progress_callback(len(registry_items) + current, len(items_to_clean), "Cleaning leftovers", detail)
+        
+        result = DeletionEngine().delete_paths(
+            ((item.path, item.size, item.item_type == "folder") for item in file_items),
+            file_progress, cancel_token
+        )
+        cleaned_count += result.deleted
+        error_count += result.failed
+        for path in result.failed_paths:
+            self.logger.log(f"Failed to clean {path}", LogLevel.WARNING)
+        
         return cleaned_count, error_count
 
-    def _clean_registry_item(self, item: LeftoverItem):
-        """Clean a registry item"""
-        # This is a simplified registry cleanup - in practice you'd need more sophisticated handling
-        try:
-            path_parts = str(item.path).split('\\')
-            if len(path_parts) >= 2:
-                hive_name = path_parts[0]
-                key_path = '\\'.join(path_parts[1:])
-                
-                hive_map = {
-                    'HKEY_CURRENT_USER': winreg.HKEY_CURRENT_USER,
-                    'HKEY_LOCAL_MACHINE': winreg.HKEY_LOCAL_MACHINE
-                }
-                
-                if hive_name in hive_map:
-                    parent_path = '\\'.join(path_parts[1:-1])
-                    key_name = path_parts[-1]
-                    
-                    try:
-                        key = winreg.OpenKey(hive_map[hive_name], parent_path, 0, winreg.KEY_SET_VALUE)
-                        winreg.DeleteKey(key, key_name)
-                        winreg.CloseKey(key)
-                    except FileNotFoundError:
-                        pass  # Already deleted
-        except Exception:
-            pass  # Registry cleanup failed, continue
-
     def _finalize_cleanup(self, cleaned_count: int, error_count: int, progress_handler: EnhancedProgressHandler):
         """Finalize the cleanup process"""
         progress_handler.reset()
@@ -3698,6 +5937,8 @@ class EnhancedPyUninstallXPro:
 
     def cancel_deep_scan(self):
         """Cancel the deep scan operation"""
+        if self.deep_scan_token:
+            self.deep_scan_token.cancel()
         self.active_operations.discard("deep_scan")
         self._set_deep_scan_buttons_state(scanning=False)
         self.deep_scan_animator.stop()
@@ -3705,39 +5946,37 @@ class EnhancedPyUninstallXPro:
 
     def quick_scan_leftovers(self):
         """Quick scan for leftovers of selected program"""
-        selected = self.programs_tree.selection()
+        selected = self.programs_list.selected()
         if not selected:
             messagebox.showwarning("Warning", "Please select a program for quick scan.")
             return
             
-        item = self.programs_tree.item(selected[0])
-        program_name = item["values"][0]
+        program_name = selected[0].name
         
-        # Set program in deep scanner and switch tabs
+        # Switch to Deep Scanner tab and set the program there
+        self._select_tab("Deep Scanner")
         self.scan_program_combo.set(program_name)
         
-        # Switch to Deep Scanner tab
-        for i, tab_id in enumerate(self.notebook.tabs()):
-            if "Deep Scanner" in self.notebook.tab(tab_id, "text"):
-                self.notebook.select(i)
-                break
-        
         # Start scan after small delay
         self.root.after(500, self.start_deep_scan)
 
-    def refresh_startup_programs(self):
-        """Enhanced startup program refresh"""
+    def refresh_startup_programs(self, quiet: bool = False):
+        """Enhanced startup program refresh; quiet skips the progress UI"""
         if "refresh_startup" in self.active_operations:
+            if not quiet:
+                self._queued_refreshes.add("refresh_startup")
             return
             
         self.active_operations.add("refresh_startup")
-        self.refresh_startup_btn.configure(state="disabled")
-        
-        progress_handler = EnhancedProgressHandler(self.startup_progress, self.startup_status)
-        progress_handler.set_indeterminate(True)
+        progress_handler = None
+        if not quiet:
+            self.refresh_startup_btn.configure(state="disabled")
+            progress_handler = EnhancedProgressHandler(self.startup_progress, self.startup_status)
+            progress_handler.set_indeterminate(True)
         
         def update_progress(current, total, message, detail=""):
-            self.root.after(0, lambda: progress_handler.update(current, total, message, detail))
+            if progress_handler:
+                self.root.after(0, lambda: progress_handler.update(current, total, message, detail))
         
         def on_complete(future):
             try:
@@ -3746,8 +5985,9 @@ class EnhancedPyUninstallXPro:
             except Exception as e:
                 self.logger.log(f"Failed to refresh startup programs: {str(e)}", LogLevel.ERROR)
             finally:
-                self.active_operations.discard("refresh_startup")
-                self.root.after(0, lambda: self.refresh_startup_btn.configure(state="normal"))
+                if not quiet:
+                    self.root.after(0, lambda: self.refresh_startup_btn.configure(state="normal"))
+                self.root.after(0, lambda: self._finish_refresh("refresh_startup", self.refresh_startup_programs))
         
         future = self.thread_pool.submit(
             EnhancedRegistryHelper.get_startup_programs_async, 
@@ -3756,20 +5996,60 @@ class EnhancedPyUninstallXPro:
         future.add_done_callback(on_complete)
 
     def _update_startup_tree_enhanced(self, items: List[StartupItem], 
-                                    progress_handler: EnhancedProgressHandler):
-        """Update startup tree with enhanced information"""
-        for item in self.startup_tree.get_children():
-            self.startup_tree.delete(item)
+                                    progress_handler: Optional[EnhancedProgressHandler]):
+        """Reconcile the startup tree with a refresh, touching only rows that changed.
         
+        Rows are keyed by (hive, key path, value name); existing tree items keep
+        their id, so selection and scroll position survive the refresh, and are
+        moved only when their position in items changed.
+        """
         self.startup_data = items
-        
+        new_rows = {}
         for item in items:
-            registry_location = f"{'HKCU' if item.hive == winreg.HKEY_CURRENT_USER else 'HKLM'}\\{item.registry_path.split('\\')[-1]}"
-            self.startup_tree.insert("", "end", values=(item.name, item.path, registry_location))
-        
-        progress_handler.set_indeterminate(False)
-        progress_handler.reset()
-        self.logger.log(f"Found {len(items)} startup programs", LogLevel.SUCCESS)
+            key_name = item.registry_path.split('\\')[-1]
+            registry_location = f"{'HKCU' if item.hive == HKEY_CURRENT_USER else 'HKLM'}\\{key_name}"
+            new_rows[(item.hive, item.registry_path, item.name)] = (item, (item.name, item.path, registry_location))
+        
+        removed = [row_key for row_key in self._startup_rows if row_key not in new_rows]
+        for row_key in removed:
+            self.startup_tree.delete(self._startup_rows.pop(row_key)[0])
+        
+        # Rows before `position` are final; the rest of the tree still holds the
+        # old rows in their old order, so an old row is in place if it comes next
+        old_order = list(self._startup_rows)
+        next_old = 0
+        placed = set()
+        added = updated = 0
+        rows = {}
+        self._startup_items = {}
+        for position, (row_key, (item, values)) in enumerate(new_rows.items()):
+            while next_old < len(old_order) and old_order[next_old] in placed:
+                next_old += 1
+            shown = self._startup_rows.get(row_key)
+            if shown is None:
+                tree_item = self.startup_tree.insert("", position, values=values)
+                added += 1
+            else:
+                tree_item = shown[0]
+                moved = old_order[next_old] != row_key
+                if moved:
+                    self.startup_tree.move(tree_item, "", position)
+                placed.add(row_key)
+                if shown[1] != values:
+                    self.startup_tree.item(tree_item, values=values)
+                if moved or shown[1] != values:
+                    updated += 1
+            rows[row_key] = (tree_item, values)
+            self._startup_items[tree_item] = item
+        self._startup_rows = rows
+        
+        if progress_handler:
+            progress_handler.set_indeterminate(False)
+            progress_handler.reset()
+            self.logger.log(f"Found {len(items)} startup programs", LogLevel.SUCCESS)
+        elif added or updated or removed:
+            self.logger.log(f"Startup entries changed: {added} added, {updated} updated, {len(removed)} removed",
+                            LogLevel.INFO)
 
     def remove_startup_program(self):
         """Enhanced startup program removal"""
@@ -3778,19 +6058,12 @@ class EnhancedPyUninstallXPro:
             messagebox.showwarning("Warning", "Please select a startup entry to remove.")
             return
             
-        item = self.startup_tree.item(selected[0])
-        program_name = item["values"][0]
-        
-        startup_item = None
-        for item_data in self.startup_data:
-            if item_data.name == program_name:
-                startup_item = item_data
-                break
-        
+        startup_item = self._startup_items.get(selected[0])
         if not startup_item:
             messagebox.showerror("Error", "Could not find startup entry data.")
             return
             
+        program_name = startup_item.name
         if messagebox.askyesno("Confirm", f"Remove startup entry '{program_name}'?"):
             def remove_entry():
                 try:
@@ -3817,6 +6090,7 @@ class EnhancedPyUninstallXPro:
             self.junk_progress, self.junk_status, self.junk_animation_label
         )
         self.junk_progress_handler.set_indeterminate(True)
+        self.junk_token = CancellationToken()
         
         def update_progress(current, total, message, detail=""):
             if self.junk_progress_handler and not self.junk_progress_handler.is_cancelled:
@@ -3824,23 +6098,25 @@ class EnhancedPyUninstallXPro:
         
         def on_scan_complete(future):
             try:
-                if not self.junk_progress_handler.is_cancelled:
-                    files = future.result()
-                    self.root.after(0, lambda: self._update_junk_scan_results_enhanced(files))
+                # A cancelled scan still returns the files found so far
+                scan_result = future.result()
+                self.root.after(0, lambda: self._update_junk_scan_results_enhanced(scan_result))
             except Exception as e:
                 self.logger.log(f"Junk scan failed: {str(e)}", LogLevel.ERROR)
             finally:
                 self.active_operations.discard("scan_junk")
                 self.root.after(0, lambda: self._set_junk_buttons_state(scanning=False))
         
-        future = self.thread_pool.submit(
-            AsyncJunkCleaner.scan_junk_files,
-            update_progress
-        )
+        def run_scan() -> JunkScanResult:
+            rules = AsyncJunkCleaner.load_rules(logger=self.logger)
+            return AsyncJunkCleaner.scan_junk_files(update_progress, self.junk_token, self.junk_index, rules)
+        
+        future = self.thread_pool.submit(run_scan)
         future.add_done_callback(on_scan_complete)
 
-    def _update_junk_scan_results_enhanced(self, files: List[Path]):
+    def _update_junk_scan_results_enhanced(self, scan_result: JunkScanResult):
         """Update junk scan results with enhanced UI"""
+        files = scan_result.store
         self.junk_files = files
         
         if self.junk_progress_handler:
@@ -3849,25 +6125,29 @@ class EnhancedPyUninstallXPro:
         
         self.junk_animator.stop()
         
-        total_size = 0
-        for file_path in files:
-            try:
-                total_size += file_path.stat().st_size
-            except (OSError, FileNotFoundError):
-                continue
+        total_size = scan_result.total_size
         
         # Update stat cards with animation-like effect
-        self._animate_counter(self.files_found_label, 0, len(files), "")
+        self._animate_counter(self.files_found_label, 0, files.total_files(), "")
         self._animate_counter(self.total_size_label, 0, total_size, "bytes")
         
         self.files_cleaned_label.config(text="0")
         self.space_freed_label.config(text="0 B")
         
-        self.junk_status.config(text=f"Found {len(files)} junk files ({self._format_bytes(total_size)})")
+        self.junk_status.config(text=f"Found {files.total_files()} junk files ({self._format_bytes(total_size)})")
         
         if files:
             self.clean_junk_btn.config(state="normal")
-            self.logger.log(f"Scan complete: {len(files)} junk files found ({self._format_bytes(total_size)})", LogLevel.SUCCESS)
+            self.logger.log(f"Scan complete: {files.total_files()} junk files found in {len(files)} items "
+                            f"({self._format_bytes(total_size)})", LogLevel.SUCCESS)
+            for category, size in sorted(scan_result.category_sizes.items(), key=lambda c: -c[1]):
+                self.logger.log(f"  {category}: {self._format_bytes(size)}", LogLevel.INFO)
+            for label, file_count, size in scan_result.age_histogram():
+                if file_count:
+                    self.logger.log(f"  Age {label}: {file_count} files ({self._format_bytes(size)})", 
+                                    LogLevel.INFO)
+            for record in scan_result.top_k(5):
+                self.logger.log(f"  Largest: {record.path} ({self._format_bytes(record.size)})", LogLevel.INFO)
         else:
             self.logger.log("Scan complete: No junk files found", LogLevel.INFO)
 
@@ -3876,16 +6156,11 @@ class EnhancedPyUninstallXPro:
         if not self.junk_files or "clean_junk" in self.active_operations:
             return
             
-        total_size = 0
-        for file_path in self.junk_files:
-            try:
-                total_size += file_path.stat().st_size
-            except (OSError, FileNotFoundError):
-                continue
+        total_size = self.junk_files.total_size()
         
         result = messagebox.askyesno(
             "Clean Junk Files",
-            f"This will delete {len(self.junk_files)} junk files "
+            f"This will delete {self.junk_files.total_files()} junk files "
             f"({self._format_bytes(total_size)}).\n\n"
             f"Continue with cleanup?"
         )
@@ -3900,6 +6175,7 @@ class EnhancedPyUninstallXPro:
         self.junk_progress_handler = EnhancedProgressHandler(
             self.junk_progress, self.junk_status, self.junk_animation_label
         )
+        self.junk_token = CancellationToken()
         
         def update_progress(current, total, message, detail=""):
             if self.junk_progress_handler and not self.junk_progress_handler.is_cancelled:
@@ -3907,8 +6183,10 @@ class EnhancedPyUninstallXPro:
         
         def on_clean_complete(future):
             try:
-                cleaned_count, total_freed = future.result()
-                self.root.after(0, lambda: self._finalize_junk_cleanup(cleaned_count, total_freed))
+                cleaned = future.result()
+                # Rows that failed or were not reached stay listed; built here, off the Tk thread
+                remaining = self.junk_files.subset(cleaned.kept)
+                self.root.after(0, lambda: self._finalize_junk_cleanup(cleaned.deleted, cleaned.freed, remaining))
             except Exception as e:
                 self.logger.log(f"Junk cleanup failed: {str(e)}", LogLevel.ERROR)
             finally:
@@ -3918,11 +6196,12 @@ class EnhancedPyUninstallXPro:
         future = self.thread_pool.submit(
             AsyncJunkCleaner.clean_junk_files,
             self.junk_files,
-            update_progress
+            update_progress,
+            self.junk_token
         )
         future.add_done_callback(on_clean_complete)
 
-    def _finalize_junk_cleanup(self, cleaned_count: int, total_freed: int):
+    def _finalize_junk_cleanup(self, cleaned_count: int, total_freed: int, remaining: ScanResultStore):
         """Finalize junk cleanup process"""
         if self.junk_progress_handler:
             self.junk_progress_handler.reset()
@@ -3935,9 +6214,9 @@ class EnhancedPyUninstallXPro:
         
         self.junk_status.config(text=f"Cleanup complete: {cleaned_count} files deleted")
         
-        # Clear junk files list
-        self.junk_files = []
-        self.clean_junk_btn.config(state="disabled")
+        # Keep whatever a failed or cancelled cleanup left behind
+        self.junk_files = remaining
+        self.clean_junk_btn.config(state="normal" if self.junk_files else "disabled")
         
         self.logger.log(f"Junk cleanup complete: {cleaned_count} files deleted, {self._format_bytes(total_freed)} freed", LogLevel.SUCCESS)
         
@@ -3949,12 +6228,14 @@ class EnhancedPyUninstallXPro:
         """Cancel junk operation"""
         if self.junk_progress_handler:
             self.junk_progress_handler.is_cancelled = True
+        if self.junk_token:
+            self.junk_token.cancel()
         
-        self.active_operations.discard("scan_junk")
-        self.active_operations.discard("clean_junk")
-        self._set_junk_buttons_state()
-        self.junk_animator.stop()
-        self.logger.log("Junk operation cancelled", LogLevel.WARNING)
+        # The worker stops at its next check; its done callback clears the operation
+        # and restores the buttons, so no new scan can share the index with it
+        self.cancel_junk_btn.configure(state="disabled")
+        self.junk_status.config(text="Cancelling...")
+        self.logger.log("Cancelling junk operation", LogLevel.WARNING)
 
     def _set_junk_buttons_state(self, scanning: bool = False, cleaning: bool = False):
         """Manage junk cleaner button states"""
@@ -3975,9 +6256,7 @@ class EnhancedPyUninstallXPro:
 
     def clear_logs(self):
         """Clear the log display"""
-        self.log_text.config(state=tk.NORMAL)
-        self.log_text.delete('1.0', tk.END)
-        self.log_text.config(state=tk.DISABLED)
+        self.logger.clear()
         self.logger.log("Logs cleared", LogLevel.INFO)
 
     def save_logs(self):
@@ -4221,14 +6500,23 @@ class EnhancedPyUninstallXPro:
         """Handle window close with cleanup"""
         try:
             self.safe_log("Shutting down...", LogLevel.INFO)
+            if self._auto_refresh_job:
+                self.root.after_cancel(self._auto_refresh_job)
+                self._auto_refresh_job = None
+            if self.logger:
+                self.logger.stop()
             
             # Shutdown thread pool gracefully
             self.thread_pool.shutdown(wait=False, cancel_futures=True)
             
             # Clean up resources
             if hasattr(self, 'deep_scanner'):
+                self.deep_scanner.size_cache.close()
                 del self.deep_scanner
             
+            if hasattr(self, 'junk_index'):
+                self.junk_index.close()
+            
             if hasattr(self, 'virus_scanner'):
                 del self.virus_scanner
             
@@ -4237,9 +6525,282 @@ class EnhancedPyUninstallXPro:
             print(f"Cleanup error: {e}")
             self.root.destroy()
 
+# === Headless CLI ===
+IMPORT_TIME_BUDGET_MS = 150  # Cold import of this module, measured with python -X importtime
+
+class NdjsonWriter:
+    """Writes one JSON object per line to a stream; also serves as the engines' logger"""
+    
+    def __init__(self, stream=None, show_progress: bool = False):
+        self.stream = stream or sys.stdout
+        self.show_progress = show_progress
+        self._lock = threading.Lock()  # Engines report from worker threads
+    
+    def emit(self, record_type: str, **fields):
+        line = json.dumps({"type": record_type, **fields}, default=str)
+        with self._lock:
+            self.stream.write(line + "\n")
+            self.stream.flush()
+    
+    def log(self, message: str, level=LogLevel.INFO):
+        self.emit("log", level=getattr(level, "value", level), message=message)
+    
+    def progress(self, current, total, message, detail=""):
+        if self.show_progress:
+            self.emit("progress", current=current, total=total, message=message, detail=detail)
+
+def _cli_programs(args, out: NdjsonWriter) -> int:
+    snapshot = None if args.no_cache else ProgramSnapshot()
+    programs = EnhancedRegistryHelper.get_installed_programs_async(out.progress, snapshot)
+    if args.search or args.publisher:
+        index = ProgramSearchIndex(programs)
+        programs = [index.programs[program_id] for program_id in index.search(args.search or "", args.publisher)]
+    for program in programs:
+        out.emit("program", **asdict(program))
+    out.emit("summary", programs=len(programs))
+    return 0
+
+def _cli_startup(args, out: NdjsonWriter) -> int:
+    items = EnhancedRegistryHelper.get_startup_programs_async(out.progress)
+    for item in items:
+        out.emit("startup", name=item.name, path=item.path, hive=HIVE_NAMES.get(item.hive, item.hive),
+                 registry_path=item.registry_path)
+    out.emit("summary", startup_items=len(items))
+    return 0
+
+def _cli_deep_scan(args, out: NdjsonWriter) -> int:
+    if args.location and len(args.programs) > 1:
+        out.emit("error", message="--location applies to a single program")
+        return 2
+    programs = [ProgramInfo(name, "", args.location or "") for name in args.programs]
+    engine = DeepScanEngine(out)
+    counts = [0] * len(programs)
+    sizes = [0] * len(programs)
+    try:
+        for index, batch in engine.iter_deep_scan_many(programs, out.progress):
+            for item in batch:
+                out.emit("leftover", program=programs[index].name, **asdict(item))
+                counts[index] += 1
+                sizes[index] += item.size
+    finally:
+        engine.size_cache.close()
+    for program, count, size in zip(programs, counts, sizes):
+        out.emit("summary", program=program.name, leftovers=count, total_size=size)
+    return 0
+
+def _cli_junk(args, out: NdjsonWriter) -> int:
+    if args.clean and not (args.older_than or args.category or args.all):
+        # Without a selector --clean would delete every junk row; ask for that explicitly
+        out.emit("error", message="--clean needs --older-than, --category or --all")
+        return 2
+    
+    rules = AsyncJunkCleaner.load_rules(Path(args.rules) if args.rules else None, out)
+    index = JunkIndex()
+    try:
+        result = AsyncJunkCleaner.scan_junk_files(out.progress, None, index, rules)
+    finally:
+        index.close()
+    
+    selected = result.older_than(args.older_than, args.category) \
+        if args.older_than or args.category else result.store
+    if args.rows:
+        for record in selected:
+            out.emit("junk", path=record.path, size=record.size, mtime=record.mtime,
+                     category=record.category, is_dir=record.is_dir)
+    for record in result.top_k(args.top, args.category):
+        out.emit("largest", path=record.path, size=record.size, category=record.category)
+    for label, file_count, size in result.age_histogram():
+        out.emit("age", bucket=label, files=file_count, size=size)
+    counts = selected.category_counts()
+    sizes = selected.category_totals()
+    out.emit("summary", files=selected.total_files(), items=len(selected), total_size=selected.total_size(),
+             categories={category: {"items": counts[category], "size": sizes[category]}
+                         for category in sorted(sizes, key=lambda category: -sizes[category])})
+    
+    if args.clean:
+        cleaned = AsyncJunkCleaner.clean_junk_files(selected, out.progress)
+        out.emit("cleaned", files=cleaned.deleted, freed=cleaned.freed, failed=cleaned.failed)
+    return 0
+
+def _cli_profile(args, out: NdjsonWriter) -> int:
+    automation = SmartAutomation(logger=out, autostart=False)
+    results = automation.apply_profile(OptimizationProfile(args.profile), interactive=False)
+    for result in results:
+        out.emit("task", **asdict(result))
+    out.emit("summary", profile=args.profile, tasks=len(results), succeeded=sum(1 for r in results if r.success))
+    return 0 if all(r.success for r in results) else 1
+
+def _cli_import_time(args, out: NdjsonWriter) -> int:
+    total_us, imports = measure_import_time(Path(__file__).resolve(), args.runs)
+    if total_us is None:
+        out.emit("error", message="Module failed to import")
+        return 1
+    for cumulative_us, name in heapq.nlargest(args.top, imports):
+        out.emit("import", module=name, cumulative_ms=round(cumulative_us / 1000, 1))
+    total_ms = round(total_us / 1000, 1)
+    out.emit("summary", import_ms=total_ms, budget_ms=args.budget_ms, within_budget=total_ms <= args.budget_ms)
+    return 0 if total_ms <= args.budget_ms else 1
+
+def _cli_registry_bench(args, out: NdjsonWriter) -> int:
+    """Time the registry scans on a synthesized in-memory registry, so they can be benchmarked off Windows"""
+    registry = InMemoryRegistryProvider()
+    registry.synthesize(HKEY_LOCAL_MACHINE, "Software", args.keys, name_prefix="Vendor")
+    uninstall = registry.create_key(HKEY_LOCAL_MACHINE, r"SOFTWARE\Microsoft\Windows\CurrentVersion\Uninstall")
+    for i in range(args.programs):
+        registry.set_value(registry.create_key(uninstall, f"App{i:06d}"), "DisplayName", REG_SZ, f"Bench App {i}")
+    registry.create_key(HKEY_LOCAL_MACHINE, r"Software\Vendor000001\Tools\Bench App 0")
+    set_registry_provider(registry)
+    
+    start = time.perf_counter()
+    programs = EnhancedRegistryHelper.get_installed_programs_async()
+    out.emit("benchmark", stage="installed_programs", items=len(programs),
+             ms=round((time.perf_counter() - start) * 1000, 1))
+    
+    engine = DeepScanEngine(registry=registry)
+    matcher = SearchTermMatcher(engine._generate_search_terms("Bench App 0", "Bench App 0"))
+    start = time.perf_counter()
+    leftovers = engine._scan_registry(matcher)
+    out.emit("benchmark", stage="registry_leftovers", keys=args.keys, items=len(leftovers),
+             ms=round((time.perf_counter() - start) * 1000, 1))
+    return 0
+
+def measure_import_time(module_path: Path, runs: int = 1) -> Tuple[Optional[int], List[Tuple[int, str]]]:
+    """Import a module in fresh interpreters under -X importtime.
+    
+    Returns the module's cumulative import time in microseconds (None if the
+    import failed) and (cumulative us, name) for each of its direct imports,
+    taken from the median of runs imports so one slow run on a busy machine
+    does not decide the result. A first import compiles the bytecode into a
+    temporary PYTHONPYCACHEPREFIX, so the figure does not include compiling the
+    source and nothing is written next to the installed module; the measured
+    runs themselves use -B.
+    """
+    code = f"import sys; sys.path.insert(0, {str(module_path.parent)!r}); import {module_path.stem}"
+    measurements = []
+    with tempfile.TemporaryDirectory(prefix="pyuninstallx-pycache-") as cache_dir:
+        env = dict(os.environ, PYTHONPYCACHEPREFIX=cache_dir)
+        env.pop("PYTHONDONTWRITEBYTECODE", None)
+        warm = subprocess.run([sys.executable, "-c", code], capture_output=True, env=env)
+        if warm.returncode != 0:
+            return None, []
+        for _ in range(max(1, runs)):
+            proc = subprocess.run([sys.executable, "-B", "-X", "importtime", "-c", code], 
+                                  capture_output=True, text=True, env=env)
+            if proc.returncode != 0:
+                return None, []
+            total_us, imports = _parse_import_time(proc.stderr, module_path.stem)
+            if total_us is None:
+                return None, []
+            measurements.append((total_us, imports))
+    
+    measurements.sort(key=lambda measurement: measurement[0])
+    return measurements[len(measurements) // 2]
+
+def _parse_import_time(stderr: str, module_name: str) -> Tuple[Optional[int], List[Tuple[int, str]]]:
+    """Read a module's total and direct imports from -X importtime output"""
+    imports = []
+    for line in stderr.splitlines():
+        # "import time: self [us] | cumulative | imported package"; nested names are
+        # indented two more spaces and reported before the package importing them
+        parts = line.split("|")
+        if len(parts) != 3 or not line.startswith("import time:") or not parts[1].strip().isdigit():
+            continue
+        cumulative_us = int(parts[1])
+        name = parts[2].rstrip()
+        depth = (len(name) - len(name.lstrip())) // 2
+        if depth == 0 and name.strip() == module_name:
+            return cumulative_us, imports
+        if depth == 0:
+            imports = []  # Children of an unrelated top-level import
+        elif depth == 1:
+            imports.append((cumulative_us, name.strip()))
+    return None, []
+
+def build_cli_parser() -> "argparse.ArgumentParser":
+    import argparse
+    parser = argparse.ArgumentParser(
+        prog="pyuninstallx", description="Headless PyUninstallX; every command writes NDJSON to stdout"
+    )
+    parser.add_argument("--progress", action="store_true", help="Also emit progress records")
+    commands = parser.add_subparsers(dest="command", required=True)
+    
+    programs = commands.add_parser("programs", help="List installed programs")
+    programs.add_argument("--no-cache", action="store_true", help="Ignore the installed programs snapshot")
+    programs.add_argument("--search", help="Only programs matching this text, best match first")
+    programs.add_argument("--publisher", help="Only programs from this publisher")
+    programs.set_defaults(handler=_cli_programs)
+    
+    startup = commands.add_parser("startup", help="List startup entries")
+    startup.set_defaults(handler=_cli_startup)
+    
+    deep_scan = commands.add_parser("deep-scan", help="Find leftovers of one or more programs")
+    deep_scan.add_argument("programs", nargs="+", metavar="PROGRAM")
+    deep_scan.add_argument("--location", help="Install location of the program")
+    deep_scan.set_defaults(handler=_cli_deep_scan)
+    
+    junk = commands.add_parser("junk", help="Scan (and optionally clean) junk files")
+    junk.add_argument("--rules", help="Junk rules file (default: ~/.pyuninstallx/junk_rules.json)")
+    junk.add_argument("--older-than", type=float, default=0, metavar="DAYS", 
+                      help="Only select items not modified for DAYS")
+    junk.add_argument("--category", help="Only select items of this category")
+    junk.add_argument("--top", type=int, default=20, help="Number of largest files to report")
+    junk.add_argument("--rows", action="store_true", help="Emit every selected item")
+    junk.add_argument("--clean", action="store_true", help="Delete the selected items")
+    junk.add_argument("--all", action="store_true", 
+                      help="Select every item; --clean requires this when no other selector is given")
+    junk.set_defaults(handler=_cli_junk)
+    
+    profile = commands.add_parser("profile", help="Apply an optimization profile without prompting")
+    profile.add_argument("profile", choices=[p.value for p in OptimizationProfile])
+    profile.set_defaults(handler=_cli_profile)
+    
+    import_time = commands.add_parser("import-time", help="Check module import time against a budget")
+    import_time.add_argument("--budget-ms", type=float, default=IMPORT_TIME_BUDGET_MS)
+    import_time.add_argument("--top", type=int, default=10, help="Number of slowest imports to report")
+    import_time.add_argument("--runs", type=int, default=5, help="Imports to measure; the median one is reported")
+    import_time.set_defaults(handler=_cli_import_time)
+    
+    registry_bench = commands.add_parser("registry-bench", help="Time the registry scans on a synthesized registry")
+    registry_bench.add_argument("--keys", type=int, default=100000, help="Keys below HKLM\\Software")
+    registry_bench.add_argument("--programs", type=int, default=500, help="Uninstall entries")
+    registry_bench.set_defaults(handler=_cli_registry_bench)
+    return parser
+
+def run_cli(argv: List[str]) -> int:
+    """Run a headless command; tkinter and ttkbootstrap are never imported"""
+    args = build_cli_parser().parse_args(argv)
+    out = NdjsonWriter(show_progress=args.progress)
+    try:
+        try:
+            return args.handler(args, out)
+        except KeyboardInterrupt:
+            out.emit("error", message="Interrupted")
+            return 130
+        except BrokenPipeError:
+            raise
+        except Exception as e:
+            out.emit("error", message=str(e))
+            return 1
+    except BrokenPipeError:
+        # The reader went away (e.g. piped into head): point stdout at devnull so
+        # the flush at interpreter exit does not fail again, and stop quietly
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(devnull, sys.stdout.fileno())
+        return 1
+
 # === Main Application Entry Point ===
-def main():
-    """Main application entry point"""
+def main(argv: Optional[List[str]] = None):
+    """Main application entry point; any command-line arguments select the headless CLI"""
+    argv = sys.argv[1:] if argv is None else argv
+    if argv:
+        sys.exit(run_cli(argv))
+    
+    # Elevate here rather than at import time so the engines can be imported
+    # (e.g. with the in-memory registry provider) without relaunching
+    if not is_admin():
+        run_as_admin()
+    
+    load_gui_modules()
     try:
         app = EnhancedPyUninstallXPro()
         app.root.mainloop()
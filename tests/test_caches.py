@@ -0,0 +1,134 @@
+"""FolderSizeCache and JunkIndex invalidation and pruning tests.
+
+Run with: python -m unittest discover tests
+"""
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.dont_write_bytecode = True
+
+import Code_v2 as app  # noqa: E402
+
+
+class CacheTestCase(unittest.TestCase):
+    def setUp(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.root = Path(temp_dir.name, "tree")
+        self.db_path = Path(temp_dir.name, "cache.db")
+        for relative, size in (("a/deep/x.bin", 100), ("a/y.bin", 10), ("a_x/z.bin", 1), ("ab/w.bin", 5),
+                               ("top.bin", 1000)):
+            path = self.root / relative
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_bytes(b"\0" * size)
+
+    def key(self, relative: str = "") -> str:
+        return os.path.normcase(os.path.abspath(self.root / relative))
+
+    def touch(self, relative: str = ""):
+        """Move a directory's mtime forward so the cached row no longer matches"""
+        path = self.root / relative
+        mtime_ns = path.stat().st_mtime_ns + 1_000_000_000
+        os.utime(path, ns=(mtime_ns, mtime_ns))
+
+    def cached_keys(self, cache, table: str) -> list:
+        rows = cache._conn.execute(f"SELECT path FROM {table} ORDER BY path").fetchall()
+        return [row[0] for row in rows]
+
+
+class FolderSizeCacheTest(CacheTestCase):
+    def setUp(self):
+        super().setUp()
+        self.cache = app.FolderSizeCache(self.db_path)
+        self.addCleanup(self.cache.close)
+
+    def listed(self) -> mock.MagicMock:
+        listing = mock.patch.object(app.FolderSizeCache, "_list_directory",
+                                    wraps=app.FolderSizeCache._list_directory)
+        self.addCleanup(listing.stop)
+        return listing.start()
+
+    def test_unchanged_directories_are_not_listed_again(self):
+        self.assertEqual(self.cache.get_size(self.root), 1116)
+        listing = self.listed()
+
+        self.assertEqual(self.cache.get_size(self.root), 1116)
+        listing.assert_not_called()
+
+    def test_changed_directory_is_listed_again(self):
+        self.cache.get_size(self.root)
+        (self.root / "a" / "deep" / "new.bin").write_bytes(b"\0" * 7)
+        self.touch("a/deep")
+        listing = self.listed()
+
+        self.assertEqual(self.cache.get_size(self.root), 1123)
+        self.assertEqual([call.args[0] for call in listing.call_args_list], [str(self.root / "a" / "deep")])
+
+    def test_vanished_subtree_is_pruned_and_siblings_kept(self):
+        self.cache.get_size(self.root)
+        app.remove_tree(self.root / "a")
+        self.touch()
+
+        self.assertEqual(self.cache.get_size(self.root), 1006)
+        self.assertEqual(self.cached_keys(self.cache, "folder_sizes"),
+                         sorted([self.key(), self.key("a_x"), self.key("ab")]))
+
+
+class JunkIndexTest(CacheTestCase):
+    def open_index(self) -> app.JunkIndex:
+        index = app.JunkIndex(self.db_path)
+        self.addCleanup(index.close)
+        return index
+
+    def walk(self, index: app.JunkIndex) -> dict:
+        """Return {relative directory: sorted file names} for the whole tree"""
+        found = {}
+        pending = [str(self.root)]
+        while pending:
+            dir_path = pending.pop()
+            files, subdirs, _ = index.listing(dir_path)
+            found[os.path.relpath(dir_path, self.root)] = sorted(name for name, _, _ in files)
+            pending.extend(os.path.join(dir_path, name) for name in subdirs)
+        return found
+
+    def test_flushed_listings_are_served_from_the_index(self):
+        first = self.open_index()
+        expected = self.walk(first)
+        first.close()
+
+        with mock.patch.object(app.JunkIndex, "scan_directory", wraps=app.JunkIndex.scan_directory) as scan:
+            self.assertEqual(self.walk(self.open_index()), expected)
+        scan.assert_not_called()
+
+    def test_changed_directory_is_listed_again(self):
+        index = self.open_index()
+        self.walk(index)
+        index.flush()
+        (self.root / "ab" / "v.bin").write_bytes(b"1")
+        self.touch("ab")
+
+        with mock.patch.object(app.JunkIndex, "scan_directory", wraps=app.JunkIndex.scan_directory) as scan:
+            self.assertEqual(self.walk(index)["ab"], ["v.bin", "w.bin"])
+        self.assertEqual([call.args[0] for call in scan.call_args_list], [str(self.root / "ab")])
+
+    def test_flush_prunes_vanished_subtrees(self):
+        index = self.open_index()
+        self.walk(index)
+        index.flush()
+        app.remove_tree(self.root / "a")
+        self.touch()
+
+        self.walk(index)
+        index.flush()
+
+        self.assertEqual(self.cached_keys(index, "junk_dirs"),
+                         sorted([self.key(), self.key("a_x"), self.key("ab")]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,94 @@
+"""DeletionEngine target deduplication, failure and cancellation tests.
+
+Run with: python -m unittest discover tests
+"""
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.dont_write_bytecode = True
+
+import Code_v2 as app  # noqa: E402
+
+
+class DeletePathsTest(unittest.TestCase):
+    def setUp(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.root = Path(temp_dir.name)
+        self.engine = app.DeletionEngine(max_workers=2)
+
+    def make_file(self, relative: str, data: str = "data") -> Path:
+        path = self.root / relative
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(data)
+        return path
+
+    def test_nested_and_duplicate_targets_are_counted_once(self):
+        inner = self.make_file("cache/sub/a.tmp")
+        other = self.make_file("other.log", "abc")
+        cache = self.root / "cache"
+
+        result = self.engine.delete_paths([
+            (inner, 4, False),
+            (cache / "sub", 4, True),
+            (cache, 4, True),
+            (other, 3, False),
+            (Path(str(cache) + os.sep), 4, True),  # Same directory, spelled differently
+        ])
+
+        self.assertEqual((result.deleted, result.freed, result.failed), (2, 7, 0))
+        self.assertFalse(cache.exists())
+        self.assertFalse(other.exists())
+
+    def test_sibling_with_shared_prefix_is_not_dropped(self):
+        self.make_file("cache/a.tmp")
+        sibling = self.make_file("cache_old/b.tmp")
+
+        result = self.engine.delete_paths([(self.root / "cache", 4, True), (sibling, 4, False)])
+
+        self.assertEqual((result.deleted, result.freed), (2, 8))
+        self.assertFalse(sibling.exists())
+
+    def test_links_inside_a_directory_target_are_not_followed(self):
+        outside = self.make_file("keep/important.txt")
+        self.make_file("cache/a.tmp")
+        try:
+            os.symlink(outside.parent, self.root / "cache" / "link", target_is_directory=True)
+        except (OSError, NotImplementedError):
+            self.skipTest("symlinks are not available")
+
+        result = self.engine.delete_paths([(self.root / "cache", 4, True)])
+
+        self.assertEqual(result.failed, 0)
+        self.assertFalse((self.root / "cache").exists())
+        self.assertTrue(outside.exists())
+
+    def test_failures_and_missing_targets(self):
+        gone = self.root / "gone.tmp"
+        not_a_file = self.root / "folder"
+        not_a_file.mkdir()
+
+        result = self.engine.delete_paths([(gone, 5, False), (not_a_file, 0, False)])
+
+        self.assertEqual((result.deleted, result.freed, result.failed), (1, 5, 1))
+        self.assertEqual(result.kept, [1])
+        self.assertEqual(result.failed_paths, [str(not_a_file)])
+
+    def test_cancelled_targets_are_kept(self):
+        paths = [self.make_file(f"{name}.tmp") for name in "abc"]
+        token = app.CancellationToken()
+        token.cancel()
+
+        result = self.engine.delete_paths([(path, 4, False) for path in paths], cancel_token=token)
+
+        self.assertTrue(result.cancelled)
+        self.assertEqual((result.deleted, result.kept), (0, [0, 1, 2]))
+        self.assertTrue(all(path.exists() for path in paths))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,38 @@
+"""Fails when importing Code_v2 exceeds IMPORT_TIME_BUDGET_MS.
+
+The median of several fresh imports is compared, with some headroom, so a
+single slow run on a loaded machine does not fail the check.
+
+Run with: python -m unittest discover tests
+"""
+import sys
+import unittest
+from pathlib import Path
+
+MODULE_PATH = Path(__file__).resolve().parent.parent / "Code_v2.py"
+sys.path.insert(0, str(MODULE_PATH.parent))
+sys.dont_write_bytecode = True  # Keep the install directory free of __pycache__
+
+from Code_v2 import IMPORT_TIME_BUDGET_MS, measure_import_time  # noqa: E402
+
+RUNS = 5
+MARGIN = 1.25  # Headroom over the budget for CI machines slower than a developer's
+
+
+class ImportTimeBudgetTest(unittest.TestCase):
+    def test_import_within_budget(self):
+        total_us, imports = measure_import_time(MODULE_PATH, RUNS)
+        self.assertIsNotNone(total_us, "Code_v2 failed to import")
+
+        total_ms = total_us / 1000
+        limit_ms = IMPORT_TIME_BUDGET_MS * MARGIN
+        slowest = ", ".join(f"{name} {cumulative_us / 1000:.1f} ms"
+                            for cumulative_us, name in sorted(imports, reverse=True)[:5])
+        self.assertLessEqual(total_ms, limit_ms,
+                             f"Median import took {total_ms:.1f} ms over {RUNS} runs "
+                             f"(budget {IMPORT_TIME_BUDGET_MS} ms, limit {limit_ms:.0f} ms); "
+                             f"slowest direct imports: {slowest}")
+
+
+if __name__ == "__main__":
+    unittest.main()
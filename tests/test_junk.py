@@ -0,0 +1,182 @@
+"""Junk scan result store and query tests.
+
+Run with: python -m unittest discover tests
+"""
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.dont_write_bytecode = True
+
+import Code_v2 as app  # noqa: E402
+
+
+class JunkScanResultTest(unittest.TestCase):
+    def setUp(self):
+        self.result = app.JunkScanResult(top_n=3, scan_time=100 * 86400)
+
+    def add(self, name: str, size: int, category: str = "temp", age_days: float = 0,
+            is_dir: bool = False, file_count: int = 1):
+        store = self.result.store
+        self.result.add(store.intern_directory("/junk"), name, size, self.result.scan_time - age_days * 86400,
+                        store.intern_category(category), is_dir, file_count)
+
+    def test_top_k_ranks_files_only(self):
+        self.add("cache", 10_000, is_dir=True, file_count=40)
+        for name, size in (("a.tmp", 30), ("b.tmp", 50), ("c.log", 40)):
+            self.add(name, size)
+
+        self.assertEqual([record.path.name for record in self.result.top_k(2)], ["b.tmp", "c.log"])
+        # Beyond the kept heap size the columns are scanned, still skipping directory rows
+        self.assertEqual([record.path.name for record in self.result.top_k(10)], ["b.tmp", "c.log", "a.tmp"])
+
+    def test_top_k_within_category(self):
+        self.add("a.tmp", 30)
+        self.add("b.log", 50, "logs")
+        self.add("c.tmp", 40)
+
+        self.assertEqual([record.path.name for record in self.result.top_k(5, "temp")], ["c.tmp", "a.tmp"])
+        self.assertEqual(self.result.top_k(5, "missing"), [])
+
+    def test_older_than_and_categories(self):
+        self.add("new.tmp", 10, age_days=1)
+        self.add("old.tmp", 20, age_days=40)
+        self.add("old.log", 30, "logs", age_days=40)
+
+        self.assertEqual(sorted(record.path.name for record in self.result.older_than(30)),
+                         ["old.log", "old.tmp"])
+        self.assertEqual([record.path.name for record in self.result.older_than(30, "temp")], ["old.tmp"])
+        self.assertEqual(self.result.by_category(), {"temp": (2, 30), "logs": (1, 30)})
+
+
+class JunkRulesTest(unittest.TestCase):
+    def setUp(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.root = Path(temp_dir.name)
+
+    def test_invalid_rules_are_reported_and_skipped(self):
+        rules_path = self.root / "rules.json"
+        rules_path.write_text(json.dumps({"rules": [
+            {"category": "temp", "path": str(self.root)},
+            {"category": "temp", "path": str(self.root), "patterns": []},
+            {"category": "", "path": str(self.root), "min_age_days": -1},
+        ]}))
+        problems = []
+
+        rules = app.AsyncJunkCleaner.load_rules(rules_path, problems=problems)
+
+        self.assertEqual(len(rules), 1)
+        self.assertEqual(len(problems), 2)
+        self.assertIn("'patterns' must be a non-empty list", problems[0])
+
+    def test_deep_tree_is_collapsed_without_recursion(self):
+        directory = self.root / "cache"
+        directory.mkdir()
+        self.addCleanup(app.remove_tree, directory)  # shutil.rmtree recurses too
+        try:
+            for _ in range(sys.getrecursionlimit() + 100):
+                directory = directory / "d"
+                directory.mkdir()
+        except OSError:
+            self.skipTest("path too long for this file system")
+        (directory / "x.tmp").write_text("data")
+
+        result = app.AsyncJunkCleaner.scan_junk_files(rules=[app.JunkRule("temp", str(self.root))])
+
+        self.assertEqual([(record.path.name, record.is_dir) for record in result.store], [("cache", True)])
+        self.assertEqual(result.store.total_files(), 1)
+
+
+class CollapsedRowDeletionTest(unittest.TestCase):
+    def setUp(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.root = Path(temp_dir.name)
+        self.cache = self.root / "cache"
+        (self.cache / "sub").mkdir(parents=True)
+        old = time.time() - 86400
+        for path in (self.cache / "a.tmp", self.cache / "sub" / "b.tmp"):
+            path.write_text("data")
+            os.utime(path, (old, old))
+
+    def scan(self) -> app.JunkScanResult:
+        result = app.AsyncJunkCleaner.scan_junk_files(rules=[app.JunkRule("temp", str(self.root))])
+        self.assertEqual([(record.path.name, record.is_dir) for record in result.store], [("cache", True)])
+        return result
+
+    def test_collapsed_row_removes_the_scanned_tree(self):
+        cleaned = app.AsyncJunkCleaner.clean_junk_files(self.scan().store)
+
+        self.assertEqual((cleaned.deleted, cleaned.failed), (2, 0))
+        self.assertFalse(self.cache.exists())
+
+    def test_files_created_after_the_scan_are_kept(self):
+        result = self.scan()
+        (self.cache / "sub" / "new.txt").write_text("created after the scan")
+        (self.cache / "setup.exe").write_text("never junk")
+        old = time.time() - 86400
+        os.utime(self.cache / "setup.exe", (old, old))
+
+        cleaned = app.AsyncJunkCleaner.clean_junk_files(result.store)
+
+        self.assertEqual((cleaned.deleted, cleaned.failed), (2, 0))
+        self.assertFalse((self.cache / "a.tmp").exists())
+        self.assertFalse((self.cache / "sub" / "b.tmp").exists())
+        self.assertTrue((self.cache / "sub" / "new.txt").exists())
+        self.assertTrue((self.cache / "setup.exe").exists())
+
+
+class JunkCliTest(unittest.TestCase):
+    def setUp(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.root = Path(temp_dir.name)
+        # The junk index lives under the home directory
+        home = mock.patch.dict(os.environ, {"HOME": str(self.root), "USERPROFILE": str(self.root)})
+        home.start()
+        self.addCleanup(home.stop)
+
+        for category, name, age_days in (("temp", "x.tmp", 0), ("logs", "y.log", 60)):
+            folder = self.root / category
+            folder.mkdir()
+            (folder / name).write_text("data")
+            mtime = time.time() - age_days * 86400
+            os.utime(folder / name, (mtime, mtime))
+        self.rules_path = self.root / "rules.json"
+        self.rules_path.write_text(json.dumps({"rules": [
+            {"category": category, "path": str(self.root / category)} for category in ("temp", "logs")
+        ]}))
+
+    def run_junk(self, *argv: str):
+        stream = io.StringIO()
+        args = app.build_cli_parser().parse_args(["junk", "--rules", str(self.rules_path), *argv])
+        code = args.handler(args, app.NdjsonWriter(stream))
+        return code, [json.loads(line) for line in stream.getvalue().splitlines()]
+
+    def test_clean_requires_a_selector(self):
+        code, records = self.run_junk("--clean")
+
+        self.assertEqual(code, 2)
+        self.assertEqual(records[0]["type"], "error")
+        self.assertTrue((self.root / "temp" / "x.tmp").exists())
+
+    def test_summary_and_clean_cover_the_selection_only(self):
+        code, records = self.run_junk("--older-than", "30", "--clean")
+        summary = next(record for record in records if record["type"] == "summary")
+
+        self.assertEqual(code, 0)
+        self.assertEqual(summary["categories"], {"logs": {"items": 1, "size": 4}})
+        self.assertFalse((self.root / "logs" / "y.log").exists())
+        self.assertTrue((self.root / "temp" / "x.tmp").exists())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,235 @@
+"""Registry provider, installed-program and registry leftover tests on the in-memory registry.
+
+Run with: python -m unittest discover tests
+"""
+import sys
+import tempfile
+import unittest
+from pathlib import Path, PureWindowsPath
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.dont_write_bytecode = True
+
+import Code_v2 as app  # noqa: E402
+
+UNINSTALL = r"SOFTWARE\Microsoft\Windows\CurrentVersion\Uninstall"
+
+REG_EXPORT = """Windows Registry Editor Version 5.00
+
+; Exported for the tests
+[HKEY_LOCAL_MACHINE\\SOFTWARE\\Microsoft\\Windows\\CurrentVersion\\Uninstall\\VLC]
+"DisplayName"="VLC media player"
+"UninstallString"="\\"C:\\\\Program Files\\\\VideoLAN\\\\VLC\\\\uninstall.exe\\""
+"Publisher"="VideoLAN"
+"EstimatedSize"=dword:00019000
+"InstallDate"="20240131"
+"Tags"=hex(7):61,00,00,00,62,00,00,00,00,00
+"Blob"=hex:01,02,\\
+  03
+
+[HKEY_CURRENT_USER\\Software\\Stale]
+@="gone soon"
+
+[-HKEY_CURRENT_USER\\Software\\Stale]
+"""
+
+
+class InMemoryRegistryProviderTest(unittest.TestCase):
+    def setUp(self):
+        self.registry = app.InMemoryRegistryProvider()
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+
+    def load_export(self, text: str, encoding: str = "utf-16"):
+        reg_path = Path(self.temp_dir.name, "export.reg")
+        reg_path.write_bytes(text.encode(encoding))
+        self.registry.load_reg(reg_path)
+
+    def test_load_reg_parses_value_types(self):
+        self.load_export(REG_EXPORT)
+        key = self.registry.open_key(app.HKEY_LOCAL_MACHINE, UNINSTALL + r"\VLC")
+
+        self.assertEqual(self.registry.query_value(key, "DisplayName"), ("VLC media player", app.REG_SZ))
+        self.assertEqual(self.registry.query_value(key, "UninstallString")[0],
+                         '"C:\\Program Files\\VideoLAN\\VLC\\uninstall.exe"')
+        self.assertEqual(self.registry.query_value(key, "EstimatedSize"), (0x19000, app.REG_DWORD))
+        self.assertEqual(self.registry.query_value(key, "Tags"), (["a", "b"], app.REG_MULTI_SZ))
+        self.assertEqual(self.registry.query_value(key, "Blob"), (b"\x01\x02\x03", app.REG_BINARY))
+
+    def test_load_reg_applies_key_deletions(self):
+        self.load_export(REG_EXPORT, "utf-8")
+        with self.assertRaises(FileNotFoundError):
+            self.registry.open_key(app.HKEY_CURRENT_USER, r"Software\Stale")
+
+    def test_enumeration_is_case_insensitive_and_ends_with_oserror(self):
+        root = self.registry.create_key(app.HKEY_CURRENT_USER, "Software")
+        for name in ("beta", "Alpha", "gamma"):
+            self.registry.create_key(root, name)
+
+        self.assertEqual([self.registry.enum_key(root, i) for i in range(3)], ["Alpha", "beta", "gamma"])
+        with self.assertRaises(OSError):
+            self.registry.enum_key(root, 3)
+        self.assertIs(self.registry.open_key(app.HKEY_CURRENT_USER, r"SOFTWARE\ALPHA"),
+                      self.registry.open_key(root, "alpha"))
+
+    def test_synthesize_builds_requested_tree(self):
+        created = self.registry.synthesize(app.HKEY_LOCAL_MACHINE, "Software", 100, fanout=10)
+        root = self.registry.open_key(app.HKEY_LOCAL_MACHINE, "Software")
+
+        self.assertEqual(created, 100)
+        self.assertEqual(self.registry.query_info_key(root)[0], 10)
+        self.assertEqual(self.registry.enum_key(root, 0), "Key000000")
+        first = self.registry.open_key(root, "Key000000")
+        self.assertEqual(self.registry.query_info_key(first)[:2], (10, 2))
+
+    def test_json_round_trip(self):
+        self.load_export(REG_EXPORT)
+        json_path = Path(self.temp_dir.name, "registry.json")
+        self.registry.to_json(json_path)
+
+        copy = app.InMemoryRegistryProvider()
+        copy.load_json(json_path)
+        key = copy.open_key(app.HKEY_LOCAL_MACHINE, UNINSTALL + r"\VLC")
+        self.assertEqual(copy.query_value(key, "EstimatedSize"), (0x19000, app.REG_DWORD))
+
+    def test_delete_key_refuses_keys_with_subkeys(self):
+        self.registry.create_key(app.HKEY_CURRENT_USER, r"Software\Vendor\Product")
+        software = self.registry.open_key(app.HKEY_CURRENT_USER, "Software")
+        with self.assertRaises(PermissionError):
+            self.registry.delete_key(software, "Vendor")
+
+
+class InstalledProgramsTest(unittest.TestCase):
+    def setUp(self):
+        self.registry = app.InMemoryRegistryProvider()
+        self.addCleanup(app.set_registry_provider, app.get_registry_provider())
+        app.set_registry_provider(self.registry)
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+
+    def add_program(self, hive: int, subkey: str, name: str, **values):
+        key = self.registry.create_key(hive, f"{UNINSTALL}\\{subkey}")
+        self.registry.set_value(key, "DisplayName", app.REG_SZ, name)
+        for value_name, data in values.items():
+            self.registry.set_value(key, value_name, app.REG_SZ, data)
+
+    def test_reads_programs_from_every_root(self):
+        self.add_program(app.HKEY_LOCAL_MACHINE, "Zip", "7-Zip", Publisher="Igor Pavlov",
+                         InstallDate="20240131")
+        self.add_program(app.HKEY_CURRENT_USER, "Editor", "editor")
+        self.registry.create_key(app.HKEY_LOCAL_MACHINE, UNINSTALL + r"\KB123")  # No DisplayName
+
+        programs = app.EnhancedRegistryHelper.get_installed_programs_async()
+
+        self.assertEqual([prog.name for prog in programs], ["7-Zip", "editor"])
+        self.assertEqual(programs[0].publisher, "Igor Pavlov")
+        self.assertEqual(programs[0].install_date, "2024-01-31")
+        self.assertEqual(programs[0].registry_key, f"HKEY_LOCAL_MACHINE\\{UNINSTALL}\\Zip")
+
+    def test_snapshot_rereads_only_changed_subkeys(self):
+        self.add_program(app.HKEY_LOCAL_MACHINE, "Zip", "7-Zip")
+        snapshot = app.ProgramSnapshot(Path(self.temp_dir.name, "snapshot.json"))
+        app.EnhancedRegistryHelper.get_installed_programs_async(snapshot=snapshot)
+
+        self.add_program(app.HKEY_LOCAL_MACHINE, "Zip", "7-Zip 24")
+        self.add_program(app.HKEY_CURRENT_USER, "New", "New App")
+        programs = app.EnhancedRegistryHelper.get_installed_programs_async(
+            snapshot=app.ProgramSnapshot(snapshot.snapshot_path))
+
+        self.assertEqual([prog.name for prog in programs], ["7-Zip 24", "New App"])
+
+    def test_snapshot_is_saved_only_on_change(self):
+        self.add_program(app.HKEY_LOCAL_MACHINE, "Zip", "7-Zip")
+        snapshot = app.ProgramSnapshot(Path(self.temp_dir.name, "snapshot.json"))
+        app.EnhancedRegistryHelper.get_installed_programs_async(snapshot=snapshot)
+        snapshot.snapshot_path.unlink()
+
+        app.EnhancedRegistryHelper.get_installed_programs_async(snapshot=snapshot)
+        self.assertFalse(snapshot.snapshot_path.exists())
+
+        self.add_program(app.HKEY_CURRENT_USER, "New", "New App")
+        app.EnhancedRegistryHelper.get_installed_programs_async(snapshot=snapshot)
+        self.assertTrue(snapshot.snapshot_path.exists())
+
+
+class RegistryLeftoverTest(unittest.TestCase):
+    def setUp(self):
+        self.registry = app.InMemoryRegistryProvider()
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        size_cache = app.FolderSizeCache(Path(self.temp_dir.name, "sizes.db"))
+        self.addCleanup(size_cache.close)
+        self.engine = app.DeepScanEngine(size_cache=size_cache, registry=self.registry)
+
+    def leftover(self, path: str) -> app.LeftoverItem:
+        self.registry.create_key(app.HKEY_CURRENT_USER, path)
+        return app.LeftoverItem(PureWindowsPath("HKEY_CURRENT_USER", path), "registry", 0, "registry", "High")
+
+    def assert_present(self, path: str, present: bool = True):
+        try:
+            self.registry.open_key(app.HKEY_CURRENT_USER, path)
+            found = True
+        except FileNotFoundError:
+            found = False
+        self.assertEqual(found, present, path)
+
+    def scan(self, program_name: str, publisher: str = "", install_location: str = "") -> list:
+        terms = self.engine._generate_search_terms(program_name, self.engine._clean_program_name(program_name))
+        vendor_terms = self.engine._generate_vendor_terms(publisher, install_location)
+        leftovers = self.engine._scan_registry(app.SearchTermMatcher(terms),
+                                               descend_matcher=app.SearchTermMatcher(terms | vendor_terms))
+        return sorted(str(item.path) for item in leftovers)
+
+    def test_scan_finds_keys_three_levels_below_software(self):
+        self.registry.create_key(app.HKEY_CURRENT_USER, r"Software\Acme\Tools\VLC")
+        self.registry.create_key(app.HKEY_CURRENT_USER, r"Software\Acme\VLC2")
+        self.registry.create_key(app.HKEY_CURRENT_USER, r"Software\Acme\Tools\Deep\Deeper\VLC3")
+
+        self.assertEqual(self.scan("VLC"), [r"HKEY_CURRENT_USER\Software\Acme\Tools\VLC",
+                                            r"HKEY_CURRENT_USER\Software\Acme\VLC2"])
+
+    def test_scan_descends_below_vendor_keys(self):
+        self.registry.create_key(app.HKEY_CURRENT_USER, r"Software\VideoLAN\Plugins\Cache\VLC")
+
+        self.assertEqual(self.scan("VLC", "VideoLAN"),
+                         [r"HKEY_CURRENT_USER\Software\VideoLAN\Plugins\Cache\VLC"])
+
+    def test_scan_skips_pruned_subtrees(self):
+        self.registry.create_key(app.HKEY_CURRENT_USER, r"Software\Classes\VLC")
+        self.registry.create_key(app.HKEY_CURRENT_USER, r"Software\Microsoft\VLC")
+
+        self.assertEqual(self.scan("VLC"), [])
+
+    def test_scan_stops_at_node_budget(self):
+        self.registry.synthesize(app.HKEY_CURRENT_USER, "Software", 2000)
+        self.registry.create_key(app.HKEY_CURRENT_USER, r"Software\Zzz\VLC")
+        self.engine.registry_node_budget = 100
+
+        self.assertEqual(self.scan("VLC"), [])
+
+    def test_deletes_keys_owned_by_the_program(self):
+        self.engine.delete_registry_leftover(self.leftover(r"Software\Google Chrome"), "Google Chrome")
+        self.engine.delete_registry_leftover(self.leftover(r"Software\Google\Chrome"), "Google Chrome",
+                                             "Google LLC")
+        self.assert_present(r"Software\Google Chrome", False)
+        self.assert_present(r"Software\Google\Chrome", False)
+
+    def test_refuses_shared_vendor_keys(self):
+        item = self.leftover(r"Software\Google")
+        with self.assertRaises(PermissionError):
+            self.engine.delete_registry_leftover(item, "Google Chrome", "Google LLC")
+        self.assert_present(r"Software\Google")
+
+    def test_reports_keys_the_registry_refuses(self):
+        item = self.leftover(r"Software\Google Chrome")
+        self.registry.create_key(app.HKEY_CURRENT_USER, r"Software\Google Chrome\Profile")
+        with self.assertRaises(OSError):
+            self.engine.delete_registry_leftover(item, "Google Chrome")
+
+    def test_missing_key_is_not_an_error(self):
+        item = app.LeftoverItem(PureWindowsPath("HKEY_CURRENT_USER", r"Software\Gone\Gone"), "registry")
+        self.engine.delete_registry_leftover(item, "Gone")
+
+
+if __name__ == "__main__":
+    unittest.main()
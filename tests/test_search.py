@@ -0,0 +1,64 @@
+"""ProgramSearchIndex ranking, facet and fuzzy search tests.
+
+Run with: python -m unittest discover tests
+"""
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.dont_write_bytecode = True
+
+import Code_v2 as app  # noqa: E402
+
+
+def program(name: str, publisher: str = "", location: str = "", **fields) -> app.ProgramInfo:
+    return app.ProgramInfo(name, "", location, publisher, **fields)
+
+
+class ProgramSearchIndexTest(unittest.TestCase):
+    def setUp(self):
+        self.index = app.ProgramSearchIndex([
+            program("Notepad++ Portable", "Notepad++ Team"),        # 0: name prefix
+            program("Notepad", "Microsoft"),                        # 1: exact name
+            program("MyNotepad Pro", "Indie"),                      # 2: inside the name
+            program("Open Notepad", "Open Source"),                 # 3: word start
+            program("Text Editor", "Indie", r"C:\Tools\notepad"),   # 4: install location only
+            program("Calculator", "Microsoft"),                     # 5
+        ])
+
+    def names(self, ids) -> list:
+        return [self.index.programs[program_id].name for program_id in ids]
+
+    def test_ranks_exact_then_prefix_then_word_then_substring_then_other_fields(self):
+        self.assertEqual(self.names(self.index.search("notepad")),
+                         ["Notepad", "Notepad++ Portable", "Open Notepad", "MyNotepad Pro", "Text Editor"])
+        self.assertEqual(self.names(self.index.search("portable")), ["Notepad++ Portable"])
+
+    def test_equal_ranks_keep_program_order(self):
+        self.assertEqual(self.index.search("pad"), [0, 1, 2, 3, 4])
+
+    def test_publisher_facet_limits_results(self):
+        self.assertEqual(self.names(self.index.search("notepad", "Microsoft")), ["Notepad"])
+        self.assertEqual(self.names(self.index.search("", "Indie")), ["MyNotepad Pro", "Text Editor"])
+        self.assertEqual(self.index.search("notepad", "Nobody"), [])
+        self.assertEqual(self.index.publisher_counts()[:2], [("Indie", 2), ("Microsoft", 2)])
+
+    def test_single_character_and_empty_queries(self):
+        self.assertEqual(self.names(self.index.search("+")), ["Notepad++ Portable"])
+        self.assertEqual(self.index.search("  "), list(range(6)))
+
+    def test_fuzzy_matches_typos(self):
+        self.assertEqual(self.names(self.index.search("calculater"))[:1], ["Calculator"])
+        self.assertEqual(self.index.search("zzqx"), [])
+
+    def test_order_puts_missing_values_last(self):
+        index = app.ProgramSearchIndex([
+            program("A", version="10.2"), program("B", version=""), program("C", version="9.8"),
+        ])
+        self.assertEqual(index.order("version"), [2, 0, 1])
+        self.assertEqual(index.order("version", descending=True), [0, 2, 1])
+
+
+if __name__ == "__main__":
+    unittest.main()